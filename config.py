@@ -1,22 +1,109 @@
 TABLE_NEWS = "news"
+RUN_CONFIG = {
+    "parallel": True,
+    "max_parallel_sources": 3
+}
+DASHBOARD_CONFIG = {
+    "cache_ttl": 600,
+    "daily_chart_days": 30,
+    "poll_seconds": 5,
+    "job_rows": 20,
+    "search_rows": 100
+}
+LOCK_CONFIG = {
+    "lease_seconds": 120,
+    "heartbeat_seconds": 30
+}
+PUBLISH_CONFIG = {
+    "mode": "shards",
+    "directory": "export",
+    "compression": "zstd",
+    "branch": "main"
+}
+EXTRACTION_CONFIG = {
+    "ticker_dictionary": "data/idx_tickers.csv",
+    "sentiment_lexicon": "data/id_financial_lexicon.csv",
+    "listed_companies": 950,  # approximate IDX listing count, for the ticker dictionary coverage check
+    "batch_size": 2000
+}
+SCHEDULER_CONFIG = {
+    "poll_seconds": 5,
+    "max_parallel_jobs": 3,
+    "sync_repo": True,
+    "sync_minutes": 60
+}
+CACHE_CONFIG = {
+    "enabled": True,
+    "directory": "page_cache",
+    "max_mb": 2048,
+    "max_age_days": 90
+}
 SCRAPER_CONFIG = {
-    "delay_request_range": [1, 20],
+    "fetch": {
+        "max_workers": 8,
+        "host_concurrency": 2,
+        "timeout": 15,
+        "retries": 3,
+        "backoff_factor": 1.0,
+        "rate": 0.5,
+        "burst": 2,
+        "min_rate": 0.05,
+        "max_rate": 2.0,
+        "slow_response": 5.0,
+        "queue_size": 50,
+        "batch_size": 25,
+        "batch_seconds": 30,
+        "parse_processes": 0,
+        "retry_days": 3,
+        "page_concurrency": 2
+    },
     "cnbc": {
-        "base_url": "https://www.cnbcindonesia.com/market/rss"
+        "interval_minutes": 5,
+        "base_url": "https://www.cnbcindonesia.com/market/rss",
+        "fetch": {
+            "rate": 1.0,
+            "max_rate": 3.0
+        }
     },
     "kontan": {
-        "base_url": "https://www.kontan.co.id/search/indeks?kanal=investasi&tanggal={day}&bulan={month}&tahun={year}&pos=indeks&per_page={per_page}"
+        "interval_minutes": 60,
+        "base_url": "https://www.kontan.co.id/search/indeks?kanal=investasi&tanggal={day}&bulan={month}&tahun={year}&pos=indeks&per_page={per_page}",
+        "fetch": {
+            "rate": 0.5,
+            "max_rate": 2.0
+        }
     },
     "bisnis": {
-        "base_url": "https://www.bisnis.com/index?categoryId=194&date={date}&type=indeks&page={page}"
+        "interval_minutes": 60,
+        "base_url": "https://www.bisnis.com/index?categoryId=194&date={date}&type=indeks&page={page}",
+        "fetch": {
+            "rate": 0.5,
+            "max_rate": 2.0
+        }
     },
     "idx": {
-        "base_url": "https://www.idxchannel.com/rss"
+        "interval_minutes": 5,
+        "base_url": "https://www.idxchannel.com/rss",
+        "fetch": {
+            "rate": 0.5,
+            "max_rate": 2.0
+        }
     },
     "pasardana": {
-        "base_url": "https://www.pasardana.id/rss"
+        "interval_minutes": 5,
+        "base_url": "https://www.pasardana.id/rss",
+        "fetch": {
+            "rate": 0.5,
+            "max_rate": 1.0
+        }
     },
     "iqplus": {
-        "base_url": "http://www.iqplus.info/box_listnews_more.php?csection=stock_news&id={page}"
+        "interval_minutes": 60,
+        "base_url": "http://www.iqplus.info/box_listnews_more.php?csection=stock_news&id={page}",
+        "fetch": {
+            "host_concurrency": 1,
+            "rate": 0.3,
+            "max_rate": 1.0
+        }
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,156 @@
+"""
+Scaling benchmark for the queries in BaseScraper and utils/db_setup.py.
+
+Grows a scratch SQLite DB with benchmarks/news_generator.py through each
+size (10k, 100k, 1M, 5M rows by default) and times every query at each
+size, so it shows where a query stops scaling. Results can be appended to
+a CSV (with time and git revision) to track regressions across commits.
+
+Queries on the small side tables (feed_state, crawl_days, crawl_links) do
+not depend on the news table size and are not included.
+
+Usage (from src/):
+    python -m benchmarks.db_scaling --db /tmp/news_scaling.db --sizes 10000 100000 1000000 5000000
+    python -m benchmarks.db_scaling --sizes 10000 100000 --csv benchmarks/db_scaling.csv
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.news_generator import generate_news, make_rows, stored_rows
+from scrapers.kontan import KontanScraper
+from utils.db_writer import DAILY_COUNTS_TABLE, configure_sqlite
+from utils.page_cache import PageCache
+
+BENCH_LINK_PREFIX = "bench-"  # links of rows written by the save_to_db timing
+
+
+def delete_bench_rows(engine):
+    """
+    Remove rows written by save_to_db timings (a range scan on the (source,
+    link) index) and take them back out of news_daily_counts.
+    """
+    bench_rows = "FROM news WHERE source = 'kontan' AND link >= :low AND link < :high"
+    params = {"low": BENCH_LINK_PREFIX, "high": BENCH_LINK_PREFIX[:-1] + "."}
+    with engine.begin() as connection:
+        connection.execute(text(f"""
+            UPDATE {DAILY_COUNTS_TABLE}
+            SET count = count - (SELECT COUNT(*) {bench_rows} AND substr(published, 1, 10) = day)
+            WHERE source = 'kontan' AND day IN (SELECT substr(published, 1, 10) {bench_rows})
+        """), params)
+        connection.execute(text(f"DELETE {bench_rows}"), params)
+
+
+def news_rows(engine):
+    with engine.connect() as connection:
+        exists = connection.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news'")).fetchone()
+    return stored_rows(engine) if exists else 0
+
+
+def timed(fn, repeat):
+    """Median seconds of repeat calls of fn."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_queries(db_setup, scraper, cache_dir):
+    """Name -> callable for every query to time."""
+    micro_batch = scraper.add_metadata(make_rows(0, 25)[["published", "link", "title", "content"]])
+    calls = [0]
+
+    def save_micro_batch():
+        calls[0] += 1
+        batch = micro_batch.copy()
+        batch["link"] = f"{BENCH_LINK_PREFIX}{calls[0]}-" + batch["link"]
+        scraper.save_to_db(batch)
+
+    def reextract_walk():
+        scraper.page_cache = PageCache(cache_dir)  # empty: only the row walk is timed
+        scraper.reextract()
+
+    return {
+        "BaseScraper.get_last_date": scraper.get_last_date,
+        "BaseScraper.get_scraped_links": scraper.get_scraped_links,
+        "BaseScraper.init_news_index": scraper.init_news_index,
+        "BaseScraper.save_to_db (25 rows)": save_micro_batch,
+        "BaseScraper.reextract (row walk)": reextract_walk,
+        "db_setup.get_news_counts": db_setup.get_news_counts,
+        "db_setup.get_daily_counts (30 days)": db_setup.get_daily_counts,
+        "db_setup.get_data_version": db_setup.get_data_version,
+        "db_setup.search_news (phrase, top 50)": lambda: db_setup.search_news('"laba bersih" dividen'),
+        "db_setup.search_news (phrase, collapsed)": lambda: db_setup.search_news('"laba bersih" dividen', collapse=True),
+        "db_setup.search_news (kontan, 1 day)": lambda: db_setup.search_news(
+            "saham", sources=["kontan"], start="2022-01-02", end="2022-01-02"),
+        "db_setup.get_status": db_setup.get_status,
+        "db_setup.update_status": lambda: db_setup.update_status("scraping", "success"),
+        "db_setup.init_status_table": db_setup.init_status_table,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=str(Path(tempfile.gettempdir()) / "news_scaling.db"),
+                        help="Scratch DB, grown in place and reused across runs.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip", nargs="*", default=[], help="Substrings of query names to skip.")
+    parser.add_argument("--csv", help="Append results to this CSV.")
+    args = parser.parse_args()
+
+    db_url = f"sqlite:///{args.db}"
+    engine = configure_sqlite(create_engine(db_url))
+    if news_rows(engine) > min(args.sizes):
+        sys.exit(f"{args.db} already holds more than {min(args.sizes)} rows; use a fresh --db")
+
+    os.environ["STOCK_NEWS_DB_URL"] = db_url  # db_setup connects to the scratch DB
+    from utils import db_setup
+    db_setup.init_status_table()
+    scraper = KontanScraper(conn=SimpleNamespace(engine=engine), table_name="news", base_url="")
+
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        queries = {
+            name: fn for name, fn in make_queries(db_setup, scraper, cache_dir).items()
+            if not any(skip in name for skip in args.skip)
+        }
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            generate_news(engine, size)
+            print(f"Grew {args.db} to {size} rows in {time.perf_counter() - start:.1f}s")
+            for name, fn in queries.items():
+                fn()  # warm up
+                results.append({"query": name, "rows": size, "ms": round(timed(fn, args.repeat) * 1000, 2)})
+            delete_bench_rows(engine)
+
+    df = pd.DataFrame(results)
+    print(df.pivot(index="query", columns="rows", values="ms").to_string())
+    if args.csv:
+        df.insert(0, "revision", git_revision())
+        df.insert(0, "timestamp", pd.Timestamp.now().isoformat(timespec="seconds"))
+        df.to_csv(args.csv, mode="a", header=not Path(args.csv).exists(), index=False)
+
+
+if __name__ == "__main__":
+    main()
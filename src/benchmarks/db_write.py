@@ -0,0 +1,100 @@
+"""
+Benchmark news writes: the previous pandas to_sql path (MAX(rowid) lookup +
+DataFrame.to_sql with INSERT OR IGNORE) against NewsWriter (multi-row
+INSERT ... RETURNING in one transaction per batch, batch canonicalization,
+WAL, synchronous=NORMAL, mmap). Both write into the full schema
+(NewsWriter.ensure_schema), triggers included.
+
+Exits with an error if NewsWriter is slower than to_sql at any size by more
+than --min-speedup allows.
+
+Usage (from src/):
+    python -m benchmarks.db_write --sizes 1000 10000 100000 --batch-size 500
+    python -m benchmarks.db_write --min-speedup 1.2
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from utils.db_writer import NewsWriter, configure_sqlite
+
+SOURCES = ["cnbc", "kontan", "bisnis", "idx", "pasardana", "iqplus"]
+PARAGRAPH = (
+    "Indeks Harga Saham Gabungan (IHSG) ditutup menguat pada perdagangan hari ini "
+    "seiring aksi beli investor asing di saham perbankan berkapitalisasi besar. "
+)
+
+
+def make_batch(start, size):
+    now = pd.Timestamp.now(tz="Asia/Jakarta")
+    ids = range(start, start + size)
+    return pd.DataFrame({
+        "published": [pd.Timestamp("2025-01-01") + pd.Timedelta(minutes=i) for i in ids],
+        "link": [f"https://example.com/{SOURCES[i % 6]}/news/{i}" for i in ids],
+        "title": [f"Berita saham nomor {i}" for i in ids],
+        "content": [PARAGRAPH * 12 for _ in ids],
+        "source": [SOURCES[i % 6] for i in ids],
+        "DW_LOAD_TS": now,
+        "DW_MODIFY_TS": now,
+    })
+
+
+def insert_or_ignore(table, conn, keys, data_iter):
+    stmt = table.table.insert().prefix_with("OR IGNORE")
+    return conn.execute(stmt, [dict(zip(keys, row)) for row in data_iter]).rowcount
+
+
+def write_to_sql(engine, df):
+    last_rowid = pd.read_sql("SELECT MAX(rowid) AS last_rowid FROM news", engine)["last_rowid"].iloc[0]
+    df = df.copy()
+    df["rowid"] = range(int(last_rowid or 0) + 1, int(last_rowid or 0) + 1 + len(df))
+    df.to_sql("news", engine, if_exists="append", index=False, method=insert_or_ignore)
+
+
+def run_case(name, engine, write, n_rows, batch_size):
+    NewsWriter(engine, "news").ensure_schema()
+    batches = [make_batch(start, min(batch_size, n_rows - start)) for start in range(0, n_rows, batch_size)]
+    start = time.perf_counter()
+    for batch in batches:
+        write(batch)
+    elapsed = time.perf_counter() - start
+    return {"path": name, "rows": n_rows, "seconds": round(elapsed, 3), "rows_per_sec": round(n_rows / elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--min-speedup", type=float, default=1.0,
+                        help="Fail if NewsWriter's speedup over to_sql is below this at any size.")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            old_engine = create_engine(f"sqlite:///{tmp}/to_sql_{n_rows}.db")
+            results.append(run_case("to_sql", old_engine, lambda df: write_to_sql(old_engine, df), n_rows, args.batch_size))
+            old_engine.dispose()
+
+            new_engine = configure_sqlite(create_engine(f"sqlite:///{tmp}/writer_{n_rows}.db"))
+            writer = NewsWriter(new_engine, "news")
+            results.append(run_case("NewsWriter", new_engine, writer.write, n_rows, args.batch_size))
+            new_engine.dispose()
+
+    df = pd.DataFrame(results)
+    df["speedup"] = df["rows_per_sec"] / df.groupby("rows")["rows_per_sec"].transform("first")
+    print(df.to_string(index=False, float_format="%.2f"))
+    slow = df[(df["path"] == "NewsWriter") & (df["speedup"] < args.min_speedup)]
+    if not slow.empty:
+        sys.exit(f"[ERROR] NewsWriter is below {args.min_speedup:.2f}x to_sql at "
+                 f"{', '.join(f'{rows} rows ({speedup:.2f}x)' for rows, speedup in zip(slow['rows'], slow['speedup']))}")
+    print(f"NewsWriter is at least {args.min_speedup:.2f}x to_sql at every size.")
+
+
+if __name__ == "__main__":
+    main()
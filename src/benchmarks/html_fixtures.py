@@ -0,0 +1,169 @@
+"""
+Synthetic article pages that mimic the markup of each source: a heavy page
+(scripts, navigation, related-article grids, footer) around the article
+container each scraper extracts, with the quirks seen on the real sites
+(unclosed <p>, entities, inline ads and scripts, excluded paragraphs).
+
+Pages are deterministic for a given (source, seed). Real pages saved as
+fixtures/<source>/*.html (a list of pages per article directory for idx)
+are used instead when present.
+"""
+import random
+from pathlib import Path
+
+SOURCES = ["cnbc", "kontan", "bisnis", "idx", "pasardana", "iqplus"]
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+WORDS = (
+    "saham IHSG emiten investor asing perbankan laba bersih kuartal dividen "
+    "obligasi rupiah Bursa Efek Indonesia sektor energi nikel batu bara harga "
+    "naik turun menguat melemah transaksi lot miliar triliun Rp persen"
+).split()
+
+
+def words(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def paragraph(rng):
+    text = words(rng, rng.randint(25, 70))
+    quirk = rng.random()
+    if quirk < 0.1:
+        text += f" <b>{words(rng, 3)}</b> &amp; <i>{words(rng, 2)}</i>&nbsp;{words(rng, 4)}"
+    elif quirk < 0.2:
+        text += f' <a href="https://example.com/tag/{rng.randint(1, 999)}">{words(rng, 2)}</a>.'
+    elif quirk < 0.25:
+        text += " <!-- ad slot -->"
+    return text
+
+
+def page(rng, title, container, head_extra="", body_extra=""):
+    scripts = "".join(
+        f'<script type="text/javascript">var cfg{i} = {{"k": "{words(rng, 4)}", "html": "<div></div>"}};'
+        f" if (a < b && c > d) {{ track({i}); }}</script>"
+        for i in range(rng.randint(15, 30))
+    )
+    styles = "".join(f".c{i} {{ margin: {i}px; }}" for i in range(200))
+    nav = "".join(
+        f'<li class="menu-item"><a href="/kanal/{i}" class="nav-link" data-id="{i}">{words(rng, 2)}</a></li>'
+        for i in range(rng.randint(150, 400))
+    )
+    related = "".join(
+        f'<div class="box"><a href="/read/{i}"><img src="/img/{i}.jpg" alt="{words(rng, 3)}"/>'
+        f"<h2>{words(rng, 8)}</h2></a><span class=\"date\">{rng.randint(1, 28)}/08/2025</span></div>"
+        for i in range(rng.randint(60, 200))
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"id\"><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title><style>{styles}</style>{head_extra}{scripts}</head>"
+        f"<body><header><ul class=\"nav\">{nav}</ul></header><main>{container}</main>"
+        f"<aside class=\"related\">{related}</aside>{body_extra}"
+        f"<footer><p>{words(rng, 30)}</p></footer></body></html>"
+    )
+
+
+def cnbc_page(rng):
+    body = "".join(
+        f"<p>{paragraph(rng)}</p>" + ('<div class="ads"><p>ADVERTISEMENT</p></div>' if i == 2 else "")
+        for i in range(rng.randint(6, 15))
+    )
+    container = (
+        f'<div class="detail-text"><p><strong>Jakarta, CNBC Indonesia</strong> - {paragraph(rng)}</p>'
+        f"{body}<table><tr><td>{words(rng, 3)}</td></tr></table></div>"
+    )
+    return page(rng, words(rng, 8), container)
+
+
+def kontan_page(rng):
+    body = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(rng.randint(6, 15)))
+    container = (
+        f'<div itemprop="articleBody" class="tmpt-desk-kon"><p>KONTAN.CO.ID - JAKARTA. {paragraph(rng)}</p>'
+        f'{body}<p>Baca Juga: <a href="/news/{rng.randint(1, 999)}">{words(rng, 6)}</a></p>'
+        f"<p>{paragraph(rng)}<p>Selanjutnya: {words(rng, 6)}</p>"
+        f"<p>Reporter: {words(rng, 2)}<br/>Editor: {words(rng, 2)}</p></div>"
+    )
+    svg_title = f"<svg><title>{words(rng, 2)}</title></svg>"
+    return page(rng, f"{words(rng, 8)} - KONTAN", container, body_extra=svg_title)
+
+
+def bisnis_page(rng):
+    body = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(rng.randint(6, 15)))
+    container = (
+        f'<article class="detailsContent force-17 mt40"><p>Bisnis.com, JAKARTA — {paragraph(rng)}</p>'
+        f"{body}<p> </p><p>#{words(rng, 1)} #{words(rng, 1)}</p>"
+        f'<div class="baca-juga"><p>{words(rng, 5)}</p></div></article>'
+    )
+    return page(rng, words(rng, 8), container)
+
+
+def pasardana_page(rng):
+    body = "".join(f"<p>{paragraph(rng)}</p>\n" for _ in range(rng.randint(5, 12)))
+    container = (
+        f'<section class="entry-content clearfix"><p>Pasardana.id - {paragraph(rng)}</p>\n{body}'
+        f"<script>window.ad = '<p>not text</p>';</script></section>"
+    )
+    return page(rng, words(rng, 8), container)
+
+
+def iqplus_page(rng):
+    lines = "<br>".join(paragraph(rng) for _ in range(rng.randint(4, 10)))
+    container = (
+        f'<div id="zoomthis"><small>Selasa 12/08/2025 09:15</small><h3>{words(rng, 8)}</h3>'
+        f"IQPlus, (12/8) - {lines}<br><br>(end)</div>"
+    )
+    return page(rng, words(rng, 8), container)
+
+
+def idx_pages(rng, link=None):
+    if link is None:
+        link = f"https://www.idxchannel.com/market-news/{'-'.join(words(rng, 6).lower().split())}"
+    page_count = rng.randint(1, 4)
+    pagination = "".join(f'<a href="{link}/{n}">{n}</a>' for n in range(1, page_count + 1))
+    pages = []
+    for _ in range(page_count):
+        body = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(rng.randint(3, 8)))
+        container = (
+            f'<div class="article--content"><div class="share">{words(rng, 2)}</div>'
+            f'<div class="content"><p>IDXChannel—{paragraph(rng)}</p>{body}</div>'
+            f'<div class="pagination">{pagination}</div></div>'
+        )
+        pages.append(page(rng, words(rng, 8), container))
+    return pages
+
+
+PAGE_BUILDERS = {
+    "cnbc": cnbc_page,
+    "kontan": kontan_page,
+    "bisnis": bisnis_page,
+    "idx": idx_pages,
+    "pasardana": pasardana_page,
+    "iqplus": iqplus_page,
+}
+
+
+def synthetic_article(source, seed=0, link=None):
+    """
+    Raw article as fetch_raw returns it: HTML, or a list of page HTML for idx
+    (whose pagination links point at link/<n> when link is given).
+    """
+    rng = random.Random(f"{source}-{seed}")
+    if source == "idx":
+        return idx_pages(rng, link)
+    return PAGE_BUILDERS[source](rng)
+
+
+def saved_articles(source):
+    """Articles saved under fixtures/<source>/ (one directory of pages per idx article)."""
+    source_dir = FIXTURES_DIR / source
+    if not source_dir.is_dir():
+        return []
+    if source == "idx":
+        return [
+            [path.read_text(encoding="utf-8") for path in sorted(article_dir.glob("*.html"))]
+            for article_dir in sorted(source_dir.iterdir()) if article_dir.is_dir()
+        ]
+    return [path.read_text(encoding="utf-8") for path in sorted(source_dir.glob("*.html"))]
+
+
+def load_articles(source, count):
+    """Saved fixtures for source if any, otherwise count synthetic articles."""
+    return saved_articles(source) or [synthetic_article(source, seed) for seed in range(count)]
@@ -0,0 +1,119 @@
+"""
+Fill a scratch SQLite DB with synthetic news rows across all six sources,
+written through NewsWriter (so the table, unique index and value formats
+match production).
+
+Rows are deterministic for a given seed and row number, so a DB can be grown
+in steps (10k, then up to 100k, ...) and still hold the same first rows.
+Row i is published i * step_seconds after a fixed start, like a crawl that
+appends articles roughly in publication order; sources are drawn with
+production-like weights.
+
+Usage (from src/):
+    python -m benchmarks.news_generator /tmp/news_scaling.db --rows 1000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.html_fixtures import WORDS
+from utils.db_writer import NewsWriter, configure_sqlite
+
+SOURCE_WEIGHTS = {"kontan": 0.3, "bisnis": 0.25, "cnbc": 0.15, "idx": 0.15, "iqplus": 0.1, "pasardana": 0.05}
+SOURCE_URLS = {
+    "cnbc": "https://www.cnbcindonesia.com/market/{day}/{n}/",
+    "kontan": "https://investasi.kontan.co.id/news/",
+    "bisnis": "https://market.bisnis.com/read/{day}/7/{n}/",
+    "idx": "https://www.idxchannel.com/market-news/",
+    "pasardana": "https://www.pasardana.id/news/{day}/",
+    "iqplus": "http://www.iqplus.info/news/stock_news/",
+}
+START = pd.Timestamp("2022-01-01")
+CORPUS_CHARS = 1_000_000
+
+
+def make_corpus(seed):
+    rng = np.random.default_rng(seed)
+    corpus = " ".join(np.array(WORDS)[rng.integers(0, len(WORDS), CORPUS_CHARS // 5)])
+    return corpus[:CORPUS_CHARS]
+
+
+def make_rows(start, size, seed=0, content_chars=800, step_seconds=20, corpus=None):
+    """
+    Synthetic news rows start .. start + size - 1.
+
+    Returns:
+        pd.DataFrame: Columns published, link, title, content, source,
+        DW_LOAD_TS, DW_MODIFY_TS.
+    """
+    corpus = corpus or make_corpus(seed)
+    rng = np.random.default_rng([seed, start])
+    ids = np.arange(start, start + size)
+    sources = rng.choice(list(SOURCE_WEIGHTS), size=size, p=list(SOURCE_WEIGHTS.values()))
+    published = START + pd.to_timedelta(ids * step_seconds + rng.integers(0, step_seconds, size), unit="s")
+
+    title_starts = rng.integers(0, CORPUS_CHARS - 120, size)
+    title_lengths = rng.integers(50, 110, size)
+    content_lengths = np.clip(rng.normal(content_chars, content_chars / 3, size), 100, CORPUS_CHARS // 2).astype(int)
+    content_starts = rng.integers(0, CORPUS_CHARS - content_lengths)
+
+    title_starts = [corpus.find(" ", s) + 1 for s in title_starts]  # start on a word
+    titles = [corpus[s:s + n].strip() for s, n in zip(title_starts, title_lengths)]
+    links = [
+        SOURCE_URLS[source].format(day=day, n=i) + "-".join(title.split()[:8]) + f"-{i}"
+        for source, day, i, title in zip(sources, published.strftime("%Y%m%d"), ids, titles)
+    ]
+    loaded = published.tz_localize("Asia/Jakarta") + pd.Timedelta(minutes=5)
+    return pd.DataFrame({
+        "published": published,
+        "link": links,
+        "title": titles,
+        "content": [corpus[s:s + n] for s, n in zip(content_starts, content_lengths)],
+        "source": sources,
+        "DW_LOAD_TS": loaded,
+        "DW_MODIFY_TS": loaded,
+    })
+
+
+def stored_rows(engine, table_name="news"):
+    with engine.connect() as connection:
+        return connection.execute(text(f"SELECT COALESCE(MAX(rowid), 0) FROM {table_name}")).scalar()
+
+
+def generate_news(engine, rows, table_name="news", batch_size=50_000, seed=0, content_chars=800, step_seconds=20):
+    """
+    Grow table_name to at least rows synthetic rows. Returns rows added.
+    Assumes the table only ever received rows from this generator.
+    """
+    writer = NewsWriter(engine, table_name)
+    writer.ensure_schema()
+    corpus = make_corpus(seed)
+    start = stored_rows(engine, table_name)
+    added = 0
+    for batch_start in range(start, rows, batch_size):
+        df = make_rows(batch_start, min(batch_size, rows - batch_start), seed, content_chars, step_seconds, corpus)
+        added += writer.write(df)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("db", help="Path of the scratch SQLite DB (created or grown).")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--content-chars", type=int, default=800, help="Mean article length.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = configure_sqlite(create_engine(f"sqlite:///{args.db}"))
+    start = time.perf_counter()
+    added = generate_news(engine, args.rows, seed=args.seed, content_chars=args.content_chars)
+    print(f"Added {added} rows to {args.db} in {time.perf_counter() - start:.1f}s ({stored_rows(engine)} total).")
+
+
+if __name__ == "__main__":
+    main()
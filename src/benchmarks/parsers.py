@@ -0,0 +1,145 @@
+"""
+Benchmark article extraction per source: the full html.parser tree the
+scrapers used to build against parsing only the article container with a
+SoupStrainer. Reports pages/sec and the peak memory of parsing one article
+(tracemalloc), and fails if the two disagree on any article.
+
+Articles come from benchmarks/fixtures/<source>/ when saved pages exist
+(python -m benchmarks.save_fixtures), otherwise from the synthetic pages in
+benchmarks/html_fixtures.py; the pages column says which. With --saved-only,
+sources without saved pages fail the check instead of falling back.
+
+With --processes N, also times extract_article (parse + clean) over all
+sources in-process against a process pool of N workers.
+
+Usage (from src/):
+    python -m benchmarks.parsers --articles 20 --repeat 3
+    python -m benchmarks.parsers --processes 4
+    python -m benchmarks.parsers --saved-only
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from scrapers import bisnis, cnbc, idx, iqplus, kontan, pasardana
+from scrapers.base import extract_article
+from benchmarks.html_fixtures import SOURCES, load_articles, saved_articles
+
+MODULES = {
+    "cnbc": (cnbc, cnbc.CNBCScraper),
+    "kontan": (kontan, kontan.KontanScraper),
+    "bisnis": (bisnis, bisnis.BisnisScraper),
+    "idx": (idx, idx.IDXScraper),
+    "pasardana": (pasardana, pasardana.PasarDanaScraper),
+    "iqplus": (iqplus, iqplus.IQPlusScraper),
+}
+
+
+def make_parser(source, strained):
+    """parse_article of source, with ARTICLE_STRAINER disabled unless strained."""
+    module, scraper_class = MODULES[source]
+
+    def parse(raw):
+        if strained:
+            return scraper_class.parse_article(raw)
+        with mock.patch.object(module, "ARTICLE_STRAINER", None):
+            return scraper_class.parse_article(raw)
+
+    return parse
+
+
+def page_count(articles):
+    return sum(len(raw) if isinstance(raw, list) else 1 for raw in articles)
+
+
+def measure(parse, articles, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [parse(raw) for raw in articles]
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    tracemalloc.start()
+    for raw in articles:
+        tracemalloc.reset_peak()
+        parse(raw)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return results, page_count(articles) * repeat / elapsed, peak
+
+
+def measure_pool(articles, processes):
+    """articles/sec of extract_article in-process and in a pool of processes."""
+    jobs = [(MODULES[source][1].parse_article, source, raw) for source, raw in articles]
+    start = time.perf_counter()
+    serial = [extract_article(*job) for job in jobs]
+    serial_rate = len(jobs) / (time.perf_counter() - start)
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(extract_article, *zip(*jobs[:processes])))  # start the workers
+        start = time.perf_counter()
+        pooled = list(pool.map(extract_article, *zip(*jobs)))
+        pool_rate = len(jobs) / (time.perf_counter() - start)
+    return serial == pooled, serial_rate, pool_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", nargs="+", default=SOURCES, choices=SOURCES)
+    parser.add_argument("--articles", type=int, default=10, help="Synthetic articles per source.")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--processes", type=int, default=0, help="Also benchmark a process pool of this size.")
+    parser.add_argument("--saved-only", action="store_true", help="Fail for sources without saved pages.")
+    args = parser.parse_args()
+
+    unsaved = [source for source in args.sources if not saved_articles(source)]
+    if args.saved_only and unsaved:
+        sys.exit(f"no saved pages under benchmarks/fixtures/ for: {', '.join(unsaved)}")
+
+    if args.processes:
+        articles = [(source, raw) for source in args.sources for raw in load_articles(source, args.articles)]
+        same, serial_rate, pool_rate = measure_pool(articles, args.processes)
+        print(f"extract_article: {serial_rate:.1f} articles/sec in-process, "
+              f"{pool_rate:.1f} with {args.processes} processes ({pool_rate / serial_rate:.2f}x)")
+        if not same:
+            sys.exit("pooled extraction differs from in-process extraction")
+
+    rows = []
+    mismatches = 0
+    for source in args.sources:
+        articles = load_articles(source, args.articles)
+        full, full_rate, full_peak = measure(make_parser(source, strained=False), articles, args.repeat)
+        strained, strained_rate, strained_peak = measure(make_parser(source, strained=True), articles, args.repeat)
+
+        differing = [i for i, (a, b) in enumerate(zip(full, strained)) if a != b]
+        mismatches += len(differing)
+        for i in differing[:3]:
+            print(f"[MISMATCH] {source} article {i}:\n  full:     {full[i]!r:.200}\n  strained: {strained[i]!r:.200}")
+
+        rows.append({
+            "source": source,
+            "pages": "synthetic" if source in unsaved else "saved",
+            "page_count": page_count(articles),
+            "full_pages_per_sec": round(full_rate, 1),
+            "strained_pages_per_sec": round(strained_rate, 1),
+            "speedup": round(strained_rate / full_rate, 2),
+            "full_peak_kb": round(full_peak / 1024),
+            "strained_peak_kb": round(strained_peak / 1024),
+            "mismatches": len(differing),
+        })
+
+    print(pd.DataFrame(rows).to_string(index=False))
+    if mismatches:
+        sys.exit(f"strained parsing differs from the full parse on {mismatches} articles")
+    print("Strained parsing matches the full parse on every article.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Save real article pages as parser fixtures: the newest stored links of each
+source are taken from the news table and their raw pages written to
+benchmarks/fixtures/<source>/ (one directory of numbered pages per idx
+article), where benchmarks/parsers.py and the other benchmarks pick them up
+instead of the synthetic pages.
+
+Pages come from the page cache when it has them, otherwise they are
+downloaded with the scraper's own fetch_raw.
+
+Usage (from src/):
+    python -m benchmarks.save_fixtures --articles 5
+    python -m benchmarks.save_fixtures --sources idx kontan --articles 3
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import SCRAPER_CONFIG, TABLE_NEWS
+from benchmarks.html_fixtures import FIXTURES_DIR, SOURCES
+from run_scrapers import SCRAPER_CLASSES, make_page_cache
+from utils.db_setup import conn
+
+
+def fixture_name(link):
+    """File name for link: its last path segment, reduced to [a-z0-9-]."""
+    slug = link.rstrip("/").rsplit("/", 1)[-1].lower()
+    return re.sub(r"[^a-z0-9-]+", "-", slug).strip("-")[:80] or "article"
+
+
+def stored_links(scraper, count):
+    """The count newest links of scraper's source in the news table."""
+    with scraper.conn.engine.connect() as connection:
+        return [row[0] for row in connection.exec_driver_sql(
+            f"SELECT link FROM {scraper.table_name} WHERE source = ? ORDER BY published DESC LIMIT ?",
+            (scraper.source, count),
+        )]
+
+
+def save_article(source, link, raw):
+    """Write raw (HTML, or a list of page HTML for idx) under FIXTURES_DIR/<source>/."""
+    source_dir = FIXTURES_DIR / source
+    if source == "idx":
+        article_dir = source_dir / fixture_name(link)
+        article_dir.mkdir(parents=True, exist_ok=True)
+        for number, html in enumerate(raw, start=1):
+            (article_dir / f"{number:02d}.html").write_text(html or "", encoding="utf-8")
+        return
+    source_dir.mkdir(parents=True, exist_ok=True)
+    (source_dir / f"{fixture_name(link)}.html").write_text(raw, encoding="utf-8")
+
+
+def save_fixtures(source, count, page_cache=None):
+    """Save up to count stored articles of source. Returns the number saved."""
+    scraper = SCRAPER_CLASSES[source](
+        conn=conn,
+        table_name=TABLE_NEWS,
+        base_url=SCRAPER_CONFIG[source]["base_url"],
+        fetch_config=SCRAPER_CONFIG[source].get("fetch", {}),
+    )
+    saved = 0
+    for link in stored_links(scraper, count):
+        raw = page_cache.get(link) if page_cache is not None else None
+        try:
+            raw = raw or scraper.fetch_raw(link)
+        except Exception as e:
+            print(f"[ERROR] {source}: could not fetch {link}: {e}")
+            continue
+        save_article(source, link, raw)
+        saved += 1
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", nargs="+", default=SOURCES, choices=SOURCES)
+    parser.add_argument("--articles", type=int, default=5, help="Articles to save per source.")
+    args = parser.parse_args()
+
+    page_cache = make_page_cache()
+    for source in args.sources:
+        saved = save_fixtures(source, args.articles, page_cache)
+        print(f"{source}: saved {saved} articles to {FIXTURES_DIR / source}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Offline end-to-end benchmark of every scraper class against the stub server
+(benchmarks/stub_server.py), each source writing to its own temporary
+SQLite DB.
+
+Reports per source: articles saved, articles/sec, requests per article,
+bytes transferred (as counted by the stub server) and time spent in DB
+writes. The stub runs in its own process so serving pages does not compete
+with the scraper for the GIL.
+
+Usage (from src/):
+    python -m benchmarks.scrapers --days 3 --per-day 20 --latency 0.05
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.request import urlopen
+import pandas as pd
+from sqlalchemy import create_engine
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.stub_server import base_urls, serve
+from scrapers.bisnis import BisnisScraper
+from scrapers.cnbc import CNBCScraper
+from scrapers.idx import IDXScraper
+from scrapers.iqplus import IQPlusScraper
+from scrapers.kontan import KontanScraper
+from scrapers.pasardana import PasarDanaScraper
+from utils.db_writer import configure_sqlite
+
+SCRAPER_CLASSES = {
+    "cnbc": CNBCScraper,
+    "kontan": KontanScraper,
+    "bisnis": BisnisScraper,
+    "idx": IDXScraper,
+    "pasardana": PasarDanaScraper,
+    "iqplus": IQPlusScraper,
+}
+
+
+def start_stub(days, per_day, latency):
+    """Start the stub server in a child process. Returns (process, root URL)."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=serve, args=(0, days, per_day, latency, sender), daemon=True)
+    process.start()
+    return process, receiver.recv()
+
+
+def stub_stats(root, source):
+    with urlopen(f"{root}/_stats") as resp:
+        return json.load(resp).get(source, {"requests": 0, "bytes": 0})
+
+
+def seed_last_date(scraper, published):
+    """Store one article so get_last_date starts discovery at published."""
+    scraper.init_news_index()
+    scraper.writer.write(scraper.add_metadata(pd.DataFrame([{
+        "published": published, "link": "seed", "title": "seed", "content": "seed",
+    }])))
+
+
+def benchmark_source(source, root, days, fetch_config):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = configure_sqlite(create_engine(f"sqlite:///{tmp}/news.db"))
+        scraper = SCRAPER_CLASSES[source](
+            conn=SimpleNamespace(engine=engine),
+            table_name="news",
+            base_url=base_urls(root)[source],
+            fetch_config=fetch_config,
+        )
+        seed_last_date(scraper, pd.Timestamp.now().normalize() - pd.Timedelta(days=days))
+
+        write_seconds = [0.0]
+        save_to_db = scraper.save_to_db
+
+        def timed_save(df):
+            start = time.perf_counter()
+            try:
+                return save_to_db(df)
+            finally:
+                write_seconds[0] += time.perf_counter() - start
+
+        scraper.save_to_db = timed_save
+        before = stub_stats(root, source)
+        start = time.perf_counter()
+        saved = scraper.run()
+        seconds = time.perf_counter() - start
+        after = stub_stats(root, source)
+        engine.dispose()
+
+    requests = after["requests"] - before["requests"]
+    transferred = after["bytes"] - before["bytes"]
+    return {
+        "source": source,
+        "articles": saved,
+        "seconds": round(seconds, 2),
+        "articles_per_sec": round(saved / seconds, 1) if seconds else None,
+        "requests": requests,
+        "requests_per_article": round(requests / saved, 2) if saved else None,
+        "mb_transferred": round(transferred / 1e6, 2),
+        "db_write_seconds": round(write_seconds[0], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", nargs="+", default=list(SCRAPER_CLASSES), choices=list(SCRAPER_CLASSES))
+    parser.add_argument("--days", type=int, default=2, help="Days of articles served by the stub.")
+    parser.add_argument("--per-day", type=int, default=10, help="Articles per source and day.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub adds to every response.")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Per-host request rate (requests/sec).")
+    parser.add_argument("--parse-processes", type=int, default=0)
+    args = parser.parse_args()
+
+    fetch_config = {
+        "rate": args.rate,
+        "burst": args.rate,
+        "max_rate": args.rate,
+        "parse_processes": args.parse_processes,
+    }
+    process, root = start_stub(args.days, args.per_day, args.latency)
+    try:
+        results = [benchmark_source(source, root, args.days, fetch_config) for source in args.sources]
+    finally:
+        process.terminate()
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Local stand-in for the six news sites, so scrapers can be run and measured
+offline by pointing their base_url at it (see base_urls()).
+
+Serves a deterministic catalog of per_day articles per source and day for
+the last `days` days: RSS feeds for cnbc, idx and pasardana (with ETag /
+304 support), paginated index pages for kontan, bisnis and iqplus in the
+markup each scraper parses, and article pages from html_fixtures. Requests
+and response bytes are counted per source and served as JSON at /_stats.
+
+Usage (from src/):
+    python -m benchmarks.stub_server --port 8765 --days 3 --per-day 20
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.html_fixtures import SOURCES, synthetic_article
+
+JAKARTA_OFFSET = "+0700"
+KONTAN_PAGE_SIZE = 20
+BISNIS_PAGE_SIZE = 10
+IQPLUS_PAGE_SIZE = 10
+
+
+def base_urls(root):
+    """base_url of every source pointed at a stub server running at root."""
+    return {
+        "cnbc": f"{root}/cnbc/rss",
+        "kontan": f"{root}/kontan/indeks?tanggal={{day}}&bulan={{month}}&tahun={{year}}&per_page={{per_page}}",
+        "bisnis": f"{root}/bisnis/index?date={{date}}&page={{page}}",
+        "idx": f"{root}/idx/rss",
+        "pasardana": f"{root}/pasardana/rss",
+        "iqplus": f"{root}/iqplus/list?id={{page}}",
+    }
+
+
+class Catalog:
+    """The articles every source publishes in the stub's time window, newest first."""
+
+    def __init__(self, root, days=3, per_day=20, now=None):
+        self.root = root
+        now = now or datetime.now().replace(minute=0, second=0, microsecond=0)
+        self.days = [(now - timedelta(days=offset)).date() for offset in range(days)]
+        self.articles = {source: [] for source in SOURCES}
+        for day in self.days:
+            for n in range(per_day):
+                published = datetime.combine(day, datetime.min.time()) + timedelta(minutes=(per_day - n) * 1439 // (per_day + 1))
+                for source in SOURCES:
+                    self.articles[source].append({
+                        "published": published,
+                        "link": self.article_link(source, day, n),
+                        "title": f"{source} {day:%Y-%m-%d} artikel {n}",
+                    })
+        for entries in self.articles.values():
+            entries.sort(key=lambda entry: entry["published"], reverse=True)
+
+    def article_link(self, source, day, n):
+        if source == "idx":
+            return f"{self.root}/market-news/{day:%Y%m%d}-berita-{n}"
+        return f"{self.root}/{source}/read/{day:%Y%m%d}/{n}"
+
+    def for_day(self, source, day):
+        return [entry for entry in self.articles[source] if entry["published"].date() == day]
+
+
+def rss(catalog, source):
+    items = []
+    for entry in catalog.articles[source]:
+        items.append(
+            f"<item><title>{entry['title']}</title><link>{entry['link']}</link>"
+            f"<pubDate>{format_datetime(entry['published']).replace('-0000', JAKARTA_OFFSET)}</pubDate></item>"
+        )
+        if source == "idx":  # non market-news entries are filtered out by the scraper
+            items.append(
+                f"<item><title>ekonomi</title><link>{catalog.root}/economics/{entry['link'].rsplit('/', 1)[-1]}</link>"
+                f"<pubDate>{format_datetime(entry['published']).replace('-0000', JAKARTA_OFFSET)}</pubDate></item>"
+            )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{source}</title><link>{catalog.root}</link>{''.join(items)}</channel></rss>"
+    )
+
+
+def kontan_index(catalog, query):
+    day = datetime(int(query["tahun"]), int(query["bulan"]), int(query["tanggal"])).date()
+    offset = int(query.get("per_page", 0))
+    entries = catalog.for_day("kontan", day)[offset:offset + KONTAN_PAGE_SIZE]
+    items = "".join(
+        f'<div class="sp-hl linkto-black"><a href="{entry["link"]}">{entry["title"]}</a></div>'
+        for entry in entries
+    )
+    return f'<html><body><div class="list-berita">{items}</div></body></html>'
+
+
+def bisnis_index(catalog, query):
+    day = datetime.strptime(query["date"], "%Y-%m-%d").date()
+    page = int(query.get("page", 1))
+    entries = catalog.for_day("bisnis", day)[(page - 1) * BISNIS_PAGE_SIZE:page * BISNIS_PAGE_SIZE]
+    items = "".join(
+        f'<div class="artContent"><a class="artLink" href="{entry["link"]}">'
+        f'<h4 class="artTitle">{entry["title"]}</h4></a></div>'
+        for entry in entries
+    )
+    return f'<html><body><div id="indeksListView">{items}</div></body></html>'
+
+
+def iqplus_list(catalog, query):
+    page = int(query.get("id", 1))
+    entries = catalog.articles["iqplus"][(page - 1) * IQPLUS_PAGE_SIZE:page * IQPLUS_PAGE_SIZE]
+    items = "".join(
+        f'<li style="text-transform:capitalize;"><b>{entry["published"]:%d/%m/%y - %H:%M}</b>'
+        f'<a href="{entry["link"]}">{entry["title"]}</a></li>'
+        for entry in entries
+    )
+    return f"<html><body><ul>{items}</ul></body></html>"
+
+
+@lru_cache(maxsize=4096)
+def article_page(source, link, page=None):
+    raw = synthetic_article(source, link, link=link)
+    if source == "idx":
+        return raw[page - 1] if 1 <= page <= len(raw) else None
+    return raw
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def route(self):
+        """Return (source, content_type, body) for the request, or None for a 404."""
+        catalog = self.server.catalog
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+        if parts[0] == "market-news" and len(parts) == 3:
+            body = article_page("idx", f"{catalog.root}/market-news/{parts[1]}", int(parts[2]))
+            return ("idx", "text/html", body) if body else None
+        source = parts[0]
+        if source not in SOURCES or len(parts) < 2:
+            return None
+        if parts[1] == "rss":
+            return source, "application/rss+xml", rss(catalog, source)
+        if parts[1] == "read":
+            return source, "text/html", article_page(source, f"{catalog.root}{url.path}")
+        pages = {"kontan": kontan_index, "bisnis": bisnis_index, "iqplus": iqplus_list}
+        if source in pages:
+            return source, "text/html", pages[source](catalog, query)
+        return None
+
+    def do_GET(self):
+        if self.path == "/_stats":
+            with self.server.lock:
+                return self.send(200, "application/json", json.dumps(self.server.stats).encode())
+        routed = self.route()
+        if routed is None:
+            return self.send(404, "text/plain", b"not found")
+        source, content_type, body = routed
+        body = body.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.headers.get("If-None-Match") == etag:
+            sent = self.send(304, content_type, b"", etag=etag)
+        else:
+            sent = self.send(200, content_type, body, etag=etag)
+        with self.server.lock:
+            stats = self.server.stats.setdefault(source, {"requests": 0, "bytes": 0})
+            stats["requests"] += 1
+            stats["bytes"] += sent
+
+    def send(self, status, content_type, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+
+def make_server(port=0, days=3, per_day=20, latency=0.0):
+    """Create (but do not start) a stub server on 127.0.0.1:port."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.root = f"http://127.0.0.1:{server.server_address[1]}"
+    server.catalog = Catalog(server.root, days=days, per_day=per_day)
+    server.latency = latency
+    server.stats = {}
+    server.lock = threading.Lock()
+    return server
+
+
+def serve(port, days, per_day, latency, ready=None):
+    """Run a stub server forever; sends its root URL through ready (a Connection) once listening."""
+    server = make_server(port, days, per_day, latency)
+    if ready is not None:
+        ready.send(server.root)
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--per-day", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    args = parser.parse_args()
+    server = make_server(args.port, args.days, args.per_day, args.latency)
+    print(f"Stub server at {server.root}")
+    for source, url in base_urls(server.root).items():
+        print(f"  {source}: {url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
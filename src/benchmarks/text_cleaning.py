@@ -0,0 +1,102 @@
+"""
+Benchmark and equivalence check for batch text cleaning.
+
+Compares row-by-row clean_text (five regex passes per text) with the fused
+clean_texts on the raw CSV corpora in notebooks/. Fails if clean_texts with
+all phrases (source=None) differs from clean_text on any text, and reports
+how many texts change when only the source's own phrases are used.
+
+Usage (from src/):
+    python -m benchmarks.text_cleaning --repeat 20
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from utils.text_cleaning import clean_text, clean_texts
+
+NOTEBOOKS_DIR = Path(__file__).resolve().parents[2] / "notebooks"
+CORPORA = {
+    "idx": ["idxchannel_news.csv", "idxchannel_news2.csv"],
+    "investorid": ["investor_id_news.csv"],
+    "iqplus": ["iqplus_news.csv"],
+    "kontan": ["kontan_news.csv"],
+}
+FUZZ_ALPHABET = list("ab -–—,.()/1 ") + [" ", "​", "　", "\t", "KONTAN.CO.ID", "IQPlus,", "(1/2)",
+                                         "Jakarta, CNBC Indonesia", "IDXChannel—", "Bisnis.com , JAKARTA"]
+
+
+def load_corpora():
+    corpora = {}
+    for source, files in CORPORA.items():
+        frames = [pd.read_csv(NOTEBOOKS_DIR / name) for name in files if (NOTEBOOKS_DIR / name).exists()]
+        if frames:
+            corpora[source] = pd.concat(frames, ignore_index=True)["content"]
+    return corpora
+
+
+def fuzz_texts(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 30)))
+        for _ in range(n)
+    ]
+
+
+def same_text(a, b):
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    return pd.isna(a) and pd.isna(b)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Repeat each corpus to get stable timings.")
+    parser.add_argument("--fuzz", type=int, default=20000, help="Random edge-case strings for the equivalence check.")
+    args = parser.parse_args()
+
+    corpora = load_corpora()
+    corpora["fuzz"] = pd.Series(fuzz_texts(args.fuzz))
+
+    results = []
+    mismatches = 0
+    for source, texts in corpora.items():
+        texts = pd.concat([texts] * args.repeat, ignore_index=True)
+        expected, t_apply = timed(texts.apply, clean_text)
+        fused, t_fused = timed(clean_texts, texts)
+        own_phrases, t_source = timed(clean_texts, texts, source if source != "fuzz" else None)
+
+        same = pd.Series([same_text(a, b) for a, b in zip(expected, fused)])
+        mismatches += int((~same).sum())
+        for i in same[~same].index[:3]:
+            print(f"[MISMATCH] {source}: {texts[i]!r}\n  clean_text:  {expected[i]!r}\n  clean_texts: {fused[i]!r}")
+
+        results.append({
+            "corpus": source,
+            "texts": len(texts),
+            "apply_texts_per_sec": round(len(texts) / t_apply),
+            "fused_texts_per_sec": round(len(texts) / t_fused),
+            "source_texts_per_sec": round(len(texts) / t_source),
+            "speedup": round(t_apply / t_fused, 2),
+            "mismatches": int((~same).sum()),
+            "changed_by_source_phrases": sum(not same_text(a, b) for a, b in zip(expected, own_phrases)),
+        })
+
+    print(pd.DataFrame(results).to_string(index=False))
+    if mismatches:
+        sys.exit(f"clean_texts differs from clean_text on {mismatches} texts")
+    print("clean_texts(source=None) is identical to clean_text on every text.")
+
+
+if __name__ == "__main__":
+    main()
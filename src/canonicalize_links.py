@@ -0,0 +1,67 @@
+"""
+Canonical links of the news table (see utils/canonical_links.py).
+
+The migration (canonical_link column, backfill and unique index) runs once,
+from NewsWriter.ensure_schema, on the first scraper run or dashboard start
+after upgrading, or from here. Stored rows whose canonical link an older row
+already has keep canonical_link NULL; this lists them with the older row.
+
+Usage (from src/):
+    python canonicalize_links.py                      # migrate if needed, list duplicates
+    python canonicalize_links.py --csv duplicates.csv
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import TABLE_NEWS
+from utils import NewsWriter, canonicalize_link
+from utils.db_setup import conn
+
+
+def find_duplicates(engine, table_name="news"):
+    """
+    Rows left without a canonical link by the migration.
+
+    Returns:
+        pd.DataFrame: rowid, source, published, link and canonical_link of
+        each duplicate, with kept_rowid and kept_link of the older row.
+    """
+    with engine.connect() as connection:
+        duplicates = pd.DataFrame(connection.exec_driver_sql(f"""
+            SELECT rowid, source, published, link FROM {table_name}
+            WHERE canonical_link IS NULL ORDER BY rowid
+        """).fetchall(), columns=["rowid", "source", "published", "link"])
+        duplicates["canonical_link"] = [
+            canonicalize_link(link, source) for link, source in zip(duplicates["link"], duplicates["source"])
+        ]
+        kept = [
+            connection.exec_driver_sql(
+                f"SELECT rowid, link FROM {table_name} WHERE source = ? AND canonical_link = ?", (source, canonical)
+            ).fetchone() or (None, None)
+            for source, canonical in zip(duplicates["source"], duplicates["canonical_link"])
+        ]
+    duplicates["kept_rowid"] = [rowid for rowid, _ in kept]
+    duplicates["kept_link"] = [link for _, link in kept]
+    return duplicates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", help="Also write the duplicates to this CSV.")
+    args = parser.parse_args()
+
+    NewsWriter(conn.engine, TABLE_NEWS).ensure_schema()
+    duplicates = find_duplicates(conn.engine, TABLE_NEWS)
+    if duplicates.empty:
+        print("No stored row duplicates an older row's canonical link.")
+    else:
+        print(duplicates.groupby("source").size().rename("duplicates").to_string())
+        with pd.option_context("display.max_colwidth", 100):
+            print(duplicates[["rowid", "link", "kept_rowid", "kept_link"]].to_string(index=False))
+    if args.csv:
+        duplicates.to_csv(args.csv, index=False)
+        print(f"Wrote {len(duplicates)} rows to {args.csv}")
@@ -0,0 +1,79 @@
+"""
+The extracting_information activity: tags stored news incrementally (only
+rows stored or rewritten since each task's watermark in the news_changes
+log), under the "extracting_information" lease so two runs never process
+the same rows at once.
+
+Tasks:
+    tickers     IDX tickers and company names mentioned, in news_ticker
+    sentiment   lexicon-based price-direction score of the content, in news_sentiment
+    clusters    SimHash fingerprint and near-duplicate story cluster, in news_simhash
+
+Usage (from src/):
+    python extract_information.py
+    python extract_information.py --reset tickers     # re-tag everything, e.g. after a dictionary update
+    python extract_information.py --reset sentiment   # re-score everything after a lexicon update
+    python extract_information.py --reset clusters    # re-cluster everything after a SimHash change
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import EXTRACTION_CONFIG, LOCK_CONFIG, TABLE_NEWS
+from utils import (
+    ClusterExtractor, Lease, SentimentExtractor, SentimentScorer, TickerExtractor, TickerMatcher,
+    load_sentiment_lexicon, load_ticker_dictionary
+)
+from utils.db_setup import conn
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def make_extractors():
+    """Task name -> extractor, in the order they run."""
+    dictionary = load_ticker_dictionary(
+        REPO_ROOT / EXTRACTION_CONFIG["ticker_dictionary"], EXTRACTION_CONFIG["listed_companies"]
+    )
+    lexicon = load_sentiment_lexicon(REPO_ROOT / EXTRACTION_CONFIG["sentiment_lexicon"])
+    return {
+        "tickers": TickerExtractor(conn.engine, TickerMatcher(dictionary), TABLE_NEWS),
+        "sentiment": SentimentExtractor(conn.engine, SentimentScorer(lexicon), TABLE_NEWS),
+        "clusters": ClusterExtractor(conn.engine, TABLE_NEWS),
+    }
+
+
+def run_extraction(reset=()):
+    """
+    Run every extraction task over the rows it has not processed yet.
+
+    Returns:
+        dict: task -> stats (rows, seconds, rows_per_sec, ...), or None if
+        another process holds the extracting_information lease.
+    """
+    lease = Lease(conn.engine, "extracting_information", **LOCK_CONFIG)
+    if not lease.acquire():
+        owner, expires = lease.holder()
+        print(f"Extraction already running in {owner} (lease until {expires}). Skipping...")
+        return None
+    status = "failed"
+    try:
+        extractors = make_extractors()
+        results = {}
+        for task, extractor in extractors.items():
+            if task in reset:
+                extractor.reset()
+            results[task] = extractor.run(batch_size=EXTRACTION_CONFIG["batch_size"], lease=lease)
+            print(f"[{task}] {results[task]}")
+        status = "success"
+        return results
+    finally:
+        lease.release(status)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reset", nargs="+", default=[], choices=["tickers", "sentiment", "clusters"],
+                        help="Clear these tasks' results and watermark first.")
+    args = parser.parse_args()
+    run_extraction(reset=args.reset)
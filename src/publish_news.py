@@ -0,0 +1,42 @@
+"""
+Incremental, sharded publishing of the news table (see utils/news_export.py).
+
+Usage (from src/):
+    python publish_news.py export              # append new/changed rows to the local shards
+    python publish_news.py publish             # export, then push the changed shards to the repo
+    python publish_news.py load /tmp/news.db   # rebuild a database from the shards
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import PUBLISH_CONFIG, TABLE_NEWS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "publish", "load"])
+    parser.add_argument("db", nargs="?", help="SQLite file to rebuild (load only).")
+    parser.add_argument("--directory", help="Shard directory (default: PUBLISH_CONFIG['directory']).")
+    args = parser.parse_args()
+
+    if args.command == "load":
+        if not args.db:
+            parser.error("load needs the path of the database to rebuild")
+        from sqlalchemy import create_engine
+        from utils.db_writer import configure_sqlite
+        from utils.news_export import load_shards
+        directory = args.directory or Path(__file__).resolve().parents[1] / PUBLISH_CONFIG["directory"]
+        engine = configure_sqlite(create_engine(f"sqlite:///{args.db}"))
+        print(f"Loaded {load_shards(directory, engine, TABLE_NEWS)} rows into {args.db}")
+    else:
+        from utils.db_setup import conn, make_exporter, publish_shards_to_repo
+        from utils.news_export import ShardExporter
+        if args.command == "export":
+            exporter = make_exporter()
+            if args.directory:
+                exporter = ShardExporter(conn.engine, args.directory, TABLE_NEWS, PUBLISH_CONFIG["compression"])
+            written = exporter.export()
+            print(f"Wrote {len(written)} shards, {len(exporter.pending())} waiting to be published")
+        else:
+            print(f"Published {publish_shards_to_repo()} shards")
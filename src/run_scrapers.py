@@ -5,58 +5,186 @@ from scrapers.idx import IDXScraper
 from scrapers.pasardana import PasarDanaScraper
 from scrapers.iqplus import IQPlusScraper
 import sys
+import time
 import random
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
-from config import SCRAPER_CONFIG, TABLE_NEWS
-from utils.db_setup import conn
+from config import SCRAPER_CONFIG, TABLE_NEWS, RUN_CONFIG, CACHE_CONFIG, LOCK_CONFIG, EXTRACTION_CONFIG
+from utils.db_setup import conn, isolated_connection
+from utils import ClusterExtractor, Lease, PageCache
+
+SCRAPER_CLASSES = {
+    "cnbc": CNBCScraper,
+    "kontan": KontanScraper,
+    "bisnis": BisnisScraper,
+    "idx": IDXScraper,
+    "pasardana": PasarDanaScraper,
+    "iqplus": IQPlusScraper,
+}
+
+def make_page_cache():
+    """PageCache from CACHE_CONFIG (directory relative to the repo root), or None if disabled."""
+    if not CACHE_CONFIG["enabled"]:
+        return None
+    return PageCache(
+        Path(__file__).resolve().parents[1] / CACHE_CONFIG["directory"],
+        max_mb=CACHE_CONFIG["max_mb"],
+        max_age_days=CACHE_CONFIG["max_age_days"],
+    )
 
 class RunScrapers:
-    def __init__(self, source):
-        if source != "all":
-            self.run(source)
-        else:
-            self.run_all()
+    def __init__(self, source, parallel=None, parse_processes=None, reextract=False, on_outcome=None):
+        """
+        Args:
+            source (str): A source name or "all".
+            on_outcome (callable): Called with each source's outcome dict
+                (source, status, saved, error, seconds) as soon as it finishes.
+        """
+        self.summary = pd.DataFrame()
+        self.parse_processes = parse_processes
+        self.on_outcome = on_outcome
+        self.page_cache = make_page_cache()
+        if reextract:
+            self.reextract_all([source] if source != "all" else self.sources())
+            return
+        try:
+            if source != "all":
+                self.run_all([source], parallel=False)
+            else:
+                self.run_all(self.sources(), RUN_CONFIG["parallel"] if parallel is None else parallel)
+        finally:
+            self.evict_cache()
+
+    @staticmethod
+    def sources():
+        return [source for source, cfg in SCRAPER_CONFIG.items() if "base_url" in cfg]
 
-    def set_params(self, source):
+    def set_params(self, source, conn=conn):
+        fetch_config = dict(SCRAPER_CONFIG[source].get("fetch", {}))  # over the defaults, SCRAPER_CONFIG["fetch"]
+        if self.parse_processes is not None:
+            fetch_config["parse_processes"] = self.parse_processes
         return  {
             "conn" : conn,
             "table_name": TABLE_NEWS,
             "base_url": SCRAPER_CONFIG[source]["base_url"],
-            "delay_request_range": SCRAPER_CONFIG["delay_request_range"]
+            "fetch_config": fetch_config
         }
 
-    def run(self, source):
-        params = self.set_params(source)
-        if source == "cnbc":
-            scraper = CNBCScraper(**params)
-            scraper.run()
-        elif source == "kontan":
-            scraper = KontanScraper(**params)
-            scraper.run()
-        elif source == "bisnis":
-            scraper = BisnisScraper(**params)
-            scraper.run()
-        elif source == "idx":
-            scraper = IDXScraper(**params)
-            scraper.run()
-        elif source == "pasardana":
-            scraper = PasarDanaScraper(**params)
-            scraper.run()
-        elif source == "iqplus":
-            scraper = IQPlusScraper(**params)
-            scraper.run()
-
-    def run_all(self):
-        sources = list(SCRAPER_CONFIG.keys())
+    def make_scraper(self, source, conn=conn, lease=None):
+        scraper = SCRAPER_CLASSES[source](**self.set_params(source, conn=conn))
+        scraper.page_cache = self.page_cache
+        scraper.lease = lease
+        return scraper
+
+    def run(self, source, conn=conn, lease=None):
+        """Scrape one source; with a lease, stop before any write once it is lost."""
+        return self.make_scraper(source, conn=conn, lease=lease).run()
+
+    def reextract_all(self, sources):
+        """
+        Re-parse the cached pages of already stored articles with the current
+        parsers (no network requests) and update rows whose content changed.
+        """
+        if self.page_cache is None:
+            raise RuntimeError("Re-extraction needs CACHE_CONFIG['enabled']")
+        outcomes = [{"source": source, **self.make_scraper(source).reextract()} for source in sources]
+        self.summary = pd.DataFrame(outcomes)
+        print(self.summary.to_string(index=False))
+
+    def evict_cache(self):
+        if self.page_cache is None:
+            return
+        stats = self.page_cache.evict()
+        print(f"Page cache: {stats['entries']} pages, {stats['bytes'] / 1e6:.1f} MB, evicted {stats['evicted']}.")
+
+    def run_isolated(self, source):
+        """
+        Run one source with its own DB engine and record its outcome. The
+        source is skipped while another process holds its scraping lease.
+        """
+        worker_conn = isolated_connection()
+        start = time.monotonic()
+        outcome = {"source": source, "status": "success", "saved": 0, "error": None}
+        lease = Lease(worker_conn.engine, f"scraping:{source}", **LOCK_CONFIG)
+        try:
+            if lease.acquire():
+                try:
+                    outcome["saved"] = self.run(source, conn=worker_conn, lease=lease)
+                except Exception as e:
+                    print(f"[ERROR] Scraper {source} failed: {e}")
+                    outcome["status"] = "failed"
+                    outcome["error"] = str(e)
+                finally:
+                    lease.release(outcome["status"])
+            else:
+                owner, expires = lease.holder()
+                print(f"[{source}] Already being scraped by {owner} (lease until {expires}). Skipping...")
+                outcome["status"] = "skipped"
+                outcome["error"] = f"running in {owner}"
+        finally:
+            worker_conn.close()
+        outcome["seconds"] = round(time.monotonic() - start, 1)
+        if self.on_outcome is not None:
+            self.on_outcome(outcome)
+        return outcome
+
+    def cluster_new_rows(self):
+        """
+        Assign the rows stored since the last pass to near-duplicate clusters
+        (ClusterExtractor), so search_news(collapse=True) lags new articles
+        by at most one run. Skipped while another process holds the
+        extracting_information lease, since that extraction clusters too.
+        """
+        lease = Lease(conn.engine, "extracting_information", **LOCK_CONFIG)
+        if not lease.acquire():
+            owner, expires = lease.holder()
+            print(f"Clustering left to the extraction running in {owner} (lease until {expires}).")
+            return
+        status = "failed"
+        try:
+            stats = ClusterExtractor(conn.engine, TABLE_NEWS).run(
+                batch_size=EXTRACTION_CONFIG["batch_size"], lease=lease
+            )
+            print(f"[clusters] {stats}")
+            status = "success"
+        except Exception as e:
+            print(f"[ERROR] Clustering new rows failed: {e}")
+        finally:
+            lease.release(status)
+
+    def run_all(self, sources, parallel=False):
+        sources = list(sources)
         random.shuffle(sources)
-        for source in sources:
-            if source in ["delay_request_range"]:
-                continue
-            self.run(source)
+        start = time.monotonic()
+        if parallel:
+            with ThreadPoolExecutor(max_workers=RUN_CONFIG["max_parallel_sources"]) as executor:
+                outcomes = list(executor.map(self.run_isolated, sources))
+        else:
+            outcomes = [self.run_isolated(source) for source in sources]
+
+        self.summary = pd.DataFrame(outcomes)
+        print(self.summary.to_string(index=False))
+        print(f"Finished {len(sources)} sources in {time.monotonic() - start:.1f}s")
+        if self.summary["saved"].sum():
+            self.cluster_new_rows()
+
+        failed = self.summary.loc[self.summary["status"] == "failed", "source"].tolist()
+        if failed:
+            raise RuntimeError(f"Scrapers failed: {', '.join(failed)}")
 
 if __name__ == "__main__":
     import sys
     source = sys.argv[1]
-    runner = RunScrapers(source)
\ No newline at end of file
+    parallel = None
+    if "--parallel" in sys.argv[2:]:
+        parallel = True
+    elif "--sequential" in sys.argv[2:]:
+        parallel = False
+    parse_processes = None
+    if "--parse-processes" in sys.argv[2:]:
+        parse_processes = int(sys.argv[sys.argv.index("--parse-processes") + 1])
+    reextract = "--reextract" in sys.argv[2:]
+    runner = RunScrapers(source, parallel=parallel, parse_processes=parse_processes, reextract=reextract)
@@ -0,0 +1,186 @@
+"""
+Background worker that runs scraping jobs outside the Streamlit process.
+
+Every poll it queues a job for each source whose interval_minutes (in
+SCRAPER_CONFIG) has passed since its last job, then starts queued jobs -
+scheduled ones and those queued from the dashboard - in a thread pool, never
+two jobs over the same source at once. Each job is a row in job_runs with
+its start and end time, rows saved so far, progress and error, so the
+dashboard only has to enqueue and poll. A scraping job that saved rows is
+followed by an "extract" job that runs extract_information over them.
+
+Only one worker runs per DB (it holds the "scheduler" lease), and every
+source run takes its own "scraping:<source>" lease, so runs started from
+other processes are never duplicated. On start it fails the jobs a dead
+worker left running and recomputes the aggregate "scraping" status from
+job_runs and those leases.
+
+Usage (from src/):
+    python scheduler.py
+    python scheduler.py --manual-only
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import LOCK_CONFIG, SCHEDULER_CONFIG, SCRAPER_CONFIG
+from run_scrapers import RunScrapers
+from extract_information import run_extraction
+from utils import Lease
+from utils.db_setup import (
+    JAKARTA_TZ, conn, enqueue_job, fail_running_jobs, finish_job, get_last_enqueued, get_queued_jobs,
+    init_job_table, init_status_table, publish_to_repo, refresh_scraping_status, start_job, update_job_progress,
+    update_status
+)
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+EXTRACT_JOB = "extract"  # job source that runs extract_information instead of a scraper
+
+
+def job_sources(source):
+    return set(RunScrapers.sources()) if source == "all" else {source}
+
+
+def run_job(job_id, source):
+    """
+    Run one job and record its outcome in job_runs.
+
+    Returns:
+        tuple: (status, rows saved)
+    """
+    lock = threading.Lock()
+    progress = {"rows": 0, "done": 0}
+    total = len(job_sources(source))
+
+    def on_outcome(outcome):
+        with lock:
+            progress["rows"] += outcome["saved"]
+            progress["done"] += 1
+            rows, done = progress["rows"], progress["done"]
+        update_job_progress(job_id, rows, f"{done}/{total} sources")
+
+    try:
+        if source == EXTRACT_JOB:
+            results = run_extraction() or {}
+            progress["rows"] = max((stats["rows"] for stats in results.values()), default=0)
+            throughput = [f"{task} {stats['rows_per_sec'] or 0:g} rows/s" for task, stats in results.items()]
+            update_job_progress(job_id, progress["rows"], ", ".join(throughput) or "skipped")
+        else:
+            RunScrapers(source, on_outcome=on_outcome)
+    except Exception as e:
+        print(f"[ERROR] Job {job_id} ({source}) failed: {e}")
+        finish_job(job_id, "failed", progress["rows"], str(e))
+        return "failed", progress["rows"]
+    finish_job(job_id, "success", progress["rows"])
+    return "success", progress["rows"]
+
+
+class Scheduler:
+    def __init__(self, schedule=True):
+        self.intervals = {
+            source: timedelta(minutes=cfg["interval_minutes"])
+            for source, cfg in SCRAPER_CONFIG.items()
+            if schedule and cfg.get("interval_minutes")
+        }
+        self.executor = ThreadPoolExecutor(max_workers=SCHEDULER_CONFIG["max_parallel_jobs"])
+        self.running = {}  # job id -> (sources, trigger, future)
+        self.last_enqueued = {}
+        self.failed = False  # any failure since the worker last became busy
+        self.sync_due = None  # trigger of the first job with unpublished changes
+        self.last_sync = time.monotonic()
+
+    def enqueue_due(self):
+        now = datetime.now(JAKARTA_TZ).replace(tzinfo=None)
+        for source, interval in self.intervals.items():
+            last = max(filter(None, [self.last_enqueued.get(source), self.last_enqueued.get("all")]), default=None)
+            if last is None or now - datetime.strptime(last, TS_FORMAT) >= interval:
+                enqueue_job(source, trigger="schedule")
+                self.last_enqueued[source] = now.strftime(TS_FORMAT)
+
+    def start_queued(self):
+        busy = set().union(*(sources for sources, _, _ in self.running.values()))
+        for job in get_queued_jobs().itertuples():
+            if len(self.running) >= SCHEDULER_CONFIG["max_parallel_jobs"]:
+                break
+            sources = job_sources(job.source)
+            if sources & busy or not start_job(job.id):
+                continue
+            if not self.running:
+                update_status("scraping", "running")
+                self.failed = False
+            busy |= sources
+            print(f"Starting job {job.id} ({job.source}, {job.trigger})")
+            self.running[job.id] = (sources, job.trigger, self.executor.submit(run_job, job.id, job.source))
+
+    def reap(self):
+        finished = False
+        for job_id, (sources, trigger, future) in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[job_id]
+            finished = True
+            status, rows = future.result()
+            print(f"Job {job_id} finished: {status}, {rows} rows")
+            if rows and EXTRACT_JOB not in sources:
+                enqueue_job(EXTRACT_JOB, trigger="schedule")
+            self.failed = self.failed or status == "failed"
+            if trigger == "manual" or self.sync_due == "manual":
+                self.sync_due = "manual"
+            elif rows:
+                self.sync_due = trigger
+        if finished and not self.running:
+            update_status("scraping", "failed" if self.failed else "success")
+
+    def sync_repo(self):
+        """Publish the DB when idle: right after manual jobs, otherwise at most every sync_minutes."""
+        if not SCHEDULER_CONFIG["sync_repo"] or self.sync_due is None or self.running:
+            return
+        if self.sync_due != "manual" and time.monotonic() - self.last_sync < SCHEDULER_CONFIG["sync_minutes"] * 60:
+            return
+        try:
+            publish_to_repo()
+        except Exception as e:
+            print(f"[ERROR] Failed to publish the database: {e}")
+        self.sync_due = None
+        self.last_sync = time.monotonic()
+
+    def tick(self):
+        self.reap()
+        self.enqueue_due()
+        self.start_queued()
+        self.sync_repo()
+
+    def run_forever(self):
+        init_status_table()
+        init_job_table()
+        # one worker per DB, so jobs still marked running belong to a dead one
+        lease = Lease(conn.engine, "scheduler", **LOCK_CONFIG)
+        if not lease.acquire():
+            owner, expires = lease.holder()
+            sys.exit(f"Another scheduler ({owner}) is running, its lease ends at {expires}")
+        failed = fail_running_jobs("worker restarted")
+        if failed:
+            print(f"Marked {failed} interrupted jobs as failed")
+        # the aggregate status is not leased: reset what a dead worker left
+        print(f"Scraping status: {refresh_scraping_status(EXTRACT_JOB)}")
+        self.last_enqueued = get_last_enqueued()
+        try:
+            while True:
+                lease.check()  # another worker took over: stop scheduling
+                self.tick()
+                time.sleep(SCHEDULER_CONFIG["poll_seconds"])
+        finally:
+            self.executor.shutdown(wait=True)
+            lease.release("stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manual-only", action="store_true", help="Only run jobs queued from the dashboard.")
+    args = parser.parse_args()
+    Scheduler(schedule=not args.manual_only).run_forever()
@@ -1,41 +1,76 @@
 import streamlit as st
-from utils.db_setup import init_status_table, update_status, get_status, get_news_counts, update_db_to_repo
-from run_scrapers import RunScrapers
+from utils.db_setup import (
+    init_status_table, init_job_table, enqueue_job, get_job_runs, get_status, get_news_counts,
+    get_daily_counts, get_data_version, search_news
+)
+from config import DASHBOARD_CONFIG
 
 st.set_page_config(page_title="Scraper Dashboard", layout="wide")
-init_status_table()
+
+@st.cache_resource
+def init_tables():
+    init_status_table()
+    init_job_table()
+
+# Reads are cached per data_version: a write or status change bumps it and
+# the next rerun misses the cache; otherwise reruns cost one PK lookup.
+@st.cache_data(ttl=DASHBOARD_CONFIG["cache_ttl"])
+def load_status(version):
+    return get_status()
+
+@st.cache_data(ttl=DASHBOARD_CONFIG["cache_ttl"])
+def load_news_counts(version):
+    return get_news_counts()
+
+@st.cache_data(ttl=DASHBOARD_CONFIG["cache_ttl"])
+def load_daily_counts(version, days):
+    return get_daily_counts(days)
+
+@st.cache_data(ttl=DASHBOARD_CONFIG["cache_ttl"])
+def load_search(version, query, sources, start, end, collapse):
+    return search_news(query, sources=list(sources), start=start, end=end, limit=DASHBOARD_CONFIG["search_rows"],
+                       collapse=collapse)
+
+init_tables()
+version = get_data_version()
 
 st.title("📰 Stock News Scraper Dashboard")
-# --- Show Status Table
-st.subheader("Status Overview")
-status_df = get_status()
-st.dataframe(status_df)
+# --- Show Status and Jobs, polled while the page is open
+@st.fragment(run_every=DASHBOARD_CONFIG["poll_seconds"])
+def show_status():
+    st.subheader("Status Overview")
+    st.dataframe(load_status(get_data_version()))
+    st.subheader("Jobs")
+    st.caption("Jobs are run by the scheduler worker (python scheduler.py).")
+    st.dataframe(get_job_runs(DASHBOARD_CONFIG["job_rows"]), hide_index=True)
 
-total_count, per_source_df = get_news_counts()
+show_status()
+
+total_count, per_source_df = load_news_counts(version)
 st.metric("Total News", total_count)
 st.dataframe(per_source_df)
 
-# --- Scraper Runner
-def run_scraping():
-    scraping_status = status_df[status_df["activity"] == "scraping"]["status"].iloc[0]
-    if scraping_status == "running":
-        print("Scraping is already running. Skipping...")
-        return
-
-    # Mark as running
-    update_status("scraping", "running")
-    try:
-        print("Starting scraping...")
-        RunScrapers("all")
-        update_status("scraping", "success")
-
-    except Exception as e:
-        print(f"Scraping failed: {e}")
-        update_status("scraping", "failed")
-        st.error(f"Scraping failed: {e}")
+st.subheader(f"Daily Volume (last {DASHBOARD_CONFIG['daily_chart_days']} days)")
+st.bar_chart(load_daily_counts(version, DASHBOARD_CONFIG["daily_chart_days"]))
+
+# --- Full-text Search
+st.subheader("Search News")
+st.caption('All words must match; use "quoted phrases" and prefix* terms.')
+query_col, source_col, date_col = st.columns([3, 2, 2])
+query = query_col.text_input("Search", placeholder='BBRI "laba bersih" divid*')
+sources = source_col.multiselect("Sources", per_source_df["source"].tolist())
+dates = date_col.date_input("Published between", value=())
+collapse = st.checkbox("Collapse near-duplicate stories", value=True,
+                       help="Show one article per story syndicated across sources; copies counts the others.")
+if query:
+    start, end = (str(dates[0]), str(dates[-1])) if dates else (None, None)
+    results = load_search(version, query, tuple(sources), start, end, collapse)
+    st.write(f"{len(results)} results")
+    if not collapse:
+        results = results.drop(columns="copies")
+    st.dataframe(results, hide_index=True, column_config={"link": st.column_config.LinkColumn()})
 
 # --- Manual Trigger Button
 if st.button("Run Scraping Now"):
-    with st.spinner("Scraping in progress... please wait"):
-        run_scraping()
-        update_db_to_repo()
\ No newline at end of file
+    job_id = enqueue_job("all", trigger="manual")
+    st.success(f"Scraping job {job_id} queued.")
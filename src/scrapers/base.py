@@ -1,53 +1,233 @@
+import multiprocessing
 import pandas as pd
+import feedparser
 from abc import ABC, abstractmethod
-from utils import clean_text
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from sqlalchemy import text
+from utils import make_cleaner, HttpClient, RateLimiter, SeenLinks, NewsWriter, canonicalize_link
+from .fetcher import ConcurrentFetcher, DEFAULT_FETCH_CONFIG
+from .pipeline import StreamingPipeline
+
+NEWS_COLUMNS = ["published", "link", "title", "content"]
+
+
+def extract_article(parse_article, source, raw):
+    """
+    Parse and clean one fetched article. Module level so a process pool can
+    run it: only the raw page goes in and the small extracted dict comes back.
+
+    Args:
+        parse_article (callable): A scraper's static parse_article.
+        source (str): Source name, selects the boilerplate phrases to strip.
+        raw: Output of the scraper's fetch_raw.
+
+    Returns:
+        dict: 'content' (and optionally 'title'), or None if there is no body.
+    """
+    parsed = parse_article(raw)
+    if not parsed or parsed.get("content") is None:
+        return None
+    parsed["content"] = make_cleaner(source)(parsed["content"])
+    return parsed
+
 
 class BaseScraper(ABC):
-    def __init__(self, conn, table_name, source):
+    def __init__(self, conn, table_name, source, fetch_config=None):
         self.table_name = table_name
         self.source = source
         self.conn = conn
+        self.fetch_config = {**DEFAULT_FETCH_CONFIG, **(fetch_config or {})}
+        self.fetcher = ConcurrentFetcher(
+            max_workers=self.fetch_config["max_workers"],
+            host_concurrency=self.fetch_config["host_concurrency"],
+        )
+        self.rate_limiter = RateLimiter(
+            rate=self.fetch_config["rate"],
+            burst=self.fetch_config["burst"],
+            min_rate=self.fetch_config["min_rate"],
+            max_rate=self.fetch_config["max_rate"],
+            slow_response=self.fetch_config["slow_response"],
+        )
+        self.http = HttpClient(
+            timeout=self.fetch_config["timeout"],
+            retries=self.fetch_config["retries"],
+            backoff_factor=self.fetch_config["backoff_factor"],
+            pool_maxsize=self.fetch_config["max_workers"],
+            rate_limiter=self.rate_limiter,
+        )
+        self.writer = NewsWriter(self.conn.engine, self.table_name)
+        self.pending_feed_state = {}
+        self.parse_pool = None
+        self.page_cache = None
+        self.lease = None
+        self.cursors = {}
+        self.in_flight = {}
+        self.stored = []
 
     def get_last_date(self):
-        """Get the most recent published date from DB"""
-        query = f"""
-            SELECT MAX(published) AS last_date
-            FROM {self.table_name}
-            WHERE source = '{self.source}'
         """
-        last_date = pd.read_sql(query, con=self.conn.engine)["last_date"].iloc[0]
-        return pd.to_datetime(last_date)
+        Get the most recent published date of this source from its
+        ingest_state watermark (a primary-key lookup instead of a MAX scan),
+        and load the crawler's pagination cursors stored with it.
+        """
+        state = self.writer.read_state(self.source)
+        self.cursors = state["cursors"] if state else {}
+        last_date = pd.to_datetime(state["last_published"]) if state else None
+        if last_date is not None and last_date.tzinfo is not None:
+            # scrapers compare against naive Jakarta times
+            last_date = last_date.tz_convert("Asia/Jakarta").tz_localize(None)
+        return last_date
     
-    def get_scraped_links(self, last_date):
-        """Fetch the links from the source."""
-        last_date = last_date.strftime('%Y-%m-%d 00:00:00')
+    def init_news_index(self):
+        """
+        Ensure the news table and its unique (source, link) index exist,
+        dropping duplicate rows (keeping the oldest) before creating it.
+        """
+        self.writer.ensure_schema()
+
+    def canonical_link(self, link):
+        """Canonical form of link for this source (see utils/canonical_links.py)."""
+        return canonicalize_link(link, self.source)
+
+    def seen_links(self, canonical_links=()):
+        """Set of links compared in canonical form, so URL variants of one article match."""
+        return SeenLinks(canonical_links, canonicalize=self.canonical_link)
+
+    def get_scraped_links(self):
+        """
+        Load the canonical link of every article already stored for this
+        source, once per run, so discovery skips any URL variant of them
+        before fetching. Served from the (source, canonical_link) index
+        without touching the rows.
+        """
         query = f"""
-                    SELECT DISTINCT link as link
-                    FROM {self.table_name}
-                    WHERE DATETIME(published) >= '{last_date}'
-                    AND source = '{self.source}'
-                """
-        df = pd.read_sql(query, self.conn.engine)
-        return df['link'].tolist() if not df.empty else []
+            SELECT canonical_link FROM {self.table_name}
+            WHERE source = :source AND canonical_link IS NOT NULL
+        """
+        with self.conn.engine.connect() as connection:
+            result = connection.execute(text(query), {"source": self.source})
+            return self.seen_links(row[0] for row in result)
+
+    def update_cursor(self, listing, rows):
+        """
+        Remember the newest link of a finished listing crawl (rows in listing
+        order, newest first) so the next run can stop paging once it reaches
+        it. Cursors are stored with the watermark by save_state.
+        """
+        if rows:
+            self.cursors[listing] = rows[0][1]
+
+    def init_feed_state_table(self):
+        """Create the table holding HTTP validators for conditional feed requests."""
+        with self.conn.engine.begin() as connection:
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    dw_modify_ts TEXT
+                )
+            """))
+
+    def fetch_feed(self, url):
+        """
+        Fetch and parse an RSS feed with a conditional GET.
+
+        ETag / Last-Modified from the previous response are stored in the
+        feed_state table, so an unchanged feed costs one 304 and no parsing.
+        New validators are only saved by save_feed_state once the run that
+        consumed the feed has finished.
+
+        Returns:
+            feedparser.FeedParserDict or None if the feed has not changed.
+        """
+        self.init_feed_state_table()
+        with self.conn.engine.connect() as connection:
+            row = connection.execute(
+                text("SELECT etag, last_modified FROM feed_state WHERE url = :url"),
+                {"url": url}
+            ).fetchone()
+        etag, last_modified = row if row else (None, None)
+
+        resp = self.http.get_conditional(url, etag=etag, last_modified=last_modified)
+        if resp.status_code == 304:
+            print(f"Feed {url} not modified since last run.")
+            return None
+        resp.raise_for_status()
+        feed = feedparser.parse(resp.content)
+        self.pending_feed_state[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return feed
+
+    def save_feed_state(self):
+        """Persist validators of feeds fetched during this run."""
+        if not self.pending_feed_state:
+            return
+        with self.conn.engine.begin() as connection:
+            connection.execute(
+                text("""
+                    INSERT OR REPLACE INTO feed_state (url, etag, last_modified, dw_modify_ts)
+                    VALUES (:url, :etag, :last_modified, DATETIME('now'))
+                """),
+                [
+                    {"url": url, "etag": etag, "last_modified": last_modified}
+                    for url, (etag, last_modified) in self.pending_feed_state.items()
+                ]
+            )
+        self.pending_feed_state = {}
+
+    def check_lease(self):
+        """Raise LeaseLost if this run's lease (set by the runner, if any) is no longer held."""
+        if self.lease is not None:
+            self.lease.check()
 
     def save_to_db(self, df: pd.DataFrame):
-        """Append new records to the database."""
-        if not df.empty:
-            df.to_sql(self.table_name, self.conn.engine, if_exists="append", index=False)
-
-
-    def get_last_rowid(self):
-        """Get the last rowid from the table."""
-        query = f"SELECT MAX(rowid) AS last_rowid FROM {self.table_name}"
-        df = pd.read_sql(query, self.conn.engine)
-        return df['last_rowid'].iloc[0] if not df.empty else 0
-
-    def add_rowid(self, df: pd.DataFrame):
-        """Add a rowid column to the DataFrame."""
-        last_rowid = self.get_last_rowid()
-        if last_rowid is not None:
-            df['rowid'] = range(last_rowid + 1, last_rowid + 1 + len(df))
-        return df
+        """
+        Append new records to the database in one transaction. Rows whose
+        (source, link) or (source, canonical_link) is already stored are
+        skipped. The ingest_state watermark is left to save_state. Returns
+        rows inserted.
+        """
+        return self.writer.write(df, advance=False)
+
+    def track_discovered(self, records):
+        """Pass discovered records through, remembering each as in flight until it is stored or dropped."""
+        for record in records:
+            self.in_flight[record["link"]] = record["published"]
+            yield record
+
+    def mark_stored(self, df: pd.DataFrame):
+        for published, link in zip(df["published"], df["link"]):
+            self.in_flight.pop(link, None)
+            self.stored.append((published, link))
+
+    def save_state(self):
+        """
+        Advance the ingest_state watermark once discovery has finished, to the
+        newest stored article published before every article still in flight
+        (discovered but failed to fetch or parse, or a day whose listing
+        failed), and store the cursors with it. The pipeline finishes
+        articles out of publish order, so moving the watermark past an
+        unsaved article would hide it from every later discovery.
+
+        In-flight articles published more than retry_days before the newest
+        stored one no longer hold the watermark back and are given up.
+        """
+        if not self.stored:
+            return
+        stored = pd.DataFrame(self.stored, columns=["published", "link"])
+        retry_after = stored["published"].max() - pd.Timedelta(days=self.fetch_config["retry_days"])
+        retried = {key: published for key, published in self.in_flight.items() if published >= retry_after}
+        if len(retried) < len(self.in_flight):
+            print(f"[{self.source}] Giving up on {len(self.in_flight) - len(retried)} failed articles "
+                  f"published before {retry_after}.")
+        if retried:
+            oldest = min(retried.values())
+            stored = stored[stored["published"] < oldest]
+            print(f"[{self.source}] {len(retried)} articles failed; the watermark stays before {oldest} "
+                  f"so the next run retries them.")
+        stored["source"] = self.source
+        self.writer.commit_state(stored, cursors=dict(self.cursors))
 
     def add_metadata(self, df: pd.DataFrame):
         """Add metadata columns for data warehouse."""
@@ -56,30 +236,338 @@ class BaseScraper(ABC):
         df['DW_LOAD_TS'] = df['DW_LOAD_TS'].dt.tz_localize('Asia/Jakarta')
         df['DW_MODIFY_TS'] = pd.to_datetime('now')
         df['DW_MODIFY_TS'] = df['DW_MODIFY_TS'].dt.tz_localize('Asia/Jakarta')
-        df = self.add_rowid(df)
         return df
 
     @abstractmethod
-    def scrape(self, last_date, links) -> pd.DataFrame:
+    def discover(self, last_date, scraped_links):
+        """
+        Child classes must implement this method.
+        Should yield (or return an iterable of) dicts with keys
+        'published', 'link' and 'title' for articles not yet scraped.
+        """
+        pass
+
+    def fetch_raw(self, link):
+        """Download an article and return its raw HTML."""
+        resp = self.http.get(link)
+        resp.raise_for_status()
+        return resp.text
+
+    @abstractmethod
+    def parse_article(self, raw):
         """
         Child classes must implement this method.
-        Should return a DataFrame with columns:
-        'published', 'link', 'title', 'content'
+        Should turn the output of fetch_raw into a dict with 'content'
+        (and optionally 'title'), or None if the page has no article body.
+        Implementations are static methods that parse only the article
+        container (a SoupStrainer), so they can run without a scraper.
         """
         pass
 
+    def fetch_stage(self, record):
+        record["raw"] = self.fetcher.fetch_one(self.fetch_raw, record["link"])
+        if self.page_cache is not None:
+            self.page_cache.put(record["link"], record["raw"])
+        return record
+
+    def make_parse_pool(self):
+        """
+        Process pool for extract_article, or None to extract in the pipeline's
+        threads. Workers come from forkserver/spawn rather than fork, since
+        this process runs fetch threads.
+        """
+        processes = self.fetch_config["parse_processes"]
+        if not processes:
+            return None
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(method))
+
+    def extract_stage(self, record):
+        raw = record.pop("raw")
+        if self.parse_pool is None:
+            parsed = extract_article(self.parse_article, self.source, raw)
+        else:
+            parsed = self.parse_pool.submit(extract_article, self.parse_article, self.source, raw).result()
+        if parsed is None:
+            self.in_flight.pop(record["link"], None)  # no article body, nothing to retry
+            return None
+        record.update(parsed)
+        return record
+
+    def scrape(self, last_date, links):
+        """
+        Stream new articles through discover -> fetch -> extract (parse and
+        clean).
+
+        Stages run concurrently and are connected by bounded queues, so only
+        a limited number of article bodies is held in memory at any time.
+        With parse_processes > 0, extraction runs in a process pool; each
+        extract thread hands one article to the pool and waits for it, so a
+        failure is still reported against its link.
+
+        Yields:
+            pd.DataFrame: Micro-batches with columns
+            'published', 'link', 'title', 'content'
+        """
+        pipeline = StreamingPipeline(self.source, queue_size=self.fetch_config["queue_size"])
+        pipeline.add_stage(self.fetch_stage, workers=self.fetch_config["max_workers"], name="fetch")
+        pipeline.add_stage(self.extract_stage, workers=max(1, self.fetch_config["parse_processes"]), name="extract")
+        self.parse_pool = self.make_parse_pool()
+        try:
+            batches = pipeline.batches(
+                self.track_discovered(self.discover(last_date, links)),
+                batch_size=self.fetch_config["batch_size"],
+                batch_seconds=self.fetch_config["batch_seconds"],
+            )
+            for batch in batches:
+                yield pd.DataFrame(batch)[NEWS_COLUMNS]
+        finally:
+            if self.parse_pool is not None:
+                self.parse_pool.shutdown(cancel_futures=True)
+                self.parse_pool = None
+        if pipeline.errors:
+            raise RuntimeError(f"{self.source} discovery failed: {pipeline.errors[0]}")
+
+    def print_rate_report(self):
+        """Print how long each host was waited on versus actually fetched."""
+        for host, stats in self.rate_limiter.report().items():
+            print(
+                f"[{self.source}] {host}: {stats['requests']} requests, "
+                f"{stats['backoffs']} backoffs, waited {stats['wait_seconds']:.1f}s, "
+                f"fetching {stats['fetch_seconds']:.1f}s, rate {stats['rate']}/s"
+            )
+
+    def reextract(self, chunk_size=500):
+        """
+        Re-run the current parser over the cached pages of this source's
+        stored articles, without any network request, and update content
+        (and title, for parsers that return one) where the result differs.
+        Rows whose page is not cached or no longer parses are left as is.
+
+        Args:
+            chunk_size (int): Rows read, parsed and updated per transaction.
+
+        Returns:
+            dict: 'rows' stored, 'cached' pages found, 'changed' rows updated.
+        """
+        if self.page_cache is None:
+            raise RuntimeError(f"{self.source}: re-extraction needs a page cache")
+        query = text(f"""
+            SELECT rowid, link, title, content
+            FROM {self.table_name}
+            WHERE source = :source AND rowid > :after
+            ORDER BY rowid
+            LIMIT :limit
+        """)
+        stats = {"rows": 0, "cached": 0, "changed": 0}
+        pool = self.make_parse_pool()
+        last_rowid = 0
+        try:
+            while True:
+                with self.conn.engine.connect() as connection:
+                    chunk = pd.DataFrame(connection.execute(
+                        query, {"source": self.source, "after": last_rowid, "limit": chunk_size}
+                    ).mappings().all())
+                if chunk.empty:
+                    break
+                last_rowid = int(chunk["rowid"].iloc[-1])
+                stats["rows"] += len(chunk)
+
+                chunk["raw"] = [self.page_cache.get(link) for link in chunk["link"]]
+                chunk = chunk[chunk["raw"].notna()]
+                stats["cached"] += len(chunk)
+                if chunk.empty:
+                    continue
+                jobs = ([self.parse_article] * len(chunk), [self.source] * len(chunk), chunk["raw"])
+                parsed = list(pool.map(extract_article, *jobs) if pool else map(extract_article, *jobs))
+
+                updates = []
+                for row, result in zip(chunk.itertuples(index=False), parsed):
+                    if result is None:
+                        continue
+                    title = result.get("title", row.title)
+                    if result["content"] != row.content or title != row.title:
+                        updates.append({"rowid": row.rowid, "title": title, "content": result["content"]})
+                if updates:
+                    updates = pd.DataFrame(updates)
+                    updates["DW_MODIFY_TS"] = pd.Timestamp.now(tz="Asia/Jakarta")
+                    stats["changed"] += self.writer.update_articles(updates)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        print(f"[{self.source}] Re-extracted {stats['cached']} cached of {stats['rows']} rows, {stats['changed']} changed.")
+        return stats
+
     def run(self):
-        """Main execution flow."""
+        """Main execution flow. Returns the number of saved records."""
+        self.init_news_index()
         last_date = self.get_last_date()
-        links = self.get_scraped_links(last_date)
-        new_data = self.scrape(last_date, links)
-        if new_data.empty:
+        links = self.get_scraped_links()
+        saved = 0
+        self.in_flight, self.stored = {}, []
+        try:
+            for new_data in self.scrape(last_date, links):
+                new_data = self.add_metadata(new_data)
+                self.check_lease()
+                inserted = self.save_to_db(new_data)
+                links.update(new_data["link"])
+                self.mark_stored(new_data)
+                saved += inserted
+                print(f"[{self.source}] Saved {inserted} new records ({saved} total).")
+            self.check_lease()
+            self.save_state()
+            if not self.in_flight:
+                # a 304 next run would hide the failed articles
+                self.save_feed_state()
+        finally:
+            self.print_rate_report()
+        if not saved:
             print("No new data to save.")
-            return
-        new_data = self.add_metadata(new_data)
-        new_data['content'] = new_data['content'].apply(clean_text)
-        self.save_to_db(new_data)
-        print(f"Saved {len(new_data)} new records.")
+        return saved
 
     # def __del__(self):
-    #     self.conn.close()
\ No newline at end of file
+    #     self.conn.close()
+
+
+class DayIndexMixin(ABC):
+    """
+    Link discovery for sources whose index is listed per day (Kontan,
+    Bisnis): days are crawled by fetch_day_links, which such a scraper
+    implements, and checkpointed in crawl_days / crawl_links. Mixed in
+    before BaseScraper.
+    """
+
+    def init_crawl_tables(self):
+        """Create the checkpoint tables used by day-sharded link discovery."""
+        with self.conn.engine.begin() as connection:
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS crawl_days (
+                    source TEXT,
+                    day TEXT,
+                    n_links INTEGER,
+                    dw_modify_ts TEXT,
+                    PRIMARY KEY (source, day)
+                )
+            """))
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS crawl_links (
+                    source TEXT,
+                    link TEXT,
+                    day TEXT,
+                    title TEXT,
+                    PRIMARY KEY (source, link)
+                )
+            """))
+
+    def checkpoint_day(self, date, rows, completed):
+        """Store the links found for one day and, if the day is final, mark it done."""
+        day = date.strftime('%Y-%m-%d')
+        with self.conn.engine.begin() as connection:
+            if rows:
+                connection.execute(
+                    text("""
+                        INSERT OR IGNORE INTO crawl_links (source, link, day, title)
+                        VALUES (:source, :link, :day, :title)
+                    """),
+                    [{"source": self.source, "link": link, "day": day, "title": title}
+                     for _, link, title in rows]
+                )
+            if completed:
+                connection.execute(
+                    text("""
+                        INSERT OR REPLACE INTO crawl_days (source, day, n_links, dw_modify_ts)
+                        VALUES (:source, :day, :n_links, DATETIME('now'))
+                    """),
+                    {"source": self.source, "day": day, "n_links": len(rows)}
+                )
+
+    @abstractmethod
+    def fetch_day_links(self, date, scraped_links):
+        """
+        Crawl the listing of a single day. Listings are newest first; paging
+        may stop after the page holding the day's cursor (self.cursors[day]),
+        as older links were found before.
+
+        Returns:
+            tuple: ([(published, link, title)], complete) in listing order.
+        """
+        pass
+
+    def fetch_day_links_limited(self, date, scraped_links):
+        """fetch_day_links holding a HostLimiter slot for the listing host, like article fetches."""
+        with self.fetcher.slot(self.base_url):
+            return self.fetch_day_links(date, scraped_links)
+
+    def fetch_links_by_day(self, last_date, scraped_links):
+        """
+        Discover links day by day from last_date to today, several days at a
+        time; at most host_concurrency listing crawls run at once, sharing the
+        listing host's slots with any article fetches from it.
+
+        Every finished day's links are checkpointed in crawl_links, and past days
+        that were crawled completely are recorded in crawl_days, so an
+        interrupted backfill resumes from the first unfinished day. Today is
+        never marked done because new articles are still being published.
+
+        Yields:
+            dict: Keys 'published', 'link', 'title'. Links checkpointed by an
+            earlier run come first, then each day's links as soon as it is crawled.
+        """
+        self.init_crawl_tables()
+        start = last_date.normalize()
+        today = pd.Timestamp(datetime.now()).normalize()
+        self.cursors = {day: link for day, link in self.cursors.items() if day >= start.strftime('%Y-%m-%d')}
+
+        with self.conn.engine.begin() as connection:
+            for table in ["crawl_links", "crawl_days"]:
+                connection.execute(
+                    text(f"DELETE FROM {table} WHERE source = :source AND day < :start"),
+                    {"source": self.source, "start": start.strftime('%Y-%m-%d')}
+                )
+            completed_days = {
+                row[0] for row in connection.execute(
+                    text("SELECT day FROM crawl_days WHERE source = :source"),
+                    {"source": self.source}
+                )
+            }
+
+        stored = pd.read_sql(
+            text("""
+                SELECT day AS published, link, title
+                FROM crawl_links
+                WHERE source = :source AND day >= :start
+                ORDER BY day
+            """),
+            self.conn.engine,
+            params={"source": self.source, "start": start.strftime('%Y-%m-%d')}
+        )
+        yielded = self.seen_links()
+        for row in stored.itertuples(index=False):
+            if row.link not in scraped_links and row.link not in yielded:
+                yielded.add(row.link)
+                yield {"published": pd.to_datetime(row.published), "link": row.link, "title": row.title}
+
+        days = [
+            date for date in pd.date_range(start=start, end=today, freq="D")
+            if date.strftime('%Y-%m-%d') not in completed_days
+        ]
+        with ThreadPoolExecutor(max_workers=self.fetch_config["host_concurrency"]) as executor:
+            futures = {executor.submit(self.fetch_day_links_limited, date, scraped_links): date for date in days}
+            for future in as_completed(futures):
+                date = futures[future]
+                try:
+                    rows, complete = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Failed to fetch links for {date:%Y-%m-%d}: {e}")
+                    self.in_flight[f"day:{date:%Y-%m-%d}"] = date
+                    continue
+                self.checkpoint_day(date, rows, completed=complete and date < today)
+                if complete:
+                    self.update_cursor(date.strftime('%Y-%m-%d'), rows)
+                else:
+                    # keep the watermark before this day so the next run lists it again
+                    self.in_flight[f"day:{date:%Y-%m-%d}"] = date
+                for published, link, title in rows:
+                    if link not in yielded:
+                        yielded.add(link)
+                        yield {"published": published, "link": link, "title": title}
@@ -1,93 +1,96 @@
-from .base import BaseScraper
-import pandas as pd
+from .base import BaseScraper, DayIndexMixin
 import requests
-from bs4 import BeautifulSoup
-import random
-import time
-from tqdm import tqdm
-from datetime import datetime
-
-class BisnisScraper(BaseScraper):
-    def __init__(self, conn, table_name, base_url, delay_request_range):
-        super().__init__(conn=conn, table_name=table_name, source="bisnis")
+from bs4 import BeautifulSoup, SoupStrainer
+from .parsing import has_class
+
+ARTICLE_STRAINER = SoupStrainer('article', class_=has_class('detailsContent'))
+
+class BisnisScraper(DayIndexMixin, BaseScraper):
+    def __init__(self, conn, table_name, base_url, fetch_config=None):
+        super().__init__(conn=conn, table_name=table_name, source="bisnis", fetch_config=fetch_config)
         self.base_url = base_url
-        self.delay_request_range = delay_request_range
 
-    def fetch_links(self, last_date, scraped_links):
+    def discover(self, last_date, scraped_links):
         """
-        Fetch news links from Bisnis.com between last_date and today.
-        
+        Discover news links from Bisnis.com between last_date and today.
+        Days are crawled concurrently and checkpointed, see fetch_links_by_day.
+
         Args:
             last_date (datetime): The start date for scraping.
-            scraped_links (set/list): Already scraped links to skip.
+            scraped_links (SeenLinks): Already scraped links to skip.
+
+        Yields:
+            dict: Keys 'published', 'link', 'title'
+        """
+        return self.fetch_links_by_day(last_date, scraped_links)
+
+    def fetch_day_links(self, date, scraped_links):
+        """
+        Paginate Bisnis.com's index for a single day.
 
         Returns:
-            pd.DataFrame: Columns ['published', 'link', 'title']
+            tuple: ([(date, link, title)], complete) where complete is False
+            if a page request failed.
         """
-        scraped_links = set(scraped_links)
-        all_links = []
-
-        for date in pd.date_range(start=last_date, end=datetime.now(), freq="D"):
-            page = 1
-            while True:
-                url = self.base_url.format(date=date.strftime('%Y-%m-%d'), page=page)
-                try:
-                    resp = requests.get(url, timeout=15)
-                    resp.raise_for_status()
-                except requests.RequestException as e:
-                    print(f"[ERROR] Failed to fetch {url}: {e}")
-                    break
-
-                soup = BeautifulSoup(resp.text, "html.parser")
-                container = soup.find("div", id="indeksListView")
-                if not container:
-                    break
-
-                elements = container.find_all('div', class_='artContent')
-                if not elements:
-                    break
-
-                new_data = []
-                for element in elements:
-                    link_tag = element.find('a', class_='artLink')
-                    if not link_tag:
-                        continue
-                    link = link_tag['href']
-                    title_tag = link_tag.find(class_='artTitle')
-                    title = title_tag.get_text(strip=True) if title_tag else ""
-                    if link and link not in scraped_links:
-                        scraped_links.add(link)
-                        new_data.append((date, link, title))
-
-                if not new_data:
-                    break
-
-                all_links.extend(new_data)
-                page += 1
-                time.sleep(random.uniform(1, 10))
-
-        df = pd.DataFrame(all_links, columns=["published", "link", "title"])
-        df["published"] = pd.to_datetime(df["published"])
-        return df
-
-    def fetch_article_content(self, link) -> str:
+        cursor = self.cursors.get(date.strftime('%Y-%m-%d'))
+        page = 1
+        seen = self.seen_links()
+        day_links = []
+
+        while True:
+            url = self.base_url.format(date=date.strftime('%Y-%m-%d'), page=page)
+            try:
+                resp = self.http.get(url, timeout=15)
+                resp.raise_for_status()
+            except requests.RequestException as e:
+                print(f"[ERROR] Failed to fetch {url}: {e}")
+                return day_links, False
+
+            soup = BeautifulSoup(resp.text, "html.parser")
+            container = soup.find("div", id="indeksListView")
+            if not container:
+                break
+
+            elements = container.find_all('div', class_='artContent')
+            if not elements:
+                break
+
+            new_data = []
+            reached_cursor = False
+            for element in elements:
+                link_tag = element.find('a', class_='artLink')
+                if not link_tag:
+                    continue
+                link = link_tag['href']
+                reached_cursor = reached_cursor or link == cursor
+                title_tag = link_tag.find(class_='artTitle')
+                title = title_tag.get_text(strip=True) if title_tag else ""
+                if link and link not in scraped_links and link not in seen:
+                    seen.add(link)
+                    new_data.append((date, link, title))
+
+            if not new_data:
+                break
+
+            day_links.extend(new_data)
+            if reached_cursor:
+                break  # the rest of the day was listed by an earlier run
+            page += 1
+
+        return day_links, True
+
+    @staticmethod
+    def parse_article(raw):
         """
-        Fetch the full article content from Bisnis.com.
+        Extract the full article content from a Bisnis.com page.
         
         Args:
-            link (str): URL to the article.
+            raw (str): Article HTML.
         
         Returns:
-            str: Cleaned article text.
+            dict: {'content': article text} or None if there is no article body.
         """
-        try:
-            resp = requests.get(link, timeout=15)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            print(f"[ERROR] Failed to fetch article {link}: {e}")
-            return None
-
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(raw, "html.parser", parse_only=ARTICLE_STRAINER)
         article_body = soup.find('article', class_='detailsContent')
         if not article_body:
             return None
@@ -98,29 +101,4 @@ class BisnisScraper(BaseScraper):
             for p in paragraphs
             if p.get_text(strip=True) and not p.get_text(strip=True).startswith('#')
         ])
-        return content
-
-    def scrape(self, last_date, scraped_links):
-        """
-        Main scraping method.
-        
-        Args:
-            last_date (datetime): Start date for scraping.
-            scraped_links (list/set): Links already scraped.
-        
-        Returns:
-            pd.DataFrame: Columns ['published', 'link', 'title', 'content']
-        """
-        df = self.fetch_links(last_date, scraped_links)
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-
-        for i, row in tqdm(df.iterrows(), total=df.shape[0], desc=f"Scraping {self.source}"):
-            content = self.fetch_article_content(row["link"])
-            df.at[i, "content"] = content
-            time.sleep(random.uniform(*self.delay_request_range))
-        df = df.dropna(subset=["content"])
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-
-        return df[["published", "link", "title", "content"]]
\ No newline at end of file
+        return {"content": content}
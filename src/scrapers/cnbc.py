@@ -1,21 +1,20 @@
 from .base import BaseScraper
 import pandas as pd
-import requests
-import feedparser
-from bs4 import BeautifulSoup
-import random
-import time
-from tqdm import tqdm
+from bs4 import BeautifulSoup, SoupStrainer
+from .parsing import has_class
+
+ARTICLE_STRAINER = SoupStrainer("div", class_=has_class("detail-text"))
 
 class CNBCScraper(BaseScraper):
-    def __init__(self, conn, table_name, base_url, delay_request_range):
-        super().__init__(conn=conn, table_name=table_name, source="cnbc")
+    def __init__(self, conn, table_name, base_url, fetch_config=None):
+        super().__init__(conn=conn, table_name=table_name, source="cnbc", fetch_config=fetch_config)
         self.base_url = base_url
-        self.delay_request_range = delay_request_range
 
     def fetch_rss(self):
         """Fetch the RSS feed from CNBC Indonesia."""
-        feed = feedparser.parse(self.base_url)
+        feed = self.fetch_feed(self.base_url)
+        if feed is None:
+            return pd.DataFrame(columns=["title", "link", "published"])
         df = pd.DataFrame([{
             "title": e.title,
             "link": e.link,
@@ -24,27 +23,19 @@ class CNBCScraper(BaseScraper):
         df["published"] = pd.to_datetime(df["published"])
         return df
 
-    def fetch_article_content(self, link) -> str:
-        """Fetch the full article content from the given link."""
-        resp = requests.get(link)
-        soup = BeautifulSoup(resp.text, "html.parser")
+    @staticmethod
+    def parse_article(raw):
+        """Extract the article text from a CNBC Indonesia page."""
+        soup = BeautifulSoup(raw, "html.parser", parse_only=ARTICLE_STRAINER)
         div = soup.find("div", class_="detail-text")
         if not div:
             return None
-        return " ".join(p.get_text(strip=True) for p in div.find_all("p"))
+        return {"content": " ".join(p.get_text(strip=True) for p in div.find_all("p"))}
 
-    def scrape(self, last_date, links=None) -> pd.DataFrame:
-        """Scrape CNBC Indonesia RSS feed and fetch full article content."""
+    def discover(self, last_date, scraped_links):
+        """Yield RSS entries published after last_date."""
         df = self.fetch_rss()
-        df = df[df["published"] > last_date]
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        for i, row in tqdm(df.iterrows(), total=df.shape[0], desc=f"Scraping {self.source}"):
-            content = self.fetch_article_content(row["link"])
-            df.at[i, "content"] = content
-            time.sleep(random.uniform(*self.delay_request_range))
-        df = df.dropna(subset=["content"])
         if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-
-        return df[["published", "link", "title", "content"]]
\ No newline at end of file
+            return []
+        df = df[(df["published"] > last_date) & df["link"].map(lambda link: link not in scraped_links)]
+        return df[["published", "link", "title"]].to_dict("records")
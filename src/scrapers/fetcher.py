@@ -0,0 +1,95 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from config import SCRAPER_CONFIG
+
+# config.py is the single source of the fetch settings; a source's own
+# "fetch" entry and the fetch_config argument override them
+DEFAULT_FETCH_CONFIG = SCRAPER_CONFIG["fetch"]
+
+
+class HostLimiter:
+    """
+    Per-host politeness: caps in-flight fetches per host. Request pacing is
+    done by the rate limiter inside HttpClient.
+    """
+
+    def __init__(self, host_concurrency):
+        self.host_concurrency = host_concurrency
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.host_concurrency)
+            return self._semaphores[host]
+
+    def acquire(self, host):
+        """Block until a fetch for host may start."""
+        self._semaphore(host).acquire()
+
+    def try_acquire(self, host):
+        """Take a slot for host if one is free right now, without waiting."""
+        return self._semaphore(host).acquire(blocking=False)
+
+    def release(self, host):
+        self._semaphore(host).release()
+
+
+class ConcurrentFetcher:
+    """Runs fetches under the per-host concurrency cap of a HostLimiter."""
+
+    def __init__(self, max_workers, host_concurrency):
+        self.max_workers = max_workers
+        self.limiter = HostLimiter(host_concurrency)
+
+    @contextmanager
+    def slot(self, link):
+        """Hold a concurrency slot for the link's host."""
+        host = urlparse(link).netloc
+        self.limiter.acquire(host)
+        try:
+            yield
+        finally:
+            self.limiter.release(host)
+
+    def fetch_more(self, fetch_fn, links, budget):
+        """
+        Call fetch_fn on each of links from inside a slot the caller already
+        holds for their host, e.g. the remaining pages of a multi-page
+        article. Up to budget - 1 extra slots are borrowed, but only those
+        free right now, so an article never waits on slots held by other
+        articles (no deadlock) and never takes more than its budget of the
+        host (no starvation). With no free slot the links are fetched one
+        after another on the held slot.
+
+        Returns:
+            list: fetch_fn(link) for each link in order. The first exception
+            raised by any fetch is re-raised once all fetches finished.
+        """
+        if not links:
+            return []
+        host = urlparse(links[0]).netloc
+        extra = 0
+        while extra < min(budget, len(links)) - 1 and self.limiter.try_acquire(host):
+            extra += 1
+        try:
+            if not extra:
+                return [fetch_fn(link) for link in links]
+            with ThreadPoolExecutor(max_workers=extra + 1) as pool:
+                futures = [pool.submit(fetch_fn, link) for link in links]
+            return [future.result() for future in futures]
+        finally:
+            for _ in range(extra):
+                self.limiter.release(host)
+
+    def fetch_one(self, fetch_fn, link):
+        """Call fetch_fn(link) while holding a concurrency slot for the link's host."""
+        with self.slot(link):
+            return fetch_fn(link)
@@ -1,18 +1,17 @@
 from .base import BaseScraper
 import pandas as pd
-import requests
-import feedparser
-from bs4 import BeautifulSoup
-import random
-import time
-from tqdm import tqdm
+import re
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urlparse
+from .parsing import has_class
+
+PAGINATION_STRAINER = SoupStrainer("a", href=True)
+ARTICLE_STRAINER = SoupStrainer('div', class_=has_class('article--content'))
 
 class IDXScraper(BaseScraper):
-    def __init__(self, conn, table_name, base_url, delay_request_range):
-        super().__init__(conn=conn, table_name=table_name, source="idx")
+    def __init__(self, conn, table_name, base_url, fetch_config=None):
+        super().__init__(conn=conn, table_name=table_name, source="idx", fetch_config=fetch_config)
         self.base_url = base_url
-        self.delay_request_range = delay_request_range
 
     def fetch_rss(self):
         """
@@ -21,10 +20,12 @@ class IDXScraper(BaseScraper):
             pd.DataFrame: Columns ['published', 'link', 'title']
         """
         try:
-            feed = feedparser.parse(self.base_url)
+            feed = self.fetch_feed(self.base_url)
         except Exception as e:
             print(f"[ERROR] Failed to parse RSS: {e}")
             return pd.DataFrame(columns=["published", "link", "title"])
+        if feed is None:
+            return pd.DataFrame(columns=["published", "link", "title"])
 
         data = []
         for entry in feed.entries:
@@ -45,70 +46,109 @@ class IDXScraper(BaseScraper):
         df["published"] = pd.to_datetime(df["published"])
         return df
 
-    def fetch_article_content(self, link) -> str:
+    def fetch_page(self, link_with_page):
+        """Fetch one article page and return its HTML; raises on failure."""
+        resp = self.http.get(link_with_page, timeout=15)
+        resp.raise_for_status()
+        return resp.text
+
+    @staticmethod
+    def parse_page_count(soup, link):
+        """
+        Read the number of pages from the pagination links of an article page.
+
+        Pagination anchors point at '{link}/{n}'; the largest n is the page count.
         """
-        Fetch full multi-page article content from IDX .
-        
+        article_path = urlparse(link).path.rstrip("/")
+        pattern = re.compile(rf"^{re.escape(article_path)}/(\d+)/?$")
+        page_count = 1
+        for a in soup.find_all("a", href=True):
+            match = pattern.match(urlparse(a["href"]).path)
+            if match:
+                page_count = max(page_count, int(match.group(1)))
+        return page_count
+
+    @staticmethod
+    def parse_page_content(html):
+        """Extract the paragraphs of one article page, or None if it has no body."""
+        if html is None:
+            return None
+        soup = BeautifulSoup(html, "html.parser", parse_only=ARTICLE_STRAINER)
+        container1 = soup.find('div', class_='article--content')
+        if not container1:
+            return None
+        container2 = container1.find('div', class_='content')
+        if not container2:
+            return None
+        paragraphs = container2.find_all('p')
+        return " ".join([p.get_text() for p in paragraphs])
+
+    def fetch_raw(self, link):
+        """
+        Fetch every page of a multi-page IDX article.
+
+        The page count is read from the first page's pagination, then the
+        remaining pages are fetched concurrently with ConcurrentFetcher.fetch_more:
+        fetch_raw runs inside the host slot fetch_stage holds, and the pages
+        use at most page_concurrency slots of the host in total, borrowing
+        only slots that are free, so the host_concurrency cap holds and
+        articles never wait on each other.
+
+        A failed page fails the whole article (the exception propagates), so
+        it stays in flight for the next run instead of being stored without
+        the pages it is missing.
+
         Args:
             link (str): Article URL.
-        
+
         Returns:
-            str: Cleaned combined article text.
+            list: HTML of each page in order.
         """
-        page = 1
-        whole_content = ""
-
-        while True:
-            link_with_page = f"{link}/{page}"
-            try:
-                resp = requests.get(link_with_page, timeout=15)
-                resp.raise_for_status()
-            except requests.RequestException as e:
-                print(f"[ERROR] Failed to fetch {link_with_page}: {e}")
-                break
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-            container1 = soup.find('div', class_='article--content')
-            if not container1:
-                break
-            container2 = container1.find('div', class_='content')
-            if not container2:
-                break
-
-            paragraphs = container2.find_all('p')
-            content = " ".join([p.get_text() for p in paragraphs])
-            whole_content += " " + content
-
-            page += 1
-            time.sleep(random.uniform(1, 10))
-
-        whole_content = whole_content.strip()
+        first_page = self.fetch_page(f"{link}/1")
+        page_count = self.parse_page_count(BeautifulSoup(first_page, "html.parser", parse_only=PAGINATION_STRAINER), link)
+        more_pages = self.fetcher.fetch_more(
+            self.fetch_page,
+            [f"{link}/{page}" for page in range(2, page_count + 1)],
+            budget=self.fetch_config["page_concurrency"],
+        )
+        return [first_page] + more_pages
+
+    @staticmethod
+    def parse_article(raw):
+        """
+        Join the content of all pages of an IDX article.
+
+        Args:
+            raw (list): Page HTML as returned by fetch_raw.
+
+        Returns:
+            dict: {'content': combined article text} or None if there is no
+            body or a page is missing (None, as cached by older versions).
+        """
+        if any(html is None for html in raw):
+            return None
+        contents = [IDXScraper.parse_page_content(html) for html in raw]
+        if contents[0] is None:
+            return None
+
+        whole_content = " ".join(c for c in contents if c).strip()
         if not whole_content:
             return None
-        return whole_content
+        return {"content": whole_content}
 
-    def scrape(self, last_date, scraped_links):
+    def discover(self, last_date, scraped_links):
         """
-        Main scraping routine for IDX .
-        
+        Yield new market-news entries from the IDX RSS feed.
+
         Args:
-            scraped_links (list/set): Links already scraped.
-        
+            last_date (datetime): Only scrape articles after this date.
+            scraped_links (SeenLinks): Links already scraped.
+
         Returns:
-            pd.DataFrame: Columns ['published', 'link', 'title', 'content']
+            list: Dicts with keys 'published', 'link', 'title'
         """
         df = self.fetch_rss()
         if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        df = df[(df["published"] > last_date) & (~df["link"].isin(set(scraped_links)))]
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        for i, row in tqdm(df.iterrows(), total=df.shape[0], desc=f"Scraping {self.source}"):
-            content = self.fetch_article_content(row["link"])
-            df.at[i, "content"] = content
-            time.sleep(random.uniform(*self.delay_request_range))
-        df = df.dropna(subset=["content"])
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-
-        return df[["published", "link", "title", "content"]]
\ No newline at end of file
+            return []
+        df = df[(df["published"] > last_date) & df["link"].map(lambda link: link not in scraped_links)]
+        return df[["published", "link", "title"]].to_dict("records")
@@ -1,39 +1,39 @@
 from .base import BaseScraper
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
-import random
-import time
-from tqdm import tqdm
-from datetime import datetime
+from bs4 import BeautifulSoup, SoupStrainer
+
+ARTICLE_STRAINER = SoupStrainer("div", id="zoomthis")
 
 class IQPlusScraper(BaseScraper):
-    def __init__(self, conn, table_name, base_url, delay_request_range):
-        super().__init__(conn=conn, table_name=table_name, source="iqplus")
+    def __init__(self, conn, table_name, base_url, fetch_config=None):
+        super().__init__(conn=conn, table_name=table_name, source="iqplus", fetch_config=fetch_config)
         self.base_url = base_url
-        self.delay_request_range = delay_request_range
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
             'Referer': 'http://www.iqplus.info'
         }
 
-    def fetch_links(self, last_date, scraped_links):
+    def discover(self, last_date, scraped_links):
         """
-        Fetch news article links from IQPlus between last_date and today.
+        Discover news article links from IQPlus between last_date and today.
+        The listing is newest first, so each page is yielded as soon as it is
+        parsed and paging stops at the page that reaches last_date (the
+        ingest watermark) rather than re-walking the whole last day.
+
         Args:
             last_date (datetime): The start date for scraping.
-            scraped_links (set/list): Already scraped links to skip.
+            scraped_links (SeenLinks): Already scraped links to skip.
 
-        Returns:
-            pd.DataFrame: Columns ['published', 'link', 'title']
+        Yields:
+            dict: Keys 'published', 'link', 'title'
         """
-        df = pd.DataFrame(columns=['published', 'link', 'title'])
         page = 1
-        scraped_links = set(scraped_links) 
+        seen = self.seen_links()
         while True:
             url = self.base_url.format(page=page)
             try:
-                resp = requests.get(url, headers=self.headers, timeout=15)
+                resp = self.http.get(url, headers=self.headers, timeout=15)
                 resp.raise_for_status()
             except requests.RequestException as e:
                 print(f"[ERROR] Failed to fetch {url}: {e}")
@@ -54,37 +54,34 @@ class IQPlusScraper(BaseScraper):
                 link = a_tag["href"]
                 title = a_tag.get_text(strip=True)
 
-                if link and link not in scraped_links:
+                if link and link not in scraped_links and link not in seen:
                     new_data.append({
                         'published': published,
                         'link': link,
                         'title': title
                     })
-                    scraped_links.add(link)
+                    seen.add(link)
 
             if not new_data:
                 break
             df_current_page = pd.DataFrame(new_data)
             df_current_page['published'] = pd.to_datetime(df_current_page['published'], format='%d/%m/%y - %H:%M')
+            yield from df_current_page[df_current_page['published'] > last_date].to_dict("records")
 
-            # Stop if older than last_date
-            if df_current_page['published'].min().normalize() < last_date.normalize():
+            # Stop once the page reaches the ingest watermark
+            if df_current_page['published'].min() <= last_date:
                 break
-            
-            if not df.empty:
-                df = pd.concat([df, df_current_page], ignore_index=True)
 
-            time.sleep(random.uniform(1, 10))
             page += 1
 
-        return df
-
-    def fetch_article_content(self, link):
-        resp = requests.get(link, headers=self.headers)
-        if resp.status_code != 200:
-            return None
+    def fetch_raw(self, link):
+        resp = self.http.get(link, headers=self.headers)
+        resp.raise_for_status()
+        return resp.text
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+    @staticmethod
+    def parse_article(raw):
+        soup = BeautifulSoup(raw, "html.parser", parse_only=ARTICLE_STRAINER)
         zoom_div = soup.find("div", id="zoomthis")
         if not zoom_div:
             return None
@@ -94,20 +91,4 @@ class IQPlusScraper(BaseScraper):
             tag.decompose()
 
         news_content = zoom_div.get_text(separator="\n", strip=True)
-        return news_content
-
-    def scrape(self, last_date, scraped_links):
-        df = self.fetch_links(last_date, scraped_links)
-        df = df[(df['published'] > last_date)]
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        
-        for i, row in tqdm(df.iterrows(), total=df.shape[0], desc=f"Scraping {self.source}"):
-            content = self.fetch_article_content(row["link"])
-            df.at[i, 'content'] = content
-            time.sleep(random.uniform(*self.delay_request_range))
-        df = df.dropna(subset=["content"])
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        
-        return df[["published", "link", "title", "content"]]
\ No newline at end of file
+        return {"content": news_content}
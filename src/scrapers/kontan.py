@@ -1,77 +1,89 @@
-from .base import BaseScraper
-import pandas as pd
+from .base import BaseScraper, DayIndexMixin
 import requests
-from bs4 import BeautifulSoup
-import random
-import time
-from tqdm import tqdm
-from datetime import datetime
-
-class KontanScraper(BaseScraper):
-    def __init__(self, conn, table_name, base_url, delay_request_range):
-        super().__init__(conn=conn, table_name=table_name, source="kontan")
+from bs4 import BeautifulSoup, SoupStrainer
+from .parsing import AnyStrainer
+
+ARTICLE_STRAINER = AnyStrainer(SoupStrainer('title'), SoupStrainer(attrs={"itemprop": 'articleBody'}))
+
+class KontanScraper(DayIndexMixin, BaseScraper):
+    def __init__(self, conn, table_name, base_url, fetch_config=None):
+        super().__init__(conn=conn, table_name=table_name, source="kontan", fetch_config=fetch_config)
         self.base_url = base_url
-        self.delay_request_range = delay_request_range
 
-    def fetch_links(self, last_date, scraped_links):
+    def discover(self, last_date, scraped_links):
         """
-        Fetch news article links from Kontan between last_date and today.
-        
+        Discover news article links from Kontan between last_date and today.
+        Days are crawled concurrently and checkpointed, see fetch_links_by_day.
+
         Args:
             last_date (datetime): Start date for fetching.
-            scraped_links (set/list): Links already scraped to skip.
+            scraped_links (SeenLinks): Links already scraped to skip.
+
+        Yields:
+            dict: Keys 'published', 'link', 'title' (title is read from the article)
+        """
+        return self.fetch_links_by_day(last_date, scraped_links)
+
+    def fetch_day_links(self, date, scraped_links):
+        """
+        Paginate Kontan's index for a single day.
 
         Returns:
-            pd.DataFrame: Columns ['published', 'link']
+            tuple: ([(date, link, None)], complete) where complete is False
+            if a page request failed.
         """
-        scraped_links = set(scraped_links)  # fast lookups
-        all_links = []
-
-        date_range = pd.date_range(start=last_date, end=datetime.now(), freq='D')
-
-        for date in tqdm(date_range, desc="Fetching links"):
-            day, month, year = date.strftime('%d'), date.strftime('%m'), date.strftime('%Y')
-            per_page = 0
-
-            while True:
-                url = self.base_url.format(day=day, month=month, year=year, per_page=str(per_page))
-                try:
-                    resp = requests.get(url, timeout=15)
-                    resp.raise_for_status()
-                except requests.RequestException as e:
-                    print(f"[ERROR] Failed to fetch {url}: {e}")
-                    break
-
-                soup = BeautifulSoup(resp.text, "html.parser")
-                berita_div = soup.find('div', class_='list-berita')
-                if not berita_div:
-                    break
-
-                berita_items = berita_div.find_all('div', class_='sp-hl linkto-black')
-                if not berita_items:
-                    break
-
-                new_links = []
-                for item in berita_items:
-                    link = item.find('a').get('href')
-                    if link and link not in scraped_links:
-                        scraped_links.add(link)
-                        new_links.append(link)
-
-                if not new_links:
-                    break  # No more new links → stop pagination
-
-                all_links.extend([(date, link) for link in new_links])
-                per_page += 20
-                time.sleep(random.uniform(1, 10))
-
-        df = pd.DataFrame(all_links, columns=['published', 'link'])
-        df['published'] = pd.to_datetime(df['published'])
-        return df
-
-    def fetch_article_content(self, link):
+        day, month, year = date.strftime('%d'), date.strftime('%m'), date.strftime('%Y')
+        cursor = self.cursors.get(date.strftime('%Y-%m-%d'))
+        per_page = 0
+        seen = self.seen_links()
+        day_links = []
+
+        while True:
+            url = self.base_url.format(day=day, month=month, year=year, per_page=str(per_page))
+            try:
+                resp = self.http.get(url, timeout=15)
+                resp.raise_for_status()
+            except requests.RequestException as e:
+                print(f"[ERROR] Failed to fetch {url}: {e}")
+                return day_links, False
+
+            soup = BeautifulSoup(resp.text, "html.parser")
+            berita_div = soup.find('div', class_='list-berita')
+            if not berita_div:
+                break
+
+            berita_items = berita_div.find_all('div', class_='sp-hl linkto-black')
+            if not berita_items:
+                break
+
+            new_links = []
+            reached_cursor = False
+            for item in berita_items:
+                link = item.find('a').get('href')
+                reached_cursor = reached_cursor or link == cursor
+                if link and link not in scraped_links and link not in seen:
+                    seen.add(link)
+                    new_links.append(link)
+
+            if not new_links:
+                break  # No more new links → stop pagination
+
+            day_links.extend([(date, link, None) for link in new_links])
+            if reached_cursor:
+                break  # the rest of the day was listed by an earlier run
+            per_page += 20
+
+        return day_links, True
+
+    def fetch_raw(self, link):
+        resp = self.http.get(link, timeout=30)
+        resp.raise_for_status()
+        return resp.text
+
+    @staticmethod
+    def parse_article(raw):
         """
-        Fetch the full article content and title from a given link.
+        Extract the full article content and title from a Kontan page.
         Filters out unwanted phrases.
         """
         exclude_phrases = {
@@ -82,14 +94,7 @@ class KontanScraper(BaseScraper):
             'Menarik Dibaca', 
             'Selanjutnya:'
         }
-        try:
-            resp = requests.get(link, timeout=30)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            print(f"[ERROR] Failed to fetch article {link}: {e}")
-            return None, None
-
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(raw, "html.parser", parse_only=ARTICLE_STRAINER)
 
         title_tag = soup.find('title')
         title = title_tag.get_text(strip=True) if title_tag else ""
@@ -105,25 +110,4 @@ class KontanScraper(BaseScraper):
             ]
             content = " ".join(content_parts)
 
-        return title, content
-
-    def scrape(self, last_date, links):
-        """Scrape Kontan links and fetch full article content."""
-        df = self.fetch_links(last_date, links)
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-
-        titles = []
-        contents = []
-        for _, row in tqdm(df.iterrows(), total=len(df), desc=f"Scraping {self.source}"):
-            title, content = self.fetch_article_content(row["link"])
-            titles.append(title)
-            contents.append(content)
-            time.sleep(random.uniform(*self.delay_request_range))
-
-        df["title"] = titles
-        df["content"] = contents
-        df = df.dropna(subset=["content", "title"])
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        return df[["published", "link", "title", "content"]]
+        return {"title": title, "content": content}
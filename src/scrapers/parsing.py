@@ -0,0 +1,45 @@
+import re
+from bs4 import SoupStrainer
+
+
+def has_class(name):
+    """
+    class_ filter for SoupStrainer. While parsing, the strainer sees the raw
+    class attribute ("a b c") rather than a list, so match one of its words.
+    """
+    return re.compile(rf"(?:^|\s){re.escape(name)}(?:\s|$)")
+
+
+class AnyStrainer(SoupStrainer):
+    """
+    SoupStrainer that keeps the elements matched by any of several strainers,
+    e.g. a page's <title> and its article container, in a single parse.
+
+    BeautifulSoup asks the strainer through allow_tag_creation and
+    allow_string_creation since bs4 4.13 and through search_tag and search
+    before, so both are implemented and the strainer works on either.
+    """
+
+    def __init__(self, *strainers):
+        super().__init__()
+        self.strainers = strainers
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        return any(strainer.allow_string_creation(string) for strainer in self.strainers)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        for strainer in self.strainers:
+            found = strainer.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+    def search(self, markup):
+        for strainer in self.strainers:
+            found = strainer.search(markup)
+            if found:
+                return found
+        return None
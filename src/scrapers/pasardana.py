@@ -1,18 +1,15 @@
 from .base import BaseScraper
 import pandas as pd
-import requests
-import feedparser
-from bs4 import BeautifulSoup
-import random
-import time
-from tqdm import tqdm
+from bs4 import BeautifulSoup, SoupStrainer
+from .parsing import has_class
 from urllib.parse import urlparse
 
+ARTICLE_STRAINER = SoupStrainer('section', class_=has_class('entry-content'))
+
 class PasarDanaScraper(BaseScraper):
-    def __init__(self, conn, table_name, base_url, delay_request_range):
-        super().__init__(conn=conn, table_name=table_name, source="pasardana")
+    def __init__(self, conn, table_name, base_url, fetch_config=None):
+        super().__init__(conn=conn, table_name=table_name, source="pasardana", fetch_config=fetch_config)
         self.base_url = base_url
-        self.delay_request_range = delay_request_range
 
     def fetch_links(self):
         """
@@ -22,10 +19,12 @@ class PasarDanaScraper(BaseScraper):
             pd.DataFrame: Columns ['published', 'link', 'title']
         """
         try:
-            feed = feedparser.parse(self.base_url)
+            feed = self.fetch_feed(self.base_url)
         except Exception as e:
             print(f"[ERROR] Failed to parse RSS: {e}")
             return pd.DataFrame(columns=["published", "link", "title"])
+        if feed is None:
+            return pd.DataFrame(columns=["published", "link", "title"])
 
         data = []
         for entry in feed.entries:
@@ -41,57 +40,41 @@ class PasarDanaScraper(BaseScraper):
 
         return df
 
-    def fetch_article_content(self, link) -> str:
+    @staticmethod
+    def parse_article(raw):
         """
-        Fetch article content from PasarDana.
+        Extract article content from a PasarDana page.
 
         Args:
-            link (str): Article URL.
+            raw (str): Article HTML.
 
         Returns:
-            str: Cleaned article text.
+            dict: {'content': article text} or None if there is no article body.
         """
-        try:
-            resp = requests.get(link, timeout=15)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            print(f"[ERROR] Failed to fetch {link}: {e}")
-            return None
-
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(raw, "html.parser", parse_only=ARTICLE_STRAINER)
         section = soup.find('section', class_='entry-content')
         if not section:
             return None
 
         paragraphs = section.find_all('p')
         content = " ".join([p.get_text() for p in paragraphs])
-        return content
+        return {"content": content}
 
-    def scrape(self, last_date, scraped_links):
+    def discover(self, last_date, scraped_links):
         """
-        Main scraping routine for PasarDana.
+        Yield new articles from the PasarDana RSS feed.
 
         Args:
-            scraped_links (list/set): Links already scraped.
             last_date (datetime): Only scrape articles after this date.
+            scraped_links (SeenLinks): Links already scraped.
 
         Returns:
-            pd.DataFrame: Columns ['published', 'link', 'title', 'content']
+            list: Dicts with keys 'published', 'link', 'title'
         """
         df = self.fetch_links()
         if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
+            return []
 
         # Filter new articles
-        df = df[(df["published"] > last_date) & (~df["link"].isin(set(scraped_links)))]
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-
-        for i, row in tqdm(df.iterrows(), total=df.shape[0], desc=f"Scraping {self.source}"):
-            content = self.fetch_article_content(row["link"])
-            df.at[i, "content"] = content
-            time.sleep(random.uniform(*self.delay_request_range))
-        df = df.dropna(subset=["content"])
-        if df.empty:
-            return pd.DataFrame(columns=["published", "link", "title", "content"])
-        return df
\ No newline at end of file
+        df = df[(df["published"] > last_date) & df["link"].map(lambda link: link not in scraped_links)]
+        return df[["published", "link", "title"]].to_dict("records")
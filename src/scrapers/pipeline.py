@@ -0,0 +1,116 @@
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class StreamingPipeline:
+    """
+    Chain of stages connected by bounded queues.
+
+    The first stage is an iterable run on its own thread; every following
+    stage is a function applied to each item by one or more worker threads.
+    A stage function may return None to drop the item. Results are consumed
+    by iterating batches(), which groups them into micro-batches of at most
+    batch_size items or batch_seconds of waiting, whichever comes first.
+    """
+
+    def __init__(self, source, queue_size=50):
+        self.source = source
+        self.queue_size = queue_size
+        self.stages = []
+        self._stop = threading.Event()
+        self.errors = []
+
+    def add_stage(self, fn, workers=1, name=None):
+        self.stages.append((fn, workers, name or fn.__name__))
+        return self
+
+    def _put(self, q, item):
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        """Next item of q, or _DONE once the pipeline is stopped, so no thread outlives an aborted run."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _produce(self, iterable, out_q):
+        try:
+            for item in iterable:
+                if not self._put(out_q, item):
+                    return
+        except Exception as e:
+            print(f"[ERROR] {self.source} discovery failed: {e}")
+            self.errors.append(e)
+        finally:
+            self._put(out_q, _DONE)
+
+    def _work(self, fn, name, in_q, out_q, remaining, lock):
+        while True:
+            item = self._get(in_q)
+            if item is _DONE:
+                self._put(in_q, _DONE)  # let sibling workers see it too
+                break
+            try:
+                result = fn(item)
+            except Exception as e:
+                print(f"[ERROR] {self.source} {name} failed for {item.get('link', item)}: {e}")
+                continue
+            if result is not None and not self._put(out_q, result):
+                return
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self._put(out_q, _DONE)
+
+    def _start(self, iterable):
+        in_q = queue.Queue(maxsize=self.queue_size)
+        threads = [threading.Thread(target=self._produce, args=(iterable, in_q), daemon=True)]
+        for fn, workers, name in self.stages:
+            out_q = queue.Queue(maxsize=self.queue_size)
+            remaining, lock = [workers], threading.Lock()
+            threads.extend(
+                threading.Thread(target=self._work, args=(fn, name, in_q, out_q, remaining, lock), daemon=True)
+                for _ in range(workers)
+            )
+            in_q = out_q
+        for thread in threads:
+            thread.start()
+        return in_q
+
+    def batches(self, iterable, batch_size, batch_seconds):
+        """Run the pipeline over iterable and yield lists of finished items."""
+        out_q = self._start(iterable)
+        batch = []
+        deadline = time.monotonic() + batch_seconds
+        try:
+            while True:
+                try:
+                    item = out_q.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = None
+                if item is _DONE:
+                    break
+                if item is not None:
+                    batch.append(item)
+                if batch and (len(batch) >= batch_size or time.monotonic() >= deadline):
+                    yield batch
+                    batch = []
+                if time.monotonic() >= deadline:
+                    deadline = time.monotonic() + batch_seconds
+            if batch:
+                yield batch
+        finally:
+            self._stop.set()
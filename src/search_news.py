@@ -0,0 +1,42 @@
+"""
+Full-text search over the news table (see utils/news_search.py).
+
+Usage (from src/):
+    python search_news.py 'BBRI "laba bersih" divid*' --source kontan bisnis --start 2025-01-01
+    python search_news.py 'KPIG MSCI' --collapse    # one result per near-duplicate story
+    python search_news.py --rebuild    # (re)index every stored row
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from config import TABLE_NEWS
+from utils.db_setup import conn, search_news
+from utils import rebuild_search_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("--source", nargs="+", help="Only these sources.")
+    parser.add_argument("--start", help="Published on or after this date (YYYY-MM-DD).")
+    parser.add_argument("--end", help="Published on or before this date (YYYY-MM-DD).")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--collapse", action="store_true", help="Keep the best match of every near-duplicate story.")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the full-text index from the news table.")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        start = time.monotonic()
+        rebuild_search_index(conn.engine, TABLE_NEWS)
+        print(f"Rebuilt the search index in {time.monotonic() - start:.1f}s")
+    if args.query:
+        results = search_news(args.query, sources=args.source, start=args.start, end=args.end, limit=args.limit,
+                              collapse=args.collapse)
+        with pd.option_context("display.max_colwidth", 80):
+            print(results.to_string(index=False))
+    elif not args.rebuild:
+        parser.error("give a query or --rebuild")
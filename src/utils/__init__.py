@@ -1 +1,12 @@
-from .text_cleaning import clean_invisible_spaces, clean_text
+from .text_cleaning import clean_invisible_spaces, clean_text, clean_texts, make_cleaner
+from .http_client import HttpClient
+from .rate_limit import RateLimiter
+from .seen_links import SeenLinks
+from .canonical_links import canonicalize_link
+from .db_writer import NewsWriter, configure_sqlite
+from .page_cache import PageCache
+from .run_lock import Lease, LeaseLost
+from .news_search import rebuild_search_index, search_news
+from .ticker_extraction import TickerExtractor, TickerMatcher, load_ticker_dictionary
+from .sentiment_scoring import SentimentExtractor, SentimentScorer, load_sentiment_lexicon
+from .cluster_extraction import ClusterExtractor
@@ -0,0 +1,141 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# query parameters that never select a different article
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref", "amp", "outputtype", "_ga"}
+TRACKING_PREFIXES = ("utm_",)
+HOST_PREFIXES = ("www.", "m.", "amp.")
+AMP_SEGMENT = "amp"
+BISNIS_ARTICLE = r"^(/read/\d{8}/\d+/\d+)(?:/|$)"
+CNBC_ARTICLE = r"^(/[\w-]+/\d{14}-\d+-\d+)(?:/|$)"
+IDX_PAGE = r"/\d{1,3}$"
+IQPLUS_ARTICLE = r"^(/news/[\w-]+/).*,(\d+)\.html?$"
+# http(s) links without query, fragment, credentials, other ports or odd
+# characters: canonicalize_links handles these vectorized
+PLAIN_LINK = r"^[Hh][Tt][Tt][Pp][Ss]?://([A-Za-z0-9.-]+)(?::(?:80|443))?(/[^?#\s]*)?$"
+PLAIN_MATCH = re.compile(PLAIN_LINK).match
+PLAIN_HOST_PREFIXES = re.compile(r"^(?:www\.)?(?:m\.)?(?:amp\.)?")
+AMP_EDGES = re.compile(r"^/amp(?=/|$)|(?<=.)/amp$", re.IGNORECASE)
+BISNIS_MATCH = re.compile(BISNIS_ARTICLE).match
+CNBC_MATCH = re.compile(CNBC_ARTICLE).match
+IDX_SUB = re.compile(IDX_PAGE).sub
+IQPLUS_MATCH = re.compile(IQPLUS_ARTICLE).match
+
+
+def canonical_kontan(host, path, query):
+    # the same slug is served from investasi., amp., www. ... and with ?page=all
+    query = [(key, value) for key, value in query if key.lower() != "page"]
+    return "kontan.co.id", path, query
+
+
+def canonical_bisnis(host, path, query):
+    # /read/<date>/<section>/<id>/<slug>: the id identifies the article, slugs get edited
+    match = re.match(BISNIS_ARTICLE, path)
+    if match:
+        return "bisnis.com", match.group(1), query  # ids are unique across market., m., ...
+    return host, path, query
+
+
+def canonical_cnbc(host, path, query):
+    # /<section>/<timestamp>-<channel>-<id>/<slug>
+    match = re.match(CNBC_ARTICLE, path)
+    return host, match.group(1) if match else path, query
+
+
+def canonical_idx(host, path, query):
+    # article pages are fetched as <link>/1, <link>/2, ...
+    return host, re.sub(IDX_PAGE, "", path), query
+
+
+def canonical_iqplus(host, path, query):
+    # /news/<category>/<slug>,<id>.html
+    match = re.match(IQPLUS_ARTICLE, path)
+    return host, f"{match.group(1)}{match.group(2)}" if match else path, query
+
+
+SOURCE_RULES = {
+    "kontan": canonical_kontan,
+    "bisnis": canonical_bisnis,
+    "cnbc": canonical_cnbc,
+    "idx": canonical_idx,
+    "iqplus": canonical_iqplus,
+}
+
+
+def canonicalize_link(link, source=None):
+    """
+    Canonical form of an article URL, used as its identity for dedup (it is
+    not always a fetchable URL): https, host lowercased without www./m./amp.,
+    no fragment, tracking parameters or trailing slash, AMP path segments
+    removed and remaining parameters sorted, then the source's own rules
+    (SOURCE_RULES) applied.
+
+    Returns:
+        str: The canonical link, or link unchanged if it is not an http(s) URL.
+    """
+    if not isinstance(link, str):
+        return link
+    parts = urlsplit(link.strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return link
+    host = parts.netloc.lower().rsplit("@", 1)[-1]
+    host = re.sub(r":(80|443)$", "", host)
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if segments and segments[0].lower() == AMP_SEGMENT:
+        segments = segments[1:]
+    if segments and segments[-1].lower() == AMP_SEGMENT:
+        segments = segments[:-1]
+    path = "/" + "/".join(segments)
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    if source in SOURCE_RULES:
+        host, path, query = SOURCE_RULES[source](host, path, query)
+    return urlunsplit(("https", host, path.rstrip("/") or "/", urlencode(sorted(query)), ""))
+
+
+def canonical_plain_link(host, path, source):
+    """canonicalize_link of a PLAIN_LINK match, with plain string operations."""
+    host = PLAIN_HOST_PREFIXES.sub("", host.lower())
+    path = AMP_EDGES.sub("", "/" + "/".join(segment for segment in path.split("/") if segment))
+    if source == "kontan":
+        host = "kontan.co.id"
+    elif source == "bisnis":
+        match = BISNIS_MATCH(path)
+        if match:
+            host, path = "bisnis.com", match.group(1)
+    elif source == "cnbc":
+        match = CNBC_MATCH(path)
+        if match:
+            path = match.group(1)
+    elif source == "idx":
+        path = IDX_SUB("", path)
+    elif source == "iqplus":
+        match = IQPLUS_MATCH(path)
+        if match:
+            path = f"{match.group(1)}{match.group(2)}"
+    return f"https://{host}{path.rstrip('/') or '/'}"
+
+
+def canonicalize_links(links, sources):
+    """
+    canonicalize_link over a batch, e.g. every row NewsWriter stores. Plain
+    links (PLAIN_LINK: no query, fragment, credentials or other ports),
+    which is nearly every scraped link, skip URL parsing and are handled
+    with precompiled patterns; the rest go through canonicalize_link.
+
+    Returns:
+        list: The canonical link of each link, in order.
+    """
+    canonical = []
+    for link, source in zip(links, sources):
+        match = PLAIN_MATCH(link) if isinstance(link, str) else None
+        if match:
+            canonical.append(canonical_plain_link(match.group(1), match.group(2) or "", source))
+        else:
+            canonical.append(canonicalize_link(link, source))
+    return canonical
@@ -0,0 +1,29 @@
+from .extraction import IncrementalExtractor
+from .near_duplicates import assign_clusters, ensure_simhash_table, simhash_table
+
+TASK_NAME = "clusters"
+
+
+class ClusterExtractor(IncrementalExtractor):
+    """
+    Fingerprints news rows into news_simhash and assigns each its
+    near-duplicate cluster (see utils/near_duplicates.py), incrementally
+    over the news_changes log (see IncrementalExtractor): a rewritten row
+    is fingerprinted again. Kept out of NewsWriter.write so inserts do not
+    pay for the candidate lookups; until a row is processed, search treats
+    it as its own cluster.
+    """
+
+    task = TASK_NAME
+    columns = ("published", "title", "content")
+    counters = ("joined",)
+
+    def __init__(self, engine, table_name="news"):
+        super().__init__(engine, table_name)
+        self.result_table = simhash_table(table_name)
+
+    def create_schema(self, connection):
+        ensure_simhash_table(connection, self.table_name)
+
+    def process(self, connection, rows):
+        return {"joined": assign_clusters(connection, self.table_name, rows)}
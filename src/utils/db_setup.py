@@ -1,16 +1,49 @@
+import base64
+import os
 import sqlite3
 from datetime import datetime
 import pytz
 import sys
 import pandas as pd
-from github import Github
+from github import Github, InputGitTreeElement
 import streamlit as st
-from sqlalchemy import text
+from sqlalchemy import create_engine, text
+from .db_writer import (
+    DAILY_COUNTS_TABLE, DATA_VERSION_TABLE, NewsWriter, bump_data_version, configure_sqlite, ensure_data_version
+)
+from .run_lock import ensure_status_table
+from .news_export import MANIFEST_NAME, ShardExporter
+from .news_search import search_news as search_news_index
 
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[2]))
+from config import TABLE_NEWS, PUBLISH_CONFIG
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REPO_OWNER = 'Khanifsaleh'
+REPO_NAME = 'stock-monitoring'
 JAKARTA_TZ = pytz.timezone("Asia/Jakarta")
-conn = st.connection('stock_news_db', type='sql')
+# Point the app at another database (e.g. a scratch DB for benchmarks)
+# without Streamlit secrets.
+DB_URL_ENV = "STOCK_NEWS_DB_URL"
+
+class EngineConnection:
+    """Minimal stand-in for st.connection that only exposes an engine."""
+    def __init__(self, engine):
+        self.engine = engine
+
+    def close(self):
+        self.engine.dispose()
+
+if os.environ.get(DB_URL_ENV):
+    conn = EngineConnection(create_engine(os.environ[DB_URL_ENV], connect_args={"timeout": 30}))
+else:
+    conn = st.connection('stock_news_db', type='sql')
+configure_sqlite(conn.engine)
+
+def isolated_connection():
+    """Return a connection with its own engine and pool, for a single worker thread."""
+    engine = create_engine(conn.engine.url, connect_args={"timeout": 30})
+    return EngineConnection(configure_sqlite(engine))
 
 def now_jakarta():
     """Return current datetime in Asia/Jakarta as ISO string."""
@@ -19,13 +52,8 @@ def now_jakarta():
 def init_status_table():
     # Create the table if it doesn't exist
     with conn.engine.connect() as connection:
-        connection.execute(text("""
-            CREATE TABLE IF NOT EXISTS status (
-                activity TEXT PRIMARY KEY,
-                status TEXT,
-                dw_modify_ts TEXT
-            )
-        """))
+        # includes the lease columns used by utils.run_lock.Lease
+        ensure_status_table(connection)
 
         # Insert default statuses
         for activity in ["scraping", "extracting_information"]:
@@ -41,8 +69,11 @@ def init_status_table():
                 }
             )
 
+        ensure_data_version(connection)
         # Commit all changes
         connection.commit()
+    # news rollup tables read by the dashboard
+    NewsWriter(conn.engine, TABLE_NEWS).ensure_schema()
 
 def update_status(activity, status):
     with conn.engine.connect() as connection:
@@ -58,24 +89,239 @@ def update_status(activity, status):
                 "activity": activity
             }
         )
+        bump_data_version(connection)
         connection.commit()
 
+def refresh_scraping_status(extract_source="extract"):
+    """
+    Recompute the aggregate "scraping" status, which a worker that died
+    between starting and reaping its jobs leaves at "running": running while
+    a scraping job runs or a "scraping:<source>" lease is live, otherwise the
+    outcome of the latest finished scraping job ("success" if none).
+    Extraction jobs (source extract_source) are not scraping jobs.
+
+    Returns:
+        str: The status stored.
+    """
+    now = now_jakarta()
+    with conn.engine.begin() as connection:
+        running = connection.execute(text("""
+            SELECT EXISTS (SELECT 1 FROM job_runs WHERE status = 'running' AND source != :extract)
+                OR EXISTS (
+                    SELECT 1 FROM status
+                    WHERE activity LIKE 'scraping:%' AND status = 'running' AND lease_expires_ts >= :now
+                )
+        """), {"extract": extract_source, "now": now}).scalar()
+        last = connection.execute(text("""
+            SELECT status FROM job_runs
+            WHERE status IN ('success', 'failed') AND source != :extract
+            ORDER BY id DESC LIMIT 1
+        """), {"extract": extract_source}).scalar()
+        status = "running" if running else last or "success"
+        connection.execute(
+            text("UPDATE status SET status = :status, dw_modify_ts = :ts WHERE activity = 'scraping'"),
+            {"status": status, "ts": now}
+        )
+        bump_data_version(connection)
+    return status
+
 def get_status():
     df = pd.read_sql("SELECT * FROM status", conn.engine)
     return df
 
+def init_job_table():
+    """Create job_runs: one row per scraping job, queued by the dashboard or the scheduler."""
+    with conn.engine.connect() as connection:
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                trigger TEXT NOT NULL,
+                status TEXT NOT NULL,
+                enqueued_at TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                rows INTEGER DEFAULT 0,
+                progress TEXT,
+                error TEXT
+            )
+        """))
+        connection.execute(text("CREATE INDEX IF NOT EXISTS idx_job_runs_status ON job_runs (status)"))
+        connection.commit()
+
+def enqueue_job(source, trigger="manual"):
+    """
+    Queue a scraping job for source ("all" or a source name), unless one is
+    already queued for it.
+
+    Returns:
+        int: id of the queued job.
+    """
+    with conn.engine.connect() as connection:
+        queued = connection.execute(
+            text("SELECT id FROM job_runs WHERE source = :source AND status = 'queued'"),
+            {"source": source}
+        ).scalar()
+        if queued is not None:
+            return queued
+        job_id = connection.execute(
+            text("""
+                INSERT INTO job_runs (source, trigger, status, enqueued_at)
+                VALUES (:source, :trigger, 'queued', :ts)
+            """),
+            {"source": source, "trigger": trigger, "ts": now_jakarta()}
+        ).lastrowid
+        connection.commit()
+    return job_id
+
+def get_queued_jobs():
+    return pd.read_sql("SELECT * FROM job_runs WHERE status = 'queued' ORDER BY id", conn.engine)
+
+def get_last_enqueued():
+    """Latest enqueued_at per job source (including "all")."""
+    df = pd.read_sql("SELECT source, MAX(enqueued_at) AS enqueued_at FROM job_runs GROUP BY source", conn.engine)
+    return dict(zip(df["source"], df["enqueued_at"]))
+
+def start_job(job_id):
+    """Mark a queued job as running. Returns False if it was no longer queued."""
+    with conn.engine.connect() as connection:
+        claimed = connection.execute(
+            text("""
+                UPDATE job_runs SET status = 'running', started_at = :ts
+                WHERE id = :id AND status = 'queued'
+            """),
+            {"id": job_id, "ts": now_jakarta()}
+        ).rowcount
+        connection.commit()
+    return claimed == 1
+
+def update_job_progress(job_id, rows, progress):
+    with conn.engine.connect() as connection:
+        connection.execute(
+            text("UPDATE job_runs SET rows = :rows, progress = :progress WHERE id = :id"),
+            {"id": job_id, "rows": rows, "progress": progress}
+        )
+        connection.commit()
+
+def finish_job(job_id, status, rows, error=None):
+    with conn.engine.connect() as connection:
+        connection.execute(
+            text("""
+                UPDATE job_runs SET status = :status, finished_at = :ts, rows = :rows, error = :error
+                WHERE id = :id
+            """),
+            {"id": job_id, "status": status, "ts": now_jakarta(), "rows": rows, "error": error}
+        )
+        connection.commit()
+
+def fail_running_jobs(error):
+    """Mark jobs left running by a worker that died as failed. Returns how many."""
+    with conn.engine.connect() as connection:
+        failed = connection.execute(
+            text("""
+                UPDATE job_runs SET status = 'failed', finished_at = :ts, error = :error
+                WHERE status = 'running'
+            """),
+            {"ts": now_jakarta(), "error": error}
+        ).rowcount
+        connection.commit()
+    return failed
+
+def get_job_runs(limit=20):
+    return pd.read_sql(
+        text("SELECT * FROM job_runs ORDER BY id DESC LIMIT :limit"), conn.engine, params={"limit": limit}
+    )
+
+def get_data_version():
+    """Change counter bumped by every news write and status update; cache keys use it."""
+    with conn.engine.connect() as connection:
+        return connection.execute(text(f"SELECT version FROM {DATA_VERSION_TABLE} WHERE id = 1")).scalar()
+
 def get_news_counts():
-    df = pd.read_sql("SELECT source, COUNT(*) as count FROM news GROUP BY source", conn.engine)
+    # summed from the daily rollup: one row per source and day, not per article
+    df = pd.read_sql(
+        f"SELECT source, SUM(count) as count FROM {DAILY_COUNTS_TABLE} GROUP BY source", conn.engine
+    )
     total_count = df["count"].sum()
     return total_count, df
 
-def update_db_to_repo():
+def search_news(query, sources=None, start=None, end=None, limit=50, collapse=False):
+    """Full-text search over the news table; see utils.news_search.search_news."""
+    return search_news_index(conn.engine, query, sources=sources, start=start, end=end, limit=limit,
+                             table_name=TABLE_NEWS, collapse=collapse)
+
+def get_daily_counts(days=30):
+    """
+    Articles per source and publish day over the last `days` days.
+
+    Returns:
+        pd.DataFrame: Index day, one column per source.
+    """
+    since = (datetime.now(JAKARTA_TZ) - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+    df = pd.read_sql(
+        text(f"SELECT day, source, count FROM {DAILY_COUNTS_TABLE} WHERE day >= :since"),
+        conn.engine,
+        params={"since": since},
+    )
+    return df.pivot_table(index="day", columns="source", values="count", fill_value=0).sort_index()
+
+def get_repo():
     github = Github(st.secrets["git"]["token"])
-    repo_owner = 'Khanifsaleh'
-    repo_name = 'stock-monitoring'
-    repo = github.get_user(repo_owner).get_repo(repo_name)
+    return github.get_user(REPO_OWNER).get_repo(REPO_NAME)
+
+def make_exporter():
+    return ShardExporter(
+        conn.engine,
+        REPO_ROOT / PUBLISH_CONFIG["directory"],
+        table_name=TABLE_NEWS,
+        compression=PUBLISH_CONFIG["compression"],
+    )
+
+def publish_to_repo():
+    """Publish the database the way PUBLISH_CONFIG["mode"] says: "shards" or the whole "db" file."""
+    if PUBLISH_CONFIG["mode"] == "shards":
+        return publish_shards_to_repo()
+    return update_db_to_repo()
+
+def publish_shards_to_repo():
+    """
+    Export rows added or changed since the last export to their shards and
+    push only the shards written since the last publish, plus the manifest,
+    as one commit through the git data API.
+
+    Returns:
+        int: Number of shards published.
+    """
+    exporter = make_exporter()
+    exporter.export()
+    paths = exporter.pending()
+    if not paths:
+        return 0
+    repo = get_repo()
+    branch = PUBLISH_CONFIG["branch"]
+    ref = repo.get_git_ref(f"heads/{branch}")
+    parent = repo.get_git_commit(ref.object.sha)
+    tree = []
+    for path in paths + [MANIFEST_NAME]:
+        content = base64.b64encode((exporter.root / path).read_bytes()).decode("ascii")
+        blob = repo.create_git_blob(content, "base64")
+        tree.append(InputGitTreeElement(f"{PUBLISH_CONFIG['directory']}/{path}", "100644", "blob", sha=blob.sha))
+    commit = repo.create_git_commit(
+        f"publish {len(paths)} news shards",
+        repo.create_git_tree(tree, parent.tree),
+        [parent],
+    )
+    ref.edit(commit.sha)
+    exporter.mark_published(paths)
+    return len(paths)
+
+def update_db_to_repo():
+    repo = get_repo()
     db_url = st.secrets["connections"]["stock_news_db"]["url"]
     db_path = db_url.replace("sqlite:///", "")
+    # fold the WAL into the main file so the upload contains every commit
+    with conn.engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
     with open(db_path, 'rb') as f:
         db_content = f.read()
     content = repo.get_contents(db_path)
@@ -0,0 +1,477 @@
+import json
+from collections import Counter
+from itertools import chain
+import numpy as np
+import pandas as pd
+from sqlalchemy import event
+from .canonical_links import canonicalize_link, canonicalize_links
+from .near_duplicates import ensure_simhash_table
+from .news_search import ensure_search_index
+
+NEWS_WRITE_COLUMNS = ["published", "link", "title", "content", "source", "DW_LOAD_TS", "DW_MODIFY_TS"]
+CANONICAL_COLUMN = "canonical_link"  # derived from link and source by NewsWriter
+INGEST_STATE_TABLE = "ingest_state"
+DAILY_COUNTS_TABLE = "news_daily_counts"
+DATA_VERSION_TABLE = "data_version"
+EXTRACT_STATE_TABLE = "extract_state"
+CHANGE_LOG_SUFFIX = "_changes"
+MAX_SQL_VARIABLES = 32766  # SQLITE_MAX_VARIABLE_NUMBER since SQLite 3.32
+# an UPDATE of any of these logs the row as changed
+LOGGED_COLUMNS = ["published", "link", "title", "content", "source"]
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 30000,
+}
+
+
+def configure_sqlite(engine, pragmas=None):
+    """Apply write-friendly PRAGMAs to every new DBAPI connection of a SQLite engine."""
+    pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def format_utc_offset(offset):
+    minutes = int(offset.total_seconds() // 60)
+    sign = "+" if minutes >= 0 else "-"
+    return f"{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+
+
+def format_datetimes(series):
+    """Format naive datetimes like pandas.to_sql does: 'YYYY-MM-DD HH:MM:SS.ffffff'."""
+    formatted = np.datetime_as_string(series.to_numpy(dtype="datetime64[us]"), unit="us")
+    return pd.Series(formatted, index=series.index).str.replace("T", " ", regex=False)
+
+
+def to_sqlite_column(series):
+    """Convert a column to a list of values sqlite3 can bind, NaN/NaT as None."""
+    missing = series.isna()
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        # formatting tz-aware values one by one is slow; format the wall
+        # time vectorized and append the (few distinct) UTC offsets
+        local = series.dt.tz_localize(None)
+        offsets = local - series.dt.tz_convert("UTC").dt.tz_localize(None)
+        suffixes = {offset: format_utc_offset(offset) for offset in offsets.dropna().unique()}
+        series = format_datetimes(local) + offsets.map(suffixes).fillna("")
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        series = format_datetimes(series)
+    values = series.astype(object)
+    if missing.any():
+        values = values.where(~missing, None)
+    return values.tolist()
+
+
+def ensure_data_version(connection):
+    """Create the single-row change counter that readers use to invalidate caches."""
+    connection.exec_driver_sql(f"""
+        CREATE TABLE IF NOT EXISTS {DATA_VERSION_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    connection.exec_driver_sql(f"INSERT OR IGNORE INTO {DATA_VERSION_TABLE} (id, version) VALUES (1, 0)")
+
+
+def bump_data_version(connection):
+    """Increment the change counter inside the caller's transaction."""
+    connection.exec_driver_sql(f"UPDATE {DATA_VERSION_TABLE} SET version = version + 1 WHERE id = 1")
+
+
+def change_log_table(table_name):
+    return f"{table_name}{CHANGE_LOG_SUFFIX}"
+
+
+def ensure_change_log(connection, table_name="news"):
+    """
+    Create the change log of table_name, (seq, row_id): triggers add a row
+    for every insert and every update of LOGGED_COLUMNS. seq is an
+    AUTOINCREMENT key, so it is never reused and, SQLite having one writer
+    at a time, increases in commit order: a reader that keeps the last seq
+    it processed finds every later insert or rewrite with a range scan.
+    Rows stored before the log existed are logged with seq = rowid, so a
+    watermark that was a rowid stays valid.
+    """
+    table = change_log_table(table_name)
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if exists:
+        return
+    connection.exec_driver_sql(f"""
+        CREATE TABLE {table} (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            row_id INTEGER NOT NULL
+        )
+    """)
+    connection.exec_driver_sql(f"INSERT INTO {table} (seq, row_id) SELECT rowid, rowid FROM {table_name}")
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {table_name} BEGIN
+            INSERT INTO {table} (row_id) VALUES (new.rowid);
+        END
+    """)
+    column_list = ", ".join(f'"{c}"' for c in LOGGED_COLUMNS)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {column_list} ON {table_name} BEGIN
+            INSERT INTO {table} (row_id) VALUES (new.rowid);
+        END
+    """)
+
+
+def ensure_extract_state(connection):
+    """Create extract_state: the last change log seq each extraction task has processed."""
+    columns = [row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({EXTRACT_STATE_TABLE})")]
+    if "last_rowid" in columns:
+        # watermarks were news rowids, which the change log keeps as seq
+        connection.exec_driver_sql(f"ALTER TABLE {EXTRACT_STATE_TABLE} RENAME COLUMN last_rowid TO last_seq")
+    connection.exec_driver_sql(f"""
+        CREATE TABLE IF NOT EXISTS {EXTRACT_STATE_TABLE} (
+            task TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL,
+            dw_modify_ts TEXT
+        )
+    """)
+
+
+def read_extract_watermark(connection, task):
+    row = connection.exec_driver_sql(
+        f"SELECT last_seq FROM {EXTRACT_STATE_TABLE} WHERE task = ?", (task,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def set_extract_watermark(connection, task, last_seq):
+    """Store task's watermark inside the caller's transaction (with the task's results)."""
+    connection.exec_driver_sql(f"""
+        INSERT INTO {EXTRACT_STATE_TABLE} (task, last_seq, dw_modify_ts) VALUES (?, ?, ?)
+        ON CONFLICT(task) DO UPDATE SET last_seq = excluded.last_seq, dw_modify_ts = excluded.dw_modify_ts
+    """, (task, last_seq, pd.Timestamp.now(tz="Asia/Jakarta").strftime("%Y-%m-%d %H:%M:%S")))
+
+
+class NewsWriter:
+    """
+    Bulk writer for the news table: one transaction per batch, multi-row
+    INSERT OR IGNORE statements (as many rows as the variable limit allows)
+    whose RETURNING clause reports the rows each one actually inserted,
+    rowids assigned by SQLite. Every row is stored with its canonical_link, and a row whose
+    (source, link) or (source, canonical_link) is already stored is skipped.
+
+    A batch also advances the source's row in ingest_state (high-water
+    publish time, its link and the crawler's pagination cursors) in the same
+    transaction, so the watermark never runs ahead of the stored rows.
+    Scrapers store rows out of publish order, so they write with
+    advance=False and call commit_state once discovery has finished.
+    New rows are also added to the per-source, per-day counts in
+    news_daily_counts and bump the data_version counter, so readers get
+    article counts without scanning news. Fingerprints and clusters are
+    left to the extraction tasks, which follow the news_changes log.
+    """
+
+    def __init__(self, engine, table_name, columns=None):
+        self.engine = engine
+        self.table_name = table_name
+        self.columns = columns or NEWS_WRITE_COLUMNS
+        self.index_name = f"idx_{table_name}_source_link"
+        self.canonical_index_name = f"idx_{table_name}_source_canonical_link"
+        column_list = ", ".join(f'"{c}"' for c in self.columns + [CANONICAL_COLUMN])
+        self.row_placeholders = "(" + ", ".join("?" for _ in self.columns + [CANONICAL_COLUMN]) + ")"
+        self.insert_prefix = f"INSERT OR IGNORE INTO {table_name} ({column_list}) VALUES "
+        self.chunk_rows = MAX_SQL_VARIABLES // (len(self.columns) + 1)
+        self._insert_sql = {}
+
+    def ensure_schema(self):
+        """
+        Create the news table if missing, the unique (source, link) index,
+        deleting duplicate rows (keeping the oldest) before creating it (see
+        ensure_unique_links), the unique (source, canonical_link) index (see
+        ensure_canonical_links), the ingest_state, news_daily_counts and
+        data_version tables, the news_fts full-text index, the (empty)
+        news_simhash fingerprint table and the news_changes log.
+        """
+        with self.engine.begin() as connection:
+            self.ensure_state_table(connection)
+            ensure_data_version(connection)
+            connection.exec_driver_sql(f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    "published" TEXT,
+                    "link" TEXT,
+                    "title" TEXT,
+                    "content" TEXT,
+                    "source" TEXT,
+                    "DW_LOAD_TS" TIMESTAMP,
+                    "DW_MODIFY_TS" TIMESTAMP,
+                    "canonical_link" TEXT
+                )
+            """)
+            self.ensure_unique_links(connection)
+            self.ensure_canonical_links(connection)
+            self.ensure_daily_counts(connection)
+            ensure_search_index(connection, self.table_name)
+            ensure_simhash_table(connection, self.table_name)
+            ensure_change_log(connection, self.table_name)
+
+    def ensure_unique_links(self, connection):
+        """
+        One-time creation of the unique (source, link) index, deleting the
+        rows that repeat an older row's (source, link) first; those are
+        reported.
+
+        Returns:
+            int: Number of duplicate rows deleted, 0 if the index already existed.
+        """
+        index_exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (self.index_name,)
+        ).fetchone()
+        if index_exists:
+            return 0
+        duplicate_rows = f"""
+            rowid NOT IN (SELECT MIN(rowid) FROM {self.table_name} GROUP BY source, link)
+        """
+        per_source = connection.exec_driver_sql(f"""
+            SELECT source, COUNT(*) FROM {self.table_name} WHERE {duplicate_rows} GROUP BY source
+        """).fetchall()
+        deleted = connection.exec_driver_sql(f"DELETE FROM {self.table_name} WHERE {duplicate_rows}").rowcount
+        connection.exec_driver_sql(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {self.index_name}
+            ON {self.table_name} (source, link)
+        """)
+        if deleted:
+            print(f"Unique links: deleted {deleted} rows repeating an older row's (source, link) "
+                  f"({', '.join(f'{source}: {n}' for source, n in per_source)}).")
+        return deleted
+
+    def ensure_canonical_links(self, connection):
+        """
+        One-time migration to canonical links: add the canonical_link column
+        to a news table created before it, fill it for every stored row and
+        create the unique (source, canonical_link) index. A row whose
+        canonical link an older row already has keeps canonical_link NULL,
+        marking it as a duplicate; those are reported.
+
+        Returns:
+            list: (rowid, source, link, rowid of the older row) of every
+            duplicate found, empty if the migration already ran.
+        """
+        index_exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (self.canonical_index_name,)
+        ).fetchone()
+        if index_exists:
+            return []
+        columns = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({self.table_name})")}
+        if CANONICAL_COLUMN not in columns:
+            connection.exec_driver_sql(f"ALTER TABLE {self.table_name} ADD COLUMN {CANONICAL_COLUMN} TEXT")
+        kept, updates, duplicates = {}, [], []
+        for rowid, source, link in connection.exec_driver_sql(
+            f"SELECT rowid, source, link FROM {self.table_name} ORDER BY rowid"
+        ).fetchall():
+            canonical = canonicalize_link(link, source)
+            if (source, canonical) in kept:
+                duplicates.append((rowid, source, link, kept[(source, canonical)]))
+                canonical = None
+            else:
+                kept[(source, canonical)] = rowid
+            updates.append((canonical, rowid))
+        if updates:
+            connection.exec_driver_sql(
+                f"UPDATE {self.table_name} SET {CANONICAL_COLUMN} = ? WHERE rowid = ?", updates
+            )
+        connection.exec_driver_sql(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {self.canonical_index_name}
+            ON {self.table_name} (source, {CANONICAL_COLUMN})
+        """)
+        if duplicates:
+            per_source = pd.Series([source for _, source, _, _ in duplicates]).value_counts()
+            print(f"Canonical links: {len(duplicates)} of {len(updates)} stored rows duplicate an older row "
+                  f"({', '.join(f'{source}: {n}' for source, n in per_source.items())}); "
+                  f"their canonical_link is left NULL.")
+        return duplicates
+
+    def ensure_state_table(self, connection):
+        """Create ingest_state, seeding it once from the news table if that exists."""
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (INGEST_STATE_TABLE,)
+        ).fetchone()
+        if exists:
+            return
+        connection.exec_driver_sql(f"""
+            CREATE TABLE {INGEST_STATE_TABLE} (
+                source TEXT PRIMARY KEY,
+                last_published TEXT,
+                last_link TEXT,
+                cursors TEXT,
+                dw_modify_ts TEXT
+            )
+        """)
+        news_exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table_name,)
+        ).fetchone()
+        if news_exists:
+            # SQLite returns the link of the row holding MAX(published)
+            connection.exec_driver_sql(f"""
+                INSERT INTO {INGEST_STATE_TABLE} (source, last_published, last_link, dw_modify_ts)
+                SELECT source, MAX(published), link, datetime('now')
+                FROM {self.table_name}
+                GROUP BY source
+            """)
+
+    def ensure_daily_counts(self, connection):
+        """Create news_daily_counts, filling it once from the news table."""
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (DAILY_COUNTS_TABLE,)
+        ).fetchone()
+        if exists:
+            return
+        connection.exec_driver_sql(f"""
+            CREATE TABLE {DAILY_COUNTS_TABLE} (
+                source TEXT NOT NULL,
+                day TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (source, day)
+            ) WITHOUT ROWID
+        """)
+        self.add_daily_counts(connection, 0)
+
+    def add_daily_counts(self, connection, after_rowid):
+        """Add the news rows with rowid > after_rowid to news_daily_counts."""
+        connection.exec_driver_sql(f"""
+            INSERT INTO {DAILY_COUNTS_TABLE} (source, day, count)
+            SELECT source, substr(published, 1, 10), COUNT(*)
+            FROM {self.table_name}
+            WHERE rowid > ?
+            GROUP BY 1, 2
+            ON CONFLICT(source, day) DO UPDATE SET count = count + excluded.count
+        """, (after_rowid,))
+
+    def add_day_counts(self, connection, days):
+        """Add inserted rows, given as (source, day) pairs, to news_daily_counts."""
+        connection.exec_driver_sql(f"""
+            INSERT INTO {DAILY_COUNTS_TABLE} (source, day, count) VALUES (?, ?, ?)
+            ON CONFLICT(source, day) DO UPDATE SET count = count + excluded.count
+        """, [(source, day, count) for (source, day), count in Counter(days).items()])
+
+    def read_state(self, source):
+        """
+        Return the ingest_state of source as a dict with 'last_published',
+        'last_link' and 'cursors' (a dict), or None if nothing was stored yet.
+        """
+        with self.engine.connect() as connection:
+            row = connection.exec_driver_sql(
+                f"SELECT last_published, last_link, cursors FROM {INGEST_STATE_TABLE} WHERE source = ?",
+                (source,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"last_published": row[0], "last_link": row[1], "cursors": json.loads(row[2] or "{}")}
+
+    def advance_state(self, connection, df, cursors=None):
+        """Move each source's watermark up to the newest row of df; replace its cursors if given."""
+        published = pd.Series(to_sqlite_column(df["published"]), index=df.index)
+        now = pd.Timestamp.now(tz="Asia/Jakarta").strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for source, group in published.dropna().groupby(df["source"]):
+            newest = group.sort_values().index[-1]
+            rows.append((
+                source, group[newest], df.at[newest, "link"],
+                json.dumps(cursors, sort_keys=True) if cursors is not None else None, now,
+            ))
+        connection.exec_driver_sql(f"""
+            INSERT INTO {INGEST_STATE_TABLE} (source, last_published, last_link, cursors, dw_modify_ts)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(source) DO UPDATE SET
+                last_link = CASE
+                    WHEN {INGEST_STATE_TABLE}.last_published IS NULL
+                      OR excluded.last_published > {INGEST_STATE_TABLE}.last_published
+                    THEN excluded.last_link ELSE {INGEST_STATE_TABLE}.last_link END,
+                last_published = MAX(COALESCE({INGEST_STATE_TABLE}.last_published, ''), excluded.last_published),
+                cursors = COALESCE(excluded.cursors, {INGEST_STATE_TABLE}.cursors),
+                dw_modify_ts = excluded.dw_modify_ts
+        """, rows)
+
+    def commit_state(self, df, cursors=None):
+        """
+        Advance ingest_state to the newest row of df in its own transaction
+        (see advance_state), without inserting anything.
+        """
+        if df.empty:
+            return
+        with self.engine.begin() as connection:
+            self.advance_state(connection, df, cursors)
+
+    def rows(self, df):
+        canonical = canonicalize_links(df["link"], df["source"])
+        return list(zip(*(to_sqlite_column(df[column]) for column in self.columns), canonical))
+
+    def insert_sql(self, n_rows):
+        """INSERT OR IGNORE of n_rows rows returning (source, day) of each row inserted."""
+        if n_rows not in self._insert_sql:
+            self._insert_sql[n_rows] = (
+                self.insert_prefix + ", ".join([self.row_placeholders] * n_rows)
+                + ' RETURNING "source", substr("published", 1, 10)'
+            )
+        return self._insert_sql[n_rows]
+
+    def insert(self, connection, rows):
+        """
+        Insert rows in chunks of chunk_rows. Returns (source, day) of every
+        row inserted, as reported by each statement's RETURNING clause, so
+        ignored duplicates and other writers' rows are never counted.
+        """
+        inserted = []
+        for start in range(0, len(rows), self.chunk_rows):
+            chunk = rows[start:start + self.chunk_rows]
+            inserted.extend(connection.exec_driver_sql(
+                self.insert_sql(len(chunk)), tuple(chain.from_iterable(chunk))
+            ).fetchall())
+        return inserted
+
+    def update_articles(self, df):
+        """
+        Overwrite title, content and DW_MODIFY_TS of stored rows, matched by
+        rowid, in one transaction. The news_changes triggers log them, so
+        the extraction tasks process them again. Returns the number of rows
+        updated.
+        """
+        if df.empty:
+            return 0
+        columns = ["title", "content", "DW_MODIFY_TS", "rowid"]
+        rows = list(zip(*(to_sqlite_column(df[column]) for column in columns)))
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                f'UPDATE {self.table_name} SET "title" = ?, "content" = ?, "DW_MODIFY_TS" = ? WHERE rowid = ?',
+                rows,
+            )
+        return len(rows)
+
+    def write(self, df, cursors=None, advance=True):
+        """
+        Insert a DataFrame and advance ingest_state in one transaction.
+
+        Args:
+            df (pd.DataFrame): Rows with NEWS_WRITE_COLUMNS.
+            cursors (dict): The crawler's pagination cursors to store with
+                the watermark, or None to keep the stored ones.
+            advance (bool): False to leave ingest_state alone, for callers
+                that commit it themselves (commit_state).
+
+        Returns:
+            int: Number of new rows.
+        """
+        if df.empty:
+            return 0
+        rows = self.rows(df)
+        with self.engine.begin() as connection:
+            inserted = self.insert(connection, rows)
+            if advance:
+                self.advance_state(connection, df, cursors)
+            if inserted:
+                self.add_day_counts(connection, inserted)
+                bump_data_version(connection)
+        return len(inserted)
@@ -0,0 +1,110 @@
+import time
+from abc import ABC, abstractmethod
+from .db_writer import (
+    bump_data_version, change_log_table, ensure_change_log, ensure_data_version, ensure_extract_state,
+    read_extract_watermark, set_extract_watermark
+)
+
+
+class IncrementalExtractor(ABC):
+    """
+    Base of the extraction tasks: derives a result table from the news rows
+    logged in news_changes after the task's watermark in extract_state, so a
+    row is processed once when it is stored and again whenever its article
+    columns are rewritten (re-extraction, update_articles).
+
+    Subclasses set task, result_table, columns (the news columns read) and
+    counters (stats they count) and implement create_schema(connection) and
+    process(connection, rows), which replaces the results of rows
+    ([(rowid, *columns)], each rowid once) and returns a dict of counts to
+    add to the run's stats. Each batch's results are written in the same
+    transaction as the watermark that covers them and a data_version bump,
+    so the dashboard's caches (keyed on it) pick up the new results.
+    """
+
+    task = None
+    result_table = None
+    columns = ()
+    counters = ()
+
+    def __init__(self, engine, table_name="news"):
+        self.engine = engine
+        self.table_name = table_name
+
+    @abstractmethod
+    def create_schema(self, connection):
+        pass
+
+    @abstractmethod
+    def process(self, connection, rows):
+        pass
+
+    def ensure_schema(self):
+        with self.engine.begin() as connection:
+            ensure_extract_state(connection)
+            ensure_data_version(connection)
+            ensure_change_log(connection, self.table_name)
+            self.create_schema(connection)
+
+    def reset(self):
+        """Drop all results and the watermark, e.g. after a dictionary or lexicon changed."""
+        self.ensure_schema()
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(f"DELETE FROM {self.result_table}")
+            set_extract_watermark(connection, self.task, 0)
+            bump_data_version(connection)
+
+    def changed_rows(self, last_seq, batch_size):
+        """
+        The next batch_size change log entries after last_seq.
+
+        Returns:
+            tuple: (seq of the last entry or None, [(rowid, *columns)] of the
+            rows still stored, each once, in change order).
+        """
+        column_list = ", ".join(f'n."{c}"' for c in self.columns)
+        with self.engine.connect() as connection:
+            changes = connection.exec_driver_sql(f"""
+                SELECT c.seq, n.rowid, {column_list}
+                FROM {change_log_table(self.table_name)} c
+                LEFT JOIN {self.table_name} n ON n.rowid = c.row_id
+                WHERE c.seq > ?
+                ORDER BY c.seq
+                LIMIT ?
+            """, (last_seq, batch_size)).fetchall()
+        if not changes:
+            return None, []
+        rows = {row[1]: tuple(row[1:]) for row in changes if row[1] is not None}
+        return changes[-1][0], list(rows.values())
+
+    def run(self, batch_size=2000, lease=None):
+        """
+        Process every row changed since the watermark. With a lease, raise
+        LeaseLost before writing a batch once the lease is lost.
+
+        Returns:
+            dict: rows, the subclass's counters, seconds and rows_per_sec of this run.
+        """
+        self.ensure_schema()
+        start = time.perf_counter()
+        stats = {"rows": 0, **{key: 0 for key in self.counters}}
+        with self.engine.connect() as connection:
+            last_seq = read_extract_watermark(connection, self.task)
+        while True:
+            seq, rows = self.changed_rows(last_seq, batch_size)
+            if seq is None:
+                break
+            if lease is not None:
+                lease.check()
+            with self.engine.begin() as connection:
+                counts = self.process(connection, rows) if rows else {}
+                set_extract_watermark(connection, self.task, seq)
+                if rows:
+                    bump_data_version(connection)
+            last_seq = seq
+            stats["rows"] += len(rows)
+            for key, value in counts.items():
+                stats[key] += value
+        stats["seconds"] = round(time.perf_counter() - start, 2)
+        stats["rows_per_sec"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else None
+        return stats
@@ -0,0 +1,114 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli  # noqa: F401  (lets urllib3 decode "br" responses)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 120
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """
+    Shared HTTP layer for scrapers: pooled keep-alive connections per host,
+    compressed transfers, retries with exponential backoff on 429/5xx and
+    conditional GET support.
+    """
+
+    def __init__(self, timeout=15, retries=3, backoff_factor=1.0, pool_maxsize=10, headers=None, rate_limiter=None):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        self.session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _backoff(self, attempt, resp=None):
+        delay = parse_retry_after(resp.headers.get("Retry-After")) if resp is not None else None
+        if delay is None:
+            delay = self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_factor)
+        return min(delay, MAX_RETRY_AFTER)
+
+    def _send(self, url, **kwargs):
+        """Single GET attempt, paced and accounted by the rate limiter if set."""
+        if self.rate_limiter is None:
+            return self.session.get(url, **kwargs)
+        host = urlparse(url).netloc
+        self.rate_limiter.acquire(host)
+        start = time.monotonic()
+        try:
+            resp = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.rate_limiter.record(host, time.monotonic() - start, error=True)
+            raise
+        self.rate_limiter.record(host, time.monotonic() - start, status=resp.status_code)
+        return resp
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """
+        GET a URL, retrying on connection errors, 429 and 5xx responses.
+
+        Returns:
+            requests.Response: The last response. Callers decide whether to
+            raise_for_status(); exhausted connection errors are re-raised.
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(self.retries + 1):
+            try:
+                resp = self._send(url, headers=headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if resp.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return resp
+            time.sleep(self._backoff(attempt, resp))
+
+    def get_conditional(self, url, etag=None, last_modified=None, **kwargs):
+        """
+        GET a URL with If-None-Match / If-Modified-Since validators.
+
+        Returns:
+            requests.Response: status 304 when the resource is unchanged.
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self.get(url, headers=headers, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,125 @@
+import hashlib
+import re
+import numpy as np
+import pandas as pd
+
+SIMHASH_SUFFIX = "_simhash"
+TOKEN_PATTERN = re.compile(r"\w+")
+SHINGLE_SIZE = 3
+HASH_BITS = 64
+MAX_DISTANCE = 6  # fingerprints at most this many bits apart are the same story
+BANDS = MAX_DISTANCE + 1  # two fingerprints within MAX_DISTANCE agree on at least one band
+BAND_BITS = HASH_BITS // BANDS  # 7 bands of 9 bits (the top bit is in none)
+BAND_MASK = (1 << BAND_BITS) - 1
+WINDOW_DAYS = 3  # only articles published this close are compared
+
+
+def simhash_table(table_name):
+    return f"{table_name}{SIMHASH_SUFFIX}"
+
+
+def band_expression(band):
+    return f"((simhash >> {band * BAND_BITS}) & {BAND_MASK})"
+
+
+def simhash(text):
+    """
+    64-bit SimHash of the word 3-shingles of text, as a signed integer (the
+    form SQLite stores), or None when text has no words.
+    """
+    tokens = TOKEN_PATTERN.findall((text or "").lower())
+    if not tokens:
+        return None
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(max(len(tokens) - SHINGLE_SIZE + 1, 1))}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    # column i of the unpacked bits is bit i of every shingle hash
+    ones = np.unpackbits(hashes.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little").sum(axis=0)
+    value = int.from_bytes(np.packbits(ones * 2 > len(hashes), bitorder="little").tobytes(), "little")
+    return value - (1 << HASH_BITS) if value >> (HASH_BITS - 1) else value
+
+
+def julian_day(published):
+    """Julian day number of a stored publish time's date, as CAST(julianday(date) AS INTEGER) gives."""
+    try:
+        return int(pd.Timestamp(str(published)[:10]).to_julian_date())
+    except (TypeError, ValueError):
+        return None
+
+
+def bands(value):
+    return [(value >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+
+def hamming_distance(a, b):
+    return bin((a ^ b) & ((1 << HASH_BITS) - 1)).count("1")
+
+
+def ensure_simhash_table(connection, table_name="news"):
+    """
+    Create the fingerprint table of table_name: (rowid, simhash, day,
+    cluster_id), day being the publish date as a Julian day number, one
+    (band, day) index per band of the fingerprint (expression indexes, so
+    bands are not stored) and a trigger removing fingerprints of deleted
+    rows. Rows are fingerprinted by the "clusters" extraction task (see
+    utils/cluster_extraction.py).
+    """
+    table = simhash_table(table_name)
+    connection.exec_driver_sql(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            rowid INTEGER PRIMARY KEY,
+            simhash INTEGER,
+            day INTEGER,
+            cluster_id INTEGER NOT NULL
+        )
+    """)
+    for band in range(BANDS):
+        connection.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_band{band} ON {table} ({band_expression(band)}, day)"
+        )
+    connection.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS idx_{table}_cluster ON {table} (cluster_id)")
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {table_name} BEGIN
+            DELETE FROM {table} WHERE rowid = old.rowid;
+        END
+    """)
+
+
+def assign_clusters(connection, table_name, rows):
+    """
+    Fingerprint rows of table_name, given as (rowid, published, title,
+    content), and give each a cluster_id: the cluster of a fingerprint
+    within MAX_DISTANCE bits among articles published within WINDOW_DAYS,
+    or its own rowid.
+
+    Candidates are found through the (band, day) indexes, as any match
+    within MAX_DISTANCE shares a band: a lookup reads only the window's
+    articles in the same buckets, so its cost does not grow with the archive.
+    Rows are processed in the given order, each one seeing those before it.
+
+    Returns:
+        int: Number of rows that joined an existing cluster.
+    """
+    table = simhash_table(table_name)
+    band_filter = " OR ".join(f"({band_expression(band)} = ? AND day BETWEEN ? AND ?)" for band in range(BANDS))
+    candidates_sql = f"SELECT rowid, simhash, cluster_id FROM {table} WHERE ({band_filter}) AND rowid != ?"
+    joined = 0
+    for rowid, published, title, content in rows:
+        day = julian_day(published) if published is not None else None
+        value = simhash(f"{title or ''}\n{content or ''}")
+        cluster_id = rowid
+        if value is not None and day is not None:
+            params = [p for band in bands(value) for p in (band, day - WINDOW_DAYS, day + WINDOW_DAYS)]
+            # the first match is enough: the window of one story rarely holds two clusters
+            for other_rowid, other, other_cluster in connection.exec_driver_sql(candidates_sql, (*params, rowid)):
+                if hamming_distance(value, other) <= MAX_DISTANCE:
+                    cluster_id = other_cluster
+                    joined += 1
+                    break
+        connection.exec_driver_sql(
+            f"INSERT OR REPLACE INTO {table} (rowid, simhash, day, cluster_id) VALUES (?, ?, ?, ?)",
+            (rowid, value, day, cluster_id),
+        )
+    return joined
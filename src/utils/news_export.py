@@ -0,0 +1,199 @@
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+import pandas as pd
+from .db_writer import NEWS_WRITE_COLUMNS, NewsWriter, change_log_table, ensure_change_log
+
+try:
+    import zstandard
+except ImportError:  # optional: shards fall back to gzip
+    zstandard = None
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 2  # 1 kept last_rowid and last_modify_ts instead of last_seq
+
+
+def compress(data, compression):
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data, compression):
+    """Decompress a shard; shards are appended to, so they hold several frames/members."""
+    if compression == "zstd":
+        with zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True) as reader:
+            return reader.read()
+    return gzip.decompress(data)
+
+
+class ShardExporter:
+    """
+    Incremental export of the news table into append-only, date-partitioned
+    compressed JSON-lines shards:
+
+        <root>/news/source=kontan/2026-10-18.jsonl.zst
+        <root>/manifest.json
+
+    Every export appends only the rows added or modified since the previous
+    one (logged in news_changes past the manifest's last_seq, a DB-side
+    counter that increases in commit order), one compressed frame per
+    shard, and lists the shards it touched as pending until
+    mark_published() is called. A row appended more
+    than once (re-extracted, or re-exported after a crash) is resolved by
+    load_shards, where the last record of a (source, link) wins.
+
+    zstd is used when the zstandard package is installed, gzip otherwise.
+    """
+
+    def __init__(self, engine, root, table_name="news", compression="zstd"):
+        self.engine = engine
+        self.root = Path(root)
+        self.table_name = table_name
+        self.compression = compression if compression != "zstd" or zstandard is not None else "gzip"
+        self.extension = ".jsonl.zst" if self.compression == "zstd" else ".jsonl.gz"
+        self.manifest_path = self.root / MANIFEST_NAME
+
+    def read_manifest(self):
+        if not self.manifest_path.exists():
+            return {
+                "format": MANIFEST_FORMAT,
+                "table": self.table_name,
+                "last_seq": 0,
+                "shards": {},
+                "pending": [],
+            }
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+    def write_manifest(self, manifest):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def ensure_change_log(self):
+        with self.engine.begin() as connection:
+            ensure_change_log(connection, self.table_name)
+
+    def changed_rows(self, manifest):
+        """
+        Rows added or modified since the manifest's last_seq, as stored.
+
+        A format 1 manifest's last_rowid serves as last_seq (the change log
+        starts with seq = rowid), and rows modified before the log existed
+        are found once more by their DW_MODIFY_TS.
+
+        Returns:
+            tuple: (rows as dicts, new last_seq)
+        """
+        column_list = ", ".join(f'"{c}"' for c in NEWS_WRITE_COLUMNS)
+        last_seq = manifest["last_seq"] if "last_seq" in manifest else manifest["last_rowid"]
+        with self.engine.connect() as connection:
+            max_seq = connection.exec_driver_sql(
+                f"SELECT COALESCE(MAX(seq), 0) FROM {change_log_table(self.table_name)}"
+            ).scalar()
+            rows = connection.exec_driver_sql(f"""
+                SELECT {column_list} FROM {self.table_name}
+                WHERE rowid IN (SELECT row_id FROM {change_log_table(self.table_name)} WHERE seq > ? AND seq <= ?)
+                ORDER BY rowid
+            """, (last_seq, max_seq)).fetchall()
+            if "last_seq" not in manifest and manifest.get("last_modify_ts") is not None:
+                rows += connection.exec_driver_sql(
+                    f'SELECT {column_list} FROM {self.table_name} WHERE "DW_MODIFY_TS" > ? AND rowid <= ?',
+                    (manifest["last_modify_ts"], manifest["last_rowid"]),
+                ).fetchall()
+        return [dict(zip(NEWS_WRITE_COLUMNS, row)) for row in rows], max_seq
+
+    def shard_path(self, source, day):
+        return f"{self.table_name}/source={source}/{day}{self.extension}"
+
+    def export(self):
+        """
+        Append new and modified rows to their shards and update the manifest.
+
+        Returns:
+            list: Relative paths of the shards written.
+        """
+        self.ensure_change_log()
+        manifest = self.read_manifest()
+        records, max_seq = self.changed_rows(manifest)
+        partitions = defaultdict(list)
+        for record in records:
+            day = str(record["published"] or "")[:10] or "unknown"
+            partitions[(record["source"], day)].append(record)
+
+        written = []
+        for (source, day), partition in sorted(partitions.items()):
+            path = self.shard_path(source, day)
+            data = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in partition)
+            shard = self.root / path
+            shard.parent.mkdir(parents=True, exist_ok=True)
+            with open(shard, "ab") as f:
+                f.write(compress(data.encode("utf-8"), self.compression))
+            entry = manifest["shards"].setdefault(path, {
+                "source": source, "day": day, "compression": self.compression, "records": 0,
+            })
+            entry["records"] += len(partition)
+            entry["bytes"] = shard.stat().st_size
+            entry["sha256"] = hashlib.sha256(shard.read_bytes()).hexdigest()
+            written.append(path)
+
+        manifest["format"] = MANIFEST_FORMAT
+        manifest["last_seq"] = max_seq
+        manifest.pop("last_rowid", None)
+        manifest.pop("last_modify_ts", None)
+        manifest["exported_at"] = pd.Timestamp.now(tz="Asia/Jakarta").isoformat(timespec="seconds")
+        manifest["pending"] = sorted(set(manifest["pending"]) | set(written))
+        self.write_manifest(manifest)
+        return written
+
+    def pending(self):
+        """Shards written since the last mark_published, to upload with the manifest."""
+        return self.read_manifest()["pending"]
+
+    def mark_published(self, paths):
+        manifest = self.read_manifest()
+        manifest["pending"] = sorted(set(manifest["pending"]) - set(paths))
+        self.write_manifest(manifest)
+
+
+def read_shard(path, compression):
+    """Records of one shard file, in the order they were appended."""
+    text = decompress(Path(path).read_bytes(), compression).decode("utf-8")
+    return [json.loads(line) for line in text.splitlines() if line]
+
+
+def load_shards(root, engine, table_name="news", batch_rows=50_000):
+    """
+    Rebuild a news table from the shards listed in root's manifest.json,
+    keeping the last record of every (source, link). Meant for an empty
+    database: rows already stored are left as they are.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    root = Path(root)
+    manifest = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    partitions = defaultdict(list)
+    for path, entry in sorted(manifest["shards"].items()):
+        partitions[(entry["source"], entry["day"])].append((path, entry["compression"]))
+
+    writer = NewsWriter(engine, table_name)
+    writer.ensure_schema()
+    inserted = 0
+    batch = []
+    for shards in partitions.values():
+        latest = {}
+        for path, compression in shards:
+            for record in read_shard(root / path, compression):
+                latest[record["link"]] = record
+        batch.extend(latest.values())
+        if len(batch) >= batch_rows:
+            inserted += writer.write(pd.DataFrame(batch, columns=NEWS_WRITE_COLUMNS))
+            batch = []
+    if batch:
+        inserted += writer.write(pd.DataFrame(batch, columns=NEWS_WRITE_COLUMNS))
+    return inserted
@@ -0,0 +1,147 @@
+import re
+import pandas as pd
+from .near_duplicates import simhash_table
+
+FTS_SUFFIX = "_fts"
+TITLE_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_table(table_name):
+    return f"{table_name}{FTS_SUFFIX}"
+
+
+def ensure_search_index(connection, table_name="news"):
+    """
+    Create the FTS5 index over title and content of table_name (an
+    external-content table, so the text is not stored twice) and the
+    triggers that keep it in sync with every insert, update and delete.
+    The index is built from the existing rows when it is first created.
+
+    Returns:
+        bool: True if the index was created (and built) by this call.
+    """
+    fts = fts_table(table_name)
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    if exists:
+        return False
+    connection.exec_driver_sql(f"""
+        CREATE VIRTUAL TABLE {fts} USING fts5(
+            title, content,
+            content='{table_name}', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table_name} BEGIN
+            INSERT INTO {fts} (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+        END
+    """)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table_name} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+        END
+    """)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF title, content ON {table_name} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+            INSERT INTO {fts} (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+        END
+    """)
+    connection.exec_driver_sql(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    return True
+
+
+def rebuild_search_index(engine, table_name="news"):
+    """Re-index every row of table_name (creating the index if needed), then merge its segments."""
+    fts = fts_table(table_name)
+    with engine.begin() as connection:
+        if not ensure_search_index(connection, table_name):
+            connection.exec_driver_sql(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        connection.exec_driver_sql(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+
+
+def match_expression(query):
+    """
+    Turn a search box query into an FTS5 MATCH expression: "quoted text" is a
+    phrase, a trailing * makes a prefix search, every other word is quoted so
+    punctuation such as "PT." or "-" cannot break the query syntax. All terms
+    must match.
+    """
+    terms = []
+    for phrase, word in TERM_PATTERN.findall(query):
+        text = phrase if phrase else word
+        prefix = not phrase and text.endswith("*")
+        text = text.rstrip("*").replace('"', "")
+        if text.strip():
+            terms.append(f'"{text}"' + ("*" if prefix else ""))
+    return " AND ".join(terms)
+
+
+def search_news(engine, query, sources=None, start=None, end=None, limit=50, table_name="news", collapse=False):
+    """
+    Full-text search over title and content, best matches first (BM25, with
+    title matches weighted above content).
+
+    Args:
+        query (str): Words, "phrases" and prefix* terms; see match_expression.
+        sources (list): Only these sources, or all if None.
+        start, end (str): Inclusive published date range as 'YYYY-MM-DD'.
+        limit (int): Maximum number of results.
+        collapse (bool): Keep only the best match of every near-duplicate
+            cluster (see utils/near_duplicates.py).
+
+    Returns:
+        pd.DataFrame: published, source, title, link, snippet, score,
+        cluster_id and, when collapsing, copies (matches in the cluster).
+    """
+    columns = ["published", "source", "title", "link", "snippet", "score", "cluster_id", "copies"]
+    expression = match_expression(query)
+    if not expression:
+        return pd.DataFrame(columns=columns)
+    fts = fts_table(table_name)
+    clusters = simhash_table(table_name)
+    filters, params = [], [expression]
+    if sources:
+        filters.append(f"n.source IN ({', '.join('?' for _ in sources)})")
+        params.extend(sources)
+    if start:
+        filters.append("n.published >= ?")
+        params.append(str(start))
+    if end:
+        filters.append("n.published < date(?, '+1 day')")
+        params.append(str(end))
+    where = "".join(f" AND {condition}" for condition in filters)
+    if collapse:
+        # MIN() makes SQLite take id from the best scoring row of each cluster
+        top = "SELECT id, MIN(score) AS score, cluster_id, COUNT(*) AS copies FROM hits GROUP BY cluster_id"
+    else:
+        top = "SELECT id, score, cluster_id, NULL AS copies FROM hits"
+    with engine.connect() as connection:
+        # rank on scores only; snippets are built for the returned rows. CROSS
+        # JOIN pins the join order: MATCH first, then rowid lookups
+        rows = connection.exec_driver_sql(f"""
+            WITH hits AS MATERIALIZED (
+                SELECT n.rowid AS id,
+                       bm25({fts}, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS score,
+                       COALESCE(d.cluster_id, n.rowid) AS cluster_id
+                FROM {fts}
+                CROSS JOIN {table_name} AS n ON n.rowid = {fts}.rowid
+                LEFT JOIN {clusters} AS d ON d.rowid = n.rowid
+                WHERE {fts} MATCH ?{where}
+            ), top AS (
+                {top} ORDER BY score LIMIT ?
+            )
+            SELECT n.published, n.source, n.title, n.link,
+                   snippet({fts}, 1, '**', '**', '…', 16),
+                   top.score, top.cluster_id, top.copies
+            FROM top
+            CROSS JOIN {fts} ON {fts}.rowid = top.id
+            JOIN {table_name} AS n ON n.rowid = top.id
+            WHERE {fts} MATCH ?
+            ORDER BY top.score
+        """, tuple(params + [limit, expression])).fetchall()
+    return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+class PageCache:
+    """
+    Compressed on-disk cache of fetched article pages, keyed by URL.
+
+    Each entry is a gzip'd JSON file named after the SHA-256 of the URL
+    (sharded by its first two hex digits), holding the raw value returned by
+    a scraper's fetch_raw: HTML, or a list of page HTML for multi-page
+    articles. evict() drops entries older than max_age_days, then the oldest
+    entries until the cache fits in max_mb.
+    """
+
+    def __init__(self, directory, max_mb=2048, max_age_days=90):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+
+    def path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def get(self, url):
+        """Return the cached raw page for url, or None if it is not cached."""
+        try:
+            with gzip.open(self.path(url), "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry["raw"] if entry.get("url") == url else None
+
+    def put(self, url, raw):
+        """Store raw under url, replacing the file atomically."""
+        if raw is None:
+            return
+        path = self.path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(json.dumps({"url": url, "raw": raw}).encode("utf-8"))
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[ERROR] Failed to cache {url}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def evict(self):
+        """
+        Remove expired entries, then the oldest until under max_mb.
+
+        Returns:
+            dict: 'entries' and 'bytes' kept, 'evicted' entries removed.
+        """
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)  # newest first
+
+        kept, total, evicted = 0, 0, 0
+        full = False
+        for mtime, size, path in entries:
+            full = full or total + size > self.max_bytes
+            if full or now - mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                evicted += 1
+                continue
+            kept += 1
+            total += size
+        return {"entries": kept, "bytes": total, "evicted": evicted}
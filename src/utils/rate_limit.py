@@ -0,0 +1,97 @@
+import threading
+import time
+
+THROTTLE_STATUSES = {429, 503}
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket whose refill rate adapts to the host (AIMD): the rate grows
+    additively while responses are fast and healthy, and is cut
+    multiplicatively on errors, throttling or slow responses.
+    """
+
+    def __init__(self, rate, burst, min_rate, max_rate, increase=0.1, decrease=0.5, slow_response=5.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_response = slow_response
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until it is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def record(self, latency, status=None, error=False):
+        """Adapt the rate to the outcome of one request."""
+        with self._lock:
+            healthy = not error and (status is None or status < 500) and status not in THROTTLE_STATUSES
+            if healthy and latency < self.slow_response:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+            else:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.tokens = min(self.tokens, 0)
+
+
+class RateLimiter:
+    """Per-host adaptive token buckets plus wait/fetch time accounting."""
+
+    def __init__(self, rate=0.5, burst=2, min_rate=0.05, max_rate=2.0, slow_response=5.0):
+        self.bucket_config = {
+            "rate": rate,
+            "burst": burst,
+            "min_rate": min_rate,
+            "max_rate": max_rate,
+            "slow_response": slow_response,
+        }
+        self.buckets = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        with self._lock:
+            if host not in self.buckets:
+                self.buckets[host] = AdaptiveTokenBucket(**self.bucket_config)
+                self.stats[host] = {"requests": 0, "backoffs": 0, "wait_seconds": 0.0, "fetch_seconds": 0.0}
+            return self.buckets[host]
+
+    def acquire(self, host):
+        waited = self._bucket(host).acquire()
+        with self._lock:
+            self.stats[host]["wait_seconds"] += waited
+        return waited
+
+    def record(self, host, latency, status=None, error=False):
+        self._bucket(host).record(latency, status=status, error=error)
+        with self._lock:
+            stats = self.stats[host]
+            stats["requests"] += 1
+            stats["fetch_seconds"] += latency
+            if error or status in THROTTLE_STATUSES or (status is not None and status >= 500):
+                stats["backoffs"] += 1
+
+    def report(self):
+        """Return per-host stats: requests, backoffs, wait vs fetch seconds, current rate."""
+        with self._lock:
+            return {
+                host: {**stats, "rate": round(self.buckets[host].rate, 3)}
+                for host, stats in self.stats.items()
+            }
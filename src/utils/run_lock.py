@@ -0,0 +1,153 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+import pytz
+from .db_writer import bump_data_version, ensure_data_version
+
+STATUS_TABLE = "status"
+LEASE_COLUMNS = {"owner": "TEXT", "heartbeat_ts": "TEXT", "lease_expires_ts": "TEXT"}
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+JAKARTA_TZ = pytz.timezone("Asia/Jakarta")
+
+
+def ensure_status_table(connection):
+    """Create the status table, adding the lease columns to tables created before them."""
+    connection.exec_driver_sql(f"""
+        CREATE TABLE IF NOT EXISTS {STATUS_TABLE} (
+            activity TEXT PRIMARY KEY,
+            status TEXT,
+            dw_modify_ts TEXT,
+            owner TEXT,
+            heartbeat_ts TEXT,
+            lease_expires_ts TEXT
+        )
+    """)
+    existing = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({STATUS_TABLE})")}
+    for column, column_type in LEASE_COLUMNS.items():
+        if column not in existing:
+            connection.exec_driver_sql(f"ALTER TABLE {STATUS_TABLE} ADD COLUMN {column} {column_type}")
+
+
+def make_owner():
+    """Owner id unique to this process and lease: host:pid:random."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseLost(RuntimeError):
+    """Raised by Lease.check once another owner may hold the lease."""
+
+
+class Lease:
+    """
+    Expiring lock on one row of the status table (e.g. activity
+    "scraping:kontan"), so the same work never runs twice at once while
+    different activities run in parallel.
+
+    acquire() takes the row with a single conditional UPDATE that only
+    succeeds when the row is not running or its lease has expired, so two
+    processes can never both win. While held, a heartbeat thread extends the
+    lease every heartbeat_seconds; if the holder dies the lease expires after
+    lease_seconds and the next run takes it over. Holders call check()
+    before each write, so a holder whose lease was taken over (or could not
+    be renewed in time) stops instead of writing next to the new owner.
+    """
+
+    def __init__(self, engine, activity, lease_seconds=120, heartbeat_seconds=30, owner=None):
+        self.engine = engine
+        self.activity = activity
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = owner or make_owner()
+        self.lost = False
+        self._valid_until = 0.0  # monotonic time the last renewal is good for
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def timestamps(self):
+        now = datetime.now(JAKARTA_TZ)
+        return now.strftime(TS_FORMAT), (now + timedelta(seconds=self.lease_seconds)).strftime(TS_FORMAT)
+
+    def acquire(self):
+        """Take the lease and start the heartbeat. Returns False if another owner holds it."""
+        now, expires = self.timestamps()
+        with self.engine.begin() as connection:
+            ensure_status_table(connection)
+            ensure_data_version(connection)
+            connection.exec_driver_sql(
+                f"INSERT OR IGNORE INTO {STATUS_TABLE} (activity, status, dw_modify_ts) VALUES (?, 'success', ?)",
+                (self.activity, now),
+            )
+            acquired = connection.exec_driver_sql(f"""
+                UPDATE {STATUS_TABLE}
+                SET status = 'running', owner = ?, heartbeat_ts = ?, lease_expires_ts = ?, dw_modify_ts = ?
+                WHERE activity = ?
+                  AND (status != 'running' OR lease_expires_ts IS NULL OR lease_expires_ts < ?)
+            """, (self.owner, now, expires, now, self.activity, now)).rowcount == 1
+            if acquired:
+                bump_data_version(connection)
+        if acquired:
+            self.lost = False
+            self._valid_until = time.monotonic() + self.lease_seconds
+            self._stop.clear()
+            self._heartbeat = threading.Thread(target=self._beat, name=f"lease-{self.activity}", daemon=True)
+            self._heartbeat.start()
+        return acquired
+
+    def holder(self):
+        """Return (owner, lease_expires_ts) of the row, for messages when acquire fails."""
+        with self.engine.connect() as connection:
+            row = connection.exec_driver_sql(
+                f"SELECT owner, lease_expires_ts FROM {STATUS_TABLE} WHERE activity = ?", (self.activity,)
+            ).fetchone()
+        return tuple(row) if row else (None, None)
+
+    def renew(self):
+        """Extend the lease. Returns False (and sets lost) if another owner took it over."""
+        now, expires = self.timestamps()
+        started = time.monotonic()
+        with self.engine.begin() as connection:
+            renewed = connection.exec_driver_sql(f"""
+                UPDATE {STATUS_TABLE} SET heartbeat_ts = ?, lease_expires_ts = ?
+                WHERE activity = ? AND owner = ? AND status = 'running'
+            """, (now, expires, self.activity, self.owner)).rowcount == 1
+        self.lost = self.lost or not renewed
+        if renewed:
+            self._valid_until = started + self.lease_seconds
+        return renewed
+
+    def check(self):
+        """
+        Raise LeaseLost if the lease was taken over, or has expired because
+        no heartbeat renewed it in time (another process may take it then).
+        """
+        if self.lost or time.monotonic() >= self._valid_until:
+            self.lost = True
+            raise LeaseLost(f"Lost the lease on {self.activity}")
+
+    def _beat(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                if not self.renew():
+                    print(f"[ERROR] Lost the lease on {self.activity}")
+                    return
+            except Exception as e:
+                print(f"[ERROR] Heartbeat for {self.activity} failed: {e}")
+
+    def release(self, status="success"):
+        """Stop the heartbeat and store the final status, if the lease is still ours."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        now, _ = self.timestamps()
+        with self.engine.begin() as connection:
+            released = connection.exec_driver_sql(f"""
+                UPDATE {STATUS_TABLE}
+                SET status = ?, owner = NULL, lease_expires_ts = NULL, dw_modify_ts = ?
+                WHERE activity = ? AND owner = ?
+            """, (status, now, self.activity, self.owner)).rowcount
+            if released:
+                bump_data_version(connection)
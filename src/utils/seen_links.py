@@ -0,0 +1,37 @@
+from hashlib import blake2b
+
+
+def link_key(link):
+    """64-bit hash of a link; collisions are negligible at archive sizes."""
+    return int.from_bytes(blake2b(link.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SeenLinks:
+    """
+    Compact set of already-scraped links for one source.
+
+    Only a 64-bit hash of each link is kept, so membership checks are O(1)
+    and memory does not grow with URL length. With canonicalize (e.g. a
+    source's canonicalize_link), links are compared in canonical form: the
+    links given to the constructor must already be canonical, links checked
+    or added later are canonicalized first.
+    """
+
+    def __init__(self, links=(), canonicalize=None):
+        self._keys = {link_key(link) for link in links}
+        self.canonicalize = canonicalize
+
+    def key(self, link):
+        return link_key(self.canonicalize(link) if self.canonicalize else link)
+
+    def __contains__(self, link):
+        return isinstance(link, str) and self.key(link) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, link):
+        self._keys.add(self.key(link))
+
+    def update(self, links):
+        self._keys.update(self.key(link) for link in links)
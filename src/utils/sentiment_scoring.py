@@ -0,0 +1,130 @@
+import csv
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .extraction import IncrementalExtractor
+
+SENTIMENT_TABLE = "news_sentiment"
+TASK_NAME = "sentiment"
+# words and the clause boundaries that end a negation's scope
+TOKEN_PATTERN = r"\w+|[.,;:!?]"
+BOUNDARIES = {".", ",", ";", ":", "!", "?"}
+NEGATIONS = {"tidak", "tak", "bukan", "belum", "tanpa", "jangan", "kurang", "gak", "nggak"}
+NEGATION_WINDOW = 3  # words after a negation whose polarity is flipped ("tidak naik", "belum membaik")
+
+
+def load_sentiment_lexicon(path):
+    """
+    Read a lexicon CSV with columns term and weight (positive for up/good
+    news, negative for down/bad news).
+
+    Returns:
+        dict: lowercase term -> weight.
+    """
+    with open(Path(path), newline="", encoding="utf-8-sig") as f:
+        return {row["term"].strip().lower(): float(row["weight"]) for row in csv.DictReader(f) if row["term"].strip()}
+
+
+class SentimentScorer:
+    """
+    Lexicon-based price-direction score for a batch of texts, computed on
+    the whole batch at once: the texts are tokenized into one flat token
+    series, weights are looked up with a single map, and negation scopes
+    and per-article sums are computed with numpy over that series.
+
+    A lexicon word preceded within NEGATION_WINDOW words by a negation in
+    the same clause counts with the opposite sign. An article's score is
+    (positive - negative) / (positive + negative), from -1 to 1, and 0 when
+    no lexicon word occurs.
+    """
+
+    def __init__(self, lexicon, negations=NEGATIONS, window=NEGATION_WINDOW):
+        self.lexicon = lexicon
+        self.negations = set(negations)
+        self.window = window
+
+    def score(self, texts):
+        """
+        Returns:
+            pd.DataFrame: score, positive, negative and words per text, in
+            the order of texts.
+        """
+        texts = pd.Series(list(texts), dtype="object").fillna("")
+        tokens = texts.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        article = tokens.index.to_numpy()
+        values = tokens.to_numpy()
+        position = np.arange(len(values))
+
+        weight = tokens.map(self.lexicon).fillna(0.0).to_numpy()
+        is_negation = tokens.isin(self.negations).to_numpy()
+        is_boundary = tokens.isin(BOUNDARIES).to_numpy()
+        is_start = np.r_[True, article[1:] != article[:-1]] if len(values) else np.array([], dtype=bool)
+
+        # position of the latest negation, clause boundary and article start at or before each token
+        last_negation = np.maximum.accumulate(np.where(is_negation, position, -1))
+        last_boundary = np.maximum.accumulate(np.where(is_boundary | is_start, position, -1))
+        # words (not boundaries) between the negation and the token
+        words_seen = np.cumsum(~is_boundary)
+        distance = words_seen - words_seen[np.maximum(last_negation, 0)]
+        negated = (last_negation >= last_boundary) & (last_negation >= 0) & (distance >= 1) & (distance <= self.window)
+        signed = np.where(negated, -weight, weight)
+
+        n = len(texts)
+        positive = np.bincount(article, weights=np.clip(signed, 0, None), minlength=n)
+        negative = np.bincount(article, weights=np.clip(-signed, 0, None), minlength=n)
+        words = np.bincount(article, weights=~is_boundary, minlength=n).astype(int)
+        total = positive + negative
+        score = np.divide(positive - negative, total, out=np.zeros(n), where=total > 0)
+        return pd.DataFrame({"score": score, "positive": positive, "negative": negative, "words": words})
+
+
+class SentimentExtractor(IncrementalExtractor):
+    """
+    Scores the content of news rows into news_sentiment (rowid, score,
+    positive, negative, words).
+
+    Runs incrementally over the news_changes log (see IncrementalExtractor),
+    one batch of batch_size rows scored at a time; a rewritten row is
+    scored again.
+    """
+
+    task = TASK_NAME
+    result_table = SENTIMENT_TABLE
+    columns = ("content",)
+    counters = ("words",)
+
+    def __init__(self, engine, scorer, table_name="news"):
+        super().__init__(engine, table_name)
+        self.scorer = scorer
+
+    def create_schema(self, connection):
+        connection.exec_driver_sql(f"""
+            CREATE TABLE IF NOT EXISTS {SENTIMENT_TABLE} (
+                rowid INTEGER PRIMARY KEY,
+                score REAL NOT NULL,
+                positive REAL NOT NULL,
+                negative REAL NOT NULL,
+                words INTEGER NOT NULL
+            )
+        """)
+
+    def process(self, connection, rows):
+        scores = self.scorer.score(content for _, content in rows)
+        scores.insert(0, "rowid", [rowid for rowid, _ in rows])
+        connection.exec_driver_sql(
+            f"INSERT OR REPLACE INTO {SENTIMENT_TABLE} (rowid, score, positive, negative, words) "
+            "VALUES (?, ?, ?, ?, ?)",
+            list(scores.itertuples(index=False, name=None)),
+        )
+        return {"words": int(scores["words"].sum())}
+
+    def run(self, batch_size=2000, lease=None):
+        """
+        Score every row changed since the watermark (see IncrementalExtractor.run).
+
+        Returns:
+            dict: rows, words, seconds, rows_per_sec and words_per_sec of this run.
+        """
+        stats = super().run(batch_size, lease)
+        stats["words_per_sec"] = round(stats["words"] / stats["seconds"]) if stats["seconds"] else None
+        return stats
@@ -1,17 +1,24 @@
 import re
+from functools import lru_cache
+import pandas as pd
 
 def clean_invisible_spaces(text):
     """Remove invisible spaces like non-breaking space and zero-width spaces."""
     return re.sub(r'[\u00A0\u2000-\u200B\u202F\u205F\u3000]', ' ', text).strip()
 
-PHRASES_PATTERN = re.compile(
-    r'Jakarta, CNBC Indonesia|'
-    r'IDXChannel—|KONTAN\.CO\.ID JAKARTA\.?|'
-    r'Bisnis\.com , JAKARTA|Bisnis\.com, JAKARTA|'
-    r'JAKARTA, investor\.id|Pasardana\.id|KONTAN\.CO\.ID|'
-    r'IQPlus,{0,}\s{0,}\(\d+/\d+\)',
-    re.IGNORECASE
-)
+# Boilerplate phrases per source, in matching order (longer variants first).
+SOURCE_PHRASES = [
+    ("cnbc", r'Jakarta, CNBC Indonesia'),
+    ("idx", r'IDXChannel—'),
+    ("kontan", r'KONTAN\.CO\.ID JAKARTA\.?'),
+    ("bisnis", r'Bisnis\.com , JAKARTA'),
+    ("bisnis", r'Bisnis\.com, JAKARTA'),
+    ("investorid", r'JAKARTA, investor\.id'),
+    ("pasardana", r'Pasardana\.id'),
+    ("kontan", r'KONTAN\.CO\.ID'),
+    ("iqplus", r'IQPlus,{0,}\s{0,}\(\d+/\d+\)'),
+]
+PHRASES_PATTERN = re.compile('|'.join(phrase for _, phrase in SOURCE_PHRASES), re.IGNORECASE)
 LEADING_PUNCT_PATTERN = re.compile(r'^[^\w\s]+')
 DASH_PATTERN = re.compile(r'\s*[-–—]\s*')
 MULTISPACE_PATTERN = re.compile(r'\s+')
@@ -26,4 +33,65 @@ def clean_text(text):
     text = LEADING_PUNCT_PATTERN.sub('', text)
     text = DASH_PATTERN.sub(' ', text)
     text = MULTISPACE_PATTERN.sub(' ', text)
-    return text.strip()
\ No newline at end of file
+    return text.strip()
+
+INVISIBLE_PATTERN = re.compile(r'[\u00A0\u2000-\u200B\u202F\u205F\u3000]')
+
+
+@lru_cache(maxsize=None)
+def get_phrase_pattern(source=None):
+    """
+    Boilerplate phrases of one source as one pattern; all sources' phrases
+    if source is None or has no phrases of its own. A lookahead on the
+    phrases' first letters lets the scan skip most positions cheaply.
+    """
+    phrases = [phrase for phrase_source, phrase in SOURCE_PHRASES if phrase_source == source]
+    if not phrases:
+        phrases = [phrase for _, phrase in SOURCE_PHRASES]
+    first_letters = ''.join(sorted({c for phrase in phrases for c in (phrase[0].lower(), phrase[0].upper())}))
+    return re.compile(f"(?=[{first_letters}])(?:{'|'.join(phrases)})", re.IGNORECASE)
+
+
+def make_cleaner(source=None):
+    """
+    Return a clean_text equivalent that runs a single regex scan, restricted
+    to the boilerplate phrases of source (see get_phrase_pattern). Dashes and
+    space collapsing use str.replace and split/join instead of regexes.
+    """
+    phrase_sub = get_phrase_pattern(source).sub
+    leading_sub = LEADING_PUNCT_PATTERN.sub
+    invisible_sub = INVISIBLE_PATTERN.sub
+
+    def clean(text):
+        if not isinstance(text, str):
+            return text
+        # invisible spaces and long dashes are non-ASCII; isascii() is O(1)
+        ascii_only = text.isascii()
+        if not ascii_only:
+            text = invisible_sub(' ', text)
+        text = phrase_sub(' ', text)
+        text = leading_sub('', text.strip()).replace('-', ' ')
+        if not ascii_only:
+            text = text.replace('–', ' ').replace('—', ' ')
+        # split() collapses and strips the same whitespace as MULTISPACE_PATTERN
+        return ' '.join(text.split())
+
+    return clean
+
+
+def clean_texts(texts, source=None):
+    """
+    Clean a batch of texts with make_cleaner.
+
+    Args:
+        texts (pd.Series or list): Texts; non-strings are passed through.
+        source (str): Only strip this source's boilerplate phrases. None
+            strips every source's phrases, matching clean_text exactly.
+
+    Returns:
+        Same type as texts.
+    """
+    clean = make_cleaner(source)
+    if isinstance(texts, pd.Series):
+        return pd.Series([clean(text) for text in texts], index=texts.index, name=texts.name, dtype=object)
+    return [clean(text) for text in texts]
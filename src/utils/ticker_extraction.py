@@ -0,0 +1,172 @@
+import csv
+import re
+from collections import deque
+from pathlib import Path
+from .extraction import IncrementalExtractor
+
+TICKER_TABLE = "news_ticker"
+TASK_NAME = "tickers"
+TOKEN_PATTERN = re.compile(r"\w+")
+# words dropped from company names before matching ("PT Bank Rakyat Indonesia (Persero) Tbk")
+NAME_NOISE = {"pt", "tbk", "persero"}
+
+
+def load_ticker_dictionary(path, listed_companies=None):
+    """
+    Read a ticker dictionary CSV: columns ticker, name and aliases ("|"
+    separated), or IDX's stock list export (Kode, Nama Perusahaan).
+
+    Articles about an issuer missing from the dictionary get no ticker tag,
+    so with listed_companies (the number of companies listed on IDX) a
+    dictionary that covers fewer is reported.
+
+    Returns:
+        dict: ticker -> list of names and aliases.
+    """
+    dictionary = {}
+    with open(Path(path), newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            ticker = (row.get("ticker") or row.get("Kode") or "").strip().upper()
+            if not ticker:
+                continue
+            names = [row.get("name") or row.get("Nama Perusahaan") or ""]
+            names += (row.get("aliases") or "").split("|")
+            dictionary[ticker] = [name.strip() for name in names if name.strip()]
+    if listed_companies and len(dictionary) < listed_companies:
+        print(f"[WARNING] {Path(path).name} covers {len(dictionary)} of about {listed_companies} listed companies "
+              f"({len(dictionary) / listed_companies:.0%}); articles about the others get no ticker tags. "
+              f"IDX's stock list export (Kode, Nama Perusahaan) can replace it.")
+    return dictionary
+
+
+class TickerMatcher:
+    """
+    Aho-Corasick automaton over word tokens: every ticker code and company
+    name/alias in the dictionary is matched in one left-to-right pass over
+    an article's tokens, whatever the dictionary size.
+
+    Single-token patterns (codes such as "BBRI", one-word aliases such as
+    "Telkom") must match with the same case, so words like "cuan" or "timah"
+    are not read as tickers; multi-word names match case-insensitively.
+    Overlapping matches resolve leftmost-longest ("Astra Agro Lestari" wins
+    over "Astra").
+    """
+
+    def __init__(self, dictionary):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.patterns = []  # (ticker, token count, exact tokens or None)
+        for ticker, names in dictionary.items():
+            self.add(ticker, [ticker])
+            for name in names:
+                tokens = [token for token in TOKEN_PATTERN.findall(name) if token.lower() not in NAME_NOISE]
+                if tokens:
+                    self.add(ticker, tokens)
+        self.build()
+
+    def add(self, ticker, tokens):
+        node = 0
+        for token in tokens:
+            key = token.lower()
+            if key not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[node][key] = len(self.goto) - 1
+            node = self.goto[node][key]
+        exact = tuple(tokens) if len(tokens) == 1 else None
+        pattern = (ticker, len(tokens), exact)
+        if pattern not in (self.patterns[i] for i in self.outputs[node]):
+            self.patterns.append(pattern)
+            self.outputs[node].append(len(self.patterns) - 1)
+
+    def build(self):
+        """Breadth-first pass setting failure links and merging outputs along them."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for key, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and key not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(key, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def find(self, text):
+        """
+        Return [(ticker, position)] for every mention in text, position being
+        the character offset where the mention starts.
+        """
+        tokens = [(match.group(), match.start()) for match in TOKEN_PATTERN.finditer(text)]
+        candidates = []
+        node = 0
+        for end, (token, _) in enumerate(tokens):
+            key = token.lower()
+            while node and key not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(key, 0)
+            for pattern_id in self.outputs[node]:
+                ticker, length, exact = self.patterns[pattern_id]
+                if exact is not None and tokens[end][0] != exact[0]:
+                    continue
+                candidates.append((end - length + 1, -length, ticker))
+
+        mentions = []
+        covered_until = -1
+        for start, negative_length, ticker in sorted(candidates):
+            if start > covered_until:
+                mentions.append((ticker, tokens[start][1]))
+                covered_until = start - negative_length - 1
+        return mentions
+
+
+class TickerExtractor(IncrementalExtractor):
+    """
+    Tags news rows with the tickers they mention, in news_ticker (rowid,
+    ticker, position), where position is the character offset in
+    title + "\\n" + content (offsets below len(title) are in the title).
+
+    Runs incrementally over the news_changes log (see IncrementalExtractor):
+    a rewritten row loses its old tags and is tagged again.
+    """
+
+    task = TASK_NAME
+    result_table = TICKER_TABLE
+    columns = ("title", "content")
+    counters = ("mentions",)
+
+    def __init__(self, engine, matcher, table_name="news"):
+        super().__init__(engine, table_name)
+        self.matcher = matcher
+
+    def create_schema(self, connection):
+        connection.exec_driver_sql(f"""
+            CREATE TABLE IF NOT EXISTS {TICKER_TABLE} (
+                rowid INTEGER NOT NULL,
+                ticker TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (rowid, position)
+            ) WITHOUT ROWID
+        """)
+        connection.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS idx_{TICKER_TABLE}_ticker ON {TICKER_TABLE} (ticker, rowid)"
+        )
+
+    def process(self, connection, rows):
+        mentions = [
+            (rowid, ticker, position)
+            for rowid, title, content in rows
+            for ticker, position in self.matcher.find(f"{title or ''}\n{content or ''}")
+        ]
+        connection.exec_driver_sql(
+            f"DELETE FROM {TICKER_TABLE} WHERE rowid = ?", [(rowid,) for rowid, _, _ in rows]
+        )
+        if mentions:
+            connection.exec_driver_sql(
+                f"INSERT INTO {TICKER_TABLE} (rowid, ticker, position) VALUES (?, ?, ?)", mentions
+            )
+        return {"mentions": len(mentions)}